@@ -0,0 +1,555 @@
+"""
+Teste de concorrência das transições de assentos contra um Postgres local.
+
+Vários clientes disputam o mesmo punhado de assentos ao mesmo tempo em
+/seats/pre-reserve e /seats/reserve, enquanto admins aprovam, reprovam e
+validam QR codes desses assentos. Cada resposta 200 é anotada em um livro de
+operações; no final o estado do banco é conferido contra ele:
+
+- nenhum assento vendido duas vezes sem uma reprovação no meio;
+- nenhum QR code validado duas vezes;
+- dono coerente com o status (livre sem dono, demais com dono);
+- contadores de seat_stats iguais à contagem real (sem atualização perdida);
+- /admin/stats igual ao mapa de /seats/ depois que uma retenção vence;
+- uma linha de transaction_seat por reserva confirmada;
+- nenhum lock preso depois que os clientes param.
+
+Também mede vazão por rota, deadlocks (pg_stat_database) e o tempo que as
+sessões passaram esperando por locks (amostras de pg_stat_activity), para
+comparar mudanças de concorrência com números. Sai com código 1 se algum
+invariante falhar. Use um banco descartável: cria usuários e um evento.
+
+    python -m benchmarks.contention --start-app --clients 50 --seats 12 --duration 30
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from benchmarks.http_client import EndpointStats, HttpClient, encode_multipart
+from benchmarks.load_test import create_load_event, start_app, tiny_png
+from benchmarks.smtp_sink import SmtpSink
+from src.models.seat import Seat
+from src.models.seat_hold import SeatHold
+from src.models.seat_stats import SeatStats
+from src.models.transaction_seat import TransactionSeat
+from src.models.user import User
+from src.settings import settings
+from src.utils.jwt import create_access_token
+from src.utils.qr_code import seat_qr_hash
+
+
+class Ledger:
+    """Operações confirmadas (resposta 200) por assento."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: dict[str, Counter] = defaultdict(Counter)
+
+    def add(self, operation: str, seat_codes: list[str]) -> None:
+        with self._lock:
+            for code in seat_codes:
+                self.counts[code][operation] += 1
+
+    def total(self, operation: str) -> int:
+        return sum(counts[operation] for counts in self.counts.values())
+
+
+class LockSampler:
+    """
+    Amostra periodicamente as sessões esperando por locks no banco.
+
+    O tempo de espera é estimado como soma(sessões esperando) × intervalo.
+    """
+
+    def __init__(self, engine, interval: float = 0.02):
+        self.engine = engine
+        self.interval = interval
+        self.wait_seconds = 0.0
+        self.peak_waiters = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        query = text(
+            "SELECT count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+        )
+        with self.engine.connect() as connection:
+            while not self._stop.is_set():
+                waiters = connection.execute(query).scalar()
+                connection.rollback()
+                self.wait_seconds += waiters * self.interval
+                self.peak_waiters = max(self.peak_waiters, waiters)
+                self._stop.wait(self.interval)
+
+    def start(self) -> "LockSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def deadlock_count(engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(
+            text(
+                "SELECT deadlocks FROM pg_stat_database "
+                "WHERE datname = current_database()"
+            )
+        ).scalar()
+
+
+def create_users(engine, count: int, run_id: str, scopes: str) -> list[str]:
+    """Cria usuários direto no banco e devolve um token para cada um."""
+    with engine.begin() as connection:
+        rows = connection.execute(
+            insert(User)
+            .values(
+                [
+                    {
+                        "full_name": f"Contention {scopes} {index}",
+                        "email": (
+                            f"contention-{run_id}-{scopes}-{index}@example.invalid"
+                        ),
+                        "phone_number": "00000000000",
+                        "password": "x",
+                        "scopes": scopes,
+                    }
+                    for index in range(count)
+                ]
+            )
+            .returning(User)
+        ).all()
+    return [create_access_token(row) for row in rows]
+
+
+def run_client(index: int, token: str, hot_seats: list[str], args, stats, ledger):
+    """Disputa os assentos quentes até o fim do teste."""
+    rng = random.Random(args.seed * 100003 + index)
+    client = HttpClient(args.base_url, stats)
+    client.token = token
+    params = {"event_id": args.event_id}
+    try:
+        while time.monotonic() < args.deadline:
+            wanted = rng.sample(hot_seats, rng.randint(1, args.max_seats))
+            status, _, _ = client.request(
+                "POST /seats/pre-reserve",
+                "POST",
+                "/seats/pre-reserve",
+                params=params,
+                json_body=[{"seat_code": code} for code in wanted],
+                conflict_statuses=(400,),
+            )
+            if status != 200 or rng.random() > args.checkout_rate:
+                continue
+
+            body, content_type = encode_multipart(
+                {
+                    "request": json.dumps(
+                        [
+                            {"seat_code": code, "is_half_price": rng.random() < 0.3}
+                            for code in wanted
+                        ]
+                    )
+                },
+                {
+                    "file": (
+                        "comprovante.png",
+                        tiny_png(rng.getrandbits(24)),
+                        "image/png",
+                    )
+                },
+            )
+            status, _, _ = client.request(
+                "POST /seats/reserve",
+                "POST",
+                "/seats/reserve",
+                params=params,
+                body=body,
+                content_type=content_type,
+                conflict_statuses=(400, 403),
+            )
+            if status == 200:
+                ledger.add("reserve", wanted)
+    finally:
+        client.close()
+
+
+def run_admin(
+    index: int, token: str, hot_seats: list[str], engine, args, stats, ledger
+):
+    """Aprova, reprova e valida os assentos quentes conforme o estado atual."""
+    rng = random.Random(args.seed * 7919 + index)
+    client = HttpClient(args.base_url, stats)
+    client.token = token
+    try:
+        while time.monotonic() < args.deadline:
+            with engine.connect() as connection:
+                seats = connection.execute(
+                    select(Seat.code, Seat.status, Seat.is_half_price).where(
+                        Seat.event_id == args.event_id, Seat.code.in_(hot_seats)
+                    )
+                ).all()
+            reserved = [seat for seat in seats if seat.status == "reserved"]
+            occupied = [seat for seat in seats if seat.status == "occupied"]
+
+            if occupied and (not reserved or rng.random() < 0.5):
+                seat = rng.choice(occupied)
+                qr_hash = seat_qr_hash(
+                    seat.code,
+                    "occupied",
+                    bool(seat.is_half_price),
+                    args.event_id,
+                    "cia-seat-system",
+                )
+                status, _, _ = client.request(
+                    "POST /admin/validate-qr-code",
+                    "POST",
+                    "/admin/validate-qr-code",
+                    params={
+                        "hash_value": qr_hash,
+                        "seat_code": seat.code,
+                        "event_id": args.event_id,
+                    },
+                    conflict_statuses=(400,),
+                )
+                if status == 200:
+                    ledger.add("validate", [seat.code])
+            elif reserved:
+                seat = rng.choice(reserved)
+                action = "approve" if rng.random() < args.approve_rate else "reprove"
+                status, _, _ = client.request(
+                    f"POST /admin/{action}-seat",
+                    "POST",
+                    f"/admin/{action}-seat",
+                    params={"seat_code": seat.code, "event_id": args.event_id},
+                    conflict_statuses=(404, 409),
+                )
+                if status == 200:
+                    ledger.add(action, [seat.code])
+            time.sleep(rng.uniform(0, args.admin_think))
+    finally:
+        client.close()
+
+
+def check_lapsed_hold_stats(
+    engine,
+    event_id: int,
+    hot_seats: list[str],
+    client_token: str,
+    admin_token: str,
+    args,
+    stats,
+) -> list[str]:
+    """
+    Pré-reserva um assento fora da disputa, vence a retenção direto no banco e
+    confere que /admin/stats conta os assentos por status como o mapa de
+    /seats/ (a pré-reserva vencida aparece como disponível nos dois).
+    """
+    with engine.connect() as connection:
+        code = connection.execute(
+            select(Seat.code)
+            .where(
+                Seat.event_id == event_id,
+                Seat.status == "available",
+                Seat.code.not_in(hot_seats),
+            )
+            .limit(1)
+        ).scalar()
+    if code is None:
+        return []
+
+    client = HttpClient(args.base_url, stats)
+    client.token = client_token
+    admin = HttpClient(args.base_url, stats)
+    admin.token = admin_token
+    params = {"event_id": event_id}
+    try:
+        status, _, _ = client.request(
+            "POST /seats/pre-reserve",
+            "POST",
+            "/seats/pre-reserve",
+            params=params,
+            json_body=[{"seat_code": code}],
+        )
+        if status != 200:
+            return [f"pré-reserva de {code} para vencer respondeu {status}"]
+        with engine.begin() as connection:
+            lapsed = func.now() - text("interval '1 second'")
+            connection.execute(
+                Seat.__table__.update()
+                .where(Seat.event_id == event_id, Seat.code == code)
+                .values(hold_expires_at=lapsed)
+            )
+            connection.execute(
+                SeatHold.__table__.update()
+                .where(SeatHold.event_id == event_id, SeatHold.seats.any(code))
+                .values(expires_at=lapsed)
+            )
+
+        _, seats_body, _ = client.request(
+            "GET /seats/", "GET", "/seats/", params=params
+        )
+        _, stats_body, _ = admin.request(
+            "GET /admin/stats", "GET", "/admin/stats", params=params
+        )
+    finally:
+        client.close()
+        admin.close()
+
+    on_map = Counter(seat["status"] for seat in json.loads(seats_body))
+    counted = json.loads(stats_body)["seats"]
+    return [
+        f"/admin/stats[{status}] = {counted.get(status, 0)}, "
+        f"/seats/ mostra {on_map.get(status, 0)} após a retenção de {code} vencer"
+        for status in sorted(set(on_map) | set(counted))
+        if counted.get(status, 0) != on_map.get(status, 0)
+    ]
+
+
+def check_invariants(engine, event_id: int, hot_seats: list[str], ledger) -> list[str]:
+    """Confere o estado final do banco contra o livro de operações."""
+    failures = []
+
+    for code in hot_seats:
+        counts = ledger.counts[code]
+        if counts["reserve"] > counts["reprove"] + 1:
+            failures.append(
+                f"{code} vendido {counts['reserve']} vezes com só "
+                f"{counts['reprove']} reprovação(ões)"
+            )
+        if counts["validate"] > 1:
+            failures.append(f"{code} validado {counts['validate']} vezes")
+
+    with engine.connect() as connection:
+        seats = connection.execute(
+            select(Seat.code, Seat.status, Seat.user_id).where(
+                Seat.event_id == event_id, Seat.code.in_(hot_seats)
+            )
+        ).all()
+        for seat in seats:
+            if (seat.status == "available") != (seat.user_id is None):
+                failures.append(
+                    f"{seat.code} com status {seat.status} e user_id {seat.user_id}"
+                )
+            if ledger.counts[seat.code]["validate"] and seat.status != "used":
+                failures.append(f"{seat.code} validado mas com status {seat.status}")
+
+        actual = dict(
+            connection.execute(
+                select(Seat.status, func.count())
+                .where(Seat.event_id == event_id)
+                .group_by(Seat.status)
+            ).all()
+        )
+        counted = dict(
+            connection.execute(
+                select(SeatStats.status, func.sum(SeatStats.total))
+                .where(SeatStats.event_id == event_id)
+                .group_by(SeatStats.status)
+            ).all()
+        )
+        for status in set(actual) | set(counted):
+            if actual.get(status, 0) != (counted.get(status) or 0):
+                failures.append(
+                    f"seat_stats[{status}] = {counted.get(status) or 0}, "
+                    f"contagem real = {actual.get(status, 0)}"
+                )
+
+        history = connection.execute(
+            select(func.count()).where(
+                TransactionSeat.event_id == event_id,
+                TransactionSeat.seat_code.in_(hot_seats),
+            )
+        ).scalar()
+        if history != ledger.total("reserve"):
+            failures.append(
+                f"{history} linhas em transaction_seat para "
+                f"{ledger.total('reserve')} reservas confirmadas"
+            )
+
+        blocked = connection.execute(
+            text(
+                "SELECT count(*) FROM pg_locks l "
+                "JOIN pg_stat_activity a ON a.pid = l.pid "
+                "WHERE a.datname = current_database() AND NOT l.granted"
+            )
+        ).scalar()
+        idle = connection.execute(
+            text(
+                "SELECT count(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() "
+                "AND state = 'idle in transaction' "
+                "AND now() - state_change > interval '1 second'"
+            )
+        ).scalar()
+        if blocked:
+            failures.append(f"{blocked} lock(s) ainda aguardando após o teste")
+        if idle:
+            failures.append(f"{idle} sessão(ões) paradas dentro de transação")
+
+        transaction = connection.begin()
+        try:
+            connection.execute(
+                select(Seat.code)
+                .where(Seat.event_id == event_id, Seat.code.in_(hot_seats))
+                .with_for_update(nowait=True)
+            ).all()
+        except Exception as e:
+            failures.append(f"assentos ainda travados após o teste: {e}")
+        finally:
+            transaction.rollback()
+
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--start-app", action="store_true")
+    parser.add_argument("--workers", type=int, default=3, help="Workers do uvicorn")
+    parser.add_argument("--smtp-port", type=int, default=1025)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument(
+        "--admins",
+        type=int,
+        default=3,
+        help="Admins simultâneos, disputando as mesmas revisões",
+    )
+    parser.add_argument("--seats", type=int, default=12, help="Assentos disputados")
+    parser.add_argument("--max-seats", type=int, default=3)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--checkout-rate", type=float, default=0.7)
+    parser.add_argument("--approve-rate", type=float, default=0.7)
+    parser.add_argument("--admin-think", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Grava o resultado em JSON")
+    args = parser.parse_args()
+    run_id = uuid.uuid4().hex[:8]
+
+    engine = create_engine(args.database_url, pool_size=args.admins + 2)
+    args.event_id = create_load_event(engine)
+    with engine.connect() as connection:
+        hot_seats = list(
+            connection.execute(
+                select(Seat.code)
+                .where(Seat.event_id == args.event_id)
+                .order_by(Seat.id)
+                .limit(args.seats)
+            ).scalars()
+        )
+    args.max_seats = min(args.max_seats, len(hot_seats))
+    client_tokens = create_users(engine, args.clients, run_id, "default")
+    admin_tokens = create_users(engine, args.admins, run_id, "admin")
+    print(
+        f"Evento {args.event_id}: {args.clients} clientes e {args.admins} admin(s) "
+        f"disputando {', '.join(hot_seats)}"
+    )
+
+    sink = SmtpSink(port=args.smtp_port).start()
+    app = start_app(args) if args.start_app else None
+    stats = EndpointStats()
+    ledger = Ledger()
+    deadlocks_before = deadlock_count(engine)
+    sampler = LockSampler(engine).start()
+    try:
+        started = time.monotonic()
+        args.deadline = started + args.duration
+        with ThreadPoolExecutor(max_workers=args.clients + args.admins) as pool:
+            futures = [
+                pool.submit(run_client, index, token, hot_seats, args, stats, ledger)
+                for index, token in enumerate(client_tokens)
+            ] + [
+                pool.submit(
+                    run_admin, index, token, hot_seats, engine, args, stats, ledger
+                )
+                for index, token in enumerate(admin_tokens)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.monotonic() - started
+        stats_failures = check_lapsed_hold_stats(
+            engine,
+            args.event_id,
+            hot_seats,
+            client_tokens[0],
+            admin_tokens[0],
+            args,
+            stats,
+        )
+    finally:
+        sampler.stop()
+        if app:
+            app.terminate()
+            app.wait(timeout=10)
+        sink.stop()
+
+    deadlocks = deadlock_count(engine) - deadlocks_before
+    failures = (
+        check_invariants(engine, args.event_id, hot_seats, ledger) + stats_failures
+    )
+    summary = stats.summary()
+
+    print(f"\n{elapsed:.1f}s de disputa\n")
+    stats.print_table()
+    print(f"\n{'endpoint':<28}{'ok/s':>9}")
+    for endpoint, row in summary.items():
+        print(f"{endpoint:<28}{row['outcomes'].get('ok', 0) / elapsed:>9.1f}")
+    print(
+        f"\nDeadlocks: {deadlocks}  |  espera por locks: "
+        f"{sampler.wait_seconds:.2f}s (pico de {sampler.peak_waiters} sessões)"
+    )
+    print(
+        "Operações confirmadas: "
+        + ", ".join(
+            f"{operation}={ledger.total(operation)}"
+            for operation in ("reserve", "approve", "reprove", "validate")
+        )
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(
+                {
+                    "event_id": args.event_id,
+                    "clients": args.clients,
+                    "admins": args.admins,
+                    "seats": hot_seats,
+                    "elapsed_seconds": round(elapsed, 2),
+                    "endpoints": summary,
+                    "throughput": {
+                        endpoint: round(row["outcomes"].get("ok", 0) / elapsed, 2)
+                        for endpoint, row in summary.items()
+                    },
+                    "deadlocks": deadlocks,
+                    "lock_wait_seconds": round(sampler.wait_seconds, 3),
+                    "peak_lock_waiters": sampler.peak_waiters,
+                    "failures": failures,
+                },
+                output,
+                indent=2,
+            )
+
+    if failures:
+        print("\nFAIL  invariantes violados:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nok    todos os invariantes conferem")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
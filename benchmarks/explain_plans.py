@@ -0,0 +1,211 @@
+"""
+Verifica os planos de execução das consultas quentes de assentos.
+
+Cria um evento temporário com sua partição, popula com um volume grande de
+assentos (50 mil por padrão), roda EXPLAIN em cada consulta quente e falha
+(código de saída 1) se alguma delas fizer Seq Scan na tabela seat ou ler a
+partição de outro evento. Tudo acontece dentro de uma transação que é
+desfeita no final, mas use um banco local descartável: o ANALYZE atualiza as
+estatísticas do planejador.
+
+    python -m benchmarks.explain_plans --seats 50000
+"""
+
+import argparse
+import random
+import string
+import sys
+
+from sqlalchemy import create_engine, func, insert, select, text, update
+
+from src.models.event import Event
+from src.models.seat import Seat
+from src.models.user import User
+from src.settings import settings
+from src.utils.events import create_event_partition
+from src.utils.pending_queue import queue_page_query
+
+# Distribuição realista de status durante uma venda
+STATUS_WEIGHTS = {
+    "available": 0.90,
+    "pre-reserved": 0.04,
+    "reserved": 0.03,
+    "occupied": 0.03,
+}
+
+_FIRST_CHARS = string.ascii_lowercase + string.digits
+_OTHER_CHARS = string.ascii_letters + string.digits
+
+
+def _synthetic_codes(count: int) -> list[str]:
+    """
+    Gera códigos de 3 caracteres começando com minúscula ou dígito, para não
+    colidir com os códigos reais do layout (A1, B12, ...).
+    """
+    codes = []
+    for first in _FIRST_CHARS:
+        for second in _OTHER_CHARS:
+            for third in _OTHER_CHARS:
+                codes.append(first + second + third)
+                if len(codes) == count:
+                    return codes
+    raise ValueError(f"No máximo {len(codes)} assentos sintéticos")
+
+
+def hot_queries(event_id: int, user_id: int, seat_codes: list[str]) -> dict:
+    """Consultas usadas nos caminhos quentes das rotas de assentos e admin."""
+    in_event = Seat.event_id == event_id
+    return {
+        "seats by user (/seats/user)": select(Seat).where(
+            in_event, Seat.user_id == user_id
+        ),
+        "pre-reserved by user (/seats/user/pre-reserved)": select(Seat).where(
+            in_event, Seat.user_id == user_id, Seat.status == "pre-reserved"
+        ),
+        "reserved seats (/admin/pending-seats)": select(
+            User.full_name, Seat.code, Seat.is_half_price, Seat.status
+        )
+        .join(User, User.id == Seat.user_id)
+        .where(in_event, Seat.status.in_(["reserved"])),
+        "pending queue page (/admin/pending-queue)": queue_page_query(event_id, 51),
+        "seats by code (/seats/reserve)": select(Seat).where(
+            in_event, Seat.code.in_(seat_codes)
+        ),
+        "release dropped holds (/seats/pre-reserve)": update(Seat)
+        .where(
+            in_event,
+            Seat.user_id == user_id,
+            Seat.status == "pre-reserved",
+            Seat.code.not_in(seat_codes),
+        )
+        .values(status="available"),
+    }
+
+
+def _scanned_relations(plan: dict) -> list[tuple[str, str, str]]:
+    """Lista (tipo do nó, relação, filtro) de cada leitura de tabela do plano."""
+    found = []
+    if "Relation Name" in plan:
+        found.append(
+            (
+                plan["Node Type"],
+                plan["Relation Name"],
+                plan.get("Filter", "(sem filtro)"),
+            )
+        )
+    for child in plan.get("Plans", []):
+        found.extend(_scanned_relations(child))
+    return found
+
+
+def seed(
+    connection, seat_count: int, user_count: int, rng: random.Random
+) -> tuple[int, list[int]]:
+    """
+    Cria um evento com sua partição, insere usuários e assentos sintéticos e
+    atualiza as estatísticas.
+
+    Returns:
+        Tupla (ID do evento, IDs dos usuários)
+    """
+    event_id = connection.execute(
+        insert(Event).values(name="Explain plans").returning(Event.id)
+    ).scalar_one()
+    create_event_partition(connection, event_id)
+
+    user_ids = connection.execute(
+        insert(User)
+        .values(
+            [
+                {
+                    "full_name": f"Explain {index}",
+                    "email": f"explain-{index}@example.invalid",
+                    "phone_number": "00000000000",
+                    "password": "x",
+                }
+                for index in range(user_count)
+            ]
+        )
+        .returning(User.id)
+    ).scalars().all()
+
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    rows = []
+    for code in _synthetic_codes(seat_count):
+        status = rng.choices(statuses, weights)[0]
+        rows.append(
+            {
+                "event_id": event_id,
+                "code": code,
+                "status": status,
+                "user_id": None if status == "available" else rng.choice(user_ids),
+                "is_half_price": rng.random() < 0.3,
+            }
+        )
+    for start in range(0, len(rows), 5000):
+        connection.execute(insert(Seat), rows[start : start + 5000])
+
+    connection.execute(text(f'ANALYZE seat_event_{event_id}, "user"'))
+    return event_id, user_ids
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--seats", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    failures = 0
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            rng = random.Random(42)
+            event_id, user_ids = seed(connection, args.seats, args.users, rng)
+            partition = f"seat_event_{event_id}"
+            sample_codes = connection.execute(
+                select(Seat.code)
+                .where(Seat.event_id == event_id)
+                .order_by(func.random())
+                .limit(6)
+            ).scalars().all()
+
+            queries = hot_queries(event_id, user_ids[0], sample_codes)
+            for name, statement in queries.items():
+                compiled = statement.compile(
+                    dialect=engine.dialect,
+                    compile_kwargs={"render_postcompile": True},
+                )
+                plan = connection.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+                ).scalar()[0]["Plan"]
+                seat_scans = [
+                    scan
+                    for scan in _scanned_relations(plan)
+                    if scan[1] == "seat" or scan[1].startswith("seat_event_")
+                ]
+                seq_scans = [
+                    scan[2] for scan in seat_scans if scan[0] == "Seq Scan"
+                ]
+                other_events = sorted(
+                    {scan[1] for scan in seat_scans if scan[1] != partition}
+                )
+                if seq_scans:
+                    failures += 1
+                    print(f"FAIL  {name}: Seq Scan em seat ({'; '.join(seq_scans)})")
+                elif other_events:
+                    failures += 1
+                    print(f"FAIL  {name}: lê outras partições ({', '.join(other_events)})")
+                else:
+                    print(f"ok    {name}: {plan['Node Type']}")
+        finally:
+            transaction.rollback()
+
+    print(f"\n{failures} consulta(s) com Seq Scan em {args.seats} assentos")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
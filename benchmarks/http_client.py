@@ -0,0 +1,188 @@
+"""Cliente HTTP e estatísticas de latência usados pelos testes de carga."""
+
+import http.client
+import json
+import math
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlparse
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Percentil pelo método do posto mais próximo sobre uma lista ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class EndpointStats:
+    """
+    Latências e resultados por endpoint, compartilhados entre threads.
+
+    Cada chamada é classificada como "ok", "conflict" (o assento foi tomado
+    por outro usuário), "error" (resposta 5xx, falha de conexão ou status
+    inesperado) ou "client_error" (demais 4xx).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.outcomes: dict[str, Counter] = defaultdict(Counter)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, endpoint: str, seconds: float, status: int, outcome: str) -> None:
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            self.outcomes[endpoint][outcome] += 1
+            self.statuses[endpoint][status] += 1
+
+    def summary(self) -> dict:
+        result = {}
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            outcomes = self.outcomes[endpoint]
+            total = len(values)
+            result[endpoint] = {
+                "requests": total,
+                "p50_ms": round(percentile(values, 0.50) * 1000, 1),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1) if values else 0.0,
+                "error_rate": round(outcomes["error"] / total, 4) if total else 0.0,
+                "conflict_rate": round(outcomes["conflict"] / total, 4)
+                if total
+                else 0.0,
+                "outcomes": dict(outcomes),
+                "statuses": {str(k): v for k, v in sorted(self.statuses[endpoint].items())},
+            }
+        return result
+
+    def print_table(self) -> None:
+        header = (
+            f"{'endpoint':<28}{'reqs':>7}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'p99 ms':>9}{'erros':>8}{'confl.':>8}"
+        )
+        print(header)
+        print("-" * len(header))
+        for endpoint, row in self.summary().items():
+            print(
+                f"{endpoint:<28}{row['requests']:>7}{row['p50_ms']:>9}"
+                f"{row['p95_ms']:>9}{row['p99_ms']:>9}"
+                f"{row['error_rate']:>8.1%}{row['conflict_rate']:>8.1%}"
+            )
+
+
+def encode_multipart(fields: dict, files: dict) -> tuple[bytes, str]:
+    """
+    Codifica um formulário multipart/form-data.
+
+    Args:
+        fields: Campos de texto
+        files: {nome: (nome do arquivo, conteúdo, content type)}
+
+    Returns:
+        Tupla (corpo, content type com boundary)
+    """
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode()
+        )
+    for name, (filename, content, content_type) in files.items():
+        parts.append(
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"; "
+            f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n'.encode()
+            + content
+            + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class HttpClient:
+    """
+    Cliente HTTP/1.1 com conexão persistente, um por usuário virtual.
+
+    Cada requisição é registrada em `stats` com o rótulo do endpoint.
+    """
+
+    def __init__(self, base_url: str, stats: EndpointStats, timeout: float = 30.0):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.https = parsed.scheme == "https"
+        self.timeout = timeout
+        self.stats = stats
+        self.token: str | None = None
+        self._connection = None
+
+    def _connect(self):
+        connection_class = (
+            http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        )
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def close(self) -> None:
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    def request(
+        self,
+        endpoint: str,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        json_body=None,
+        body: bytes | None = None,
+        content_type: str | None = None,
+        headers: dict | None = None,
+        conflict_statuses: tuple[int, ...] = (),
+    ) -> tuple[int, bytes, dict]:
+        """
+        Envia uma requisição e registra latência e resultado.
+
+        Returns:
+            Tupla (status, corpo, headers); status 0 indica falha de conexão
+        """
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        request_headers = dict(headers or {})
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            content_type = "application/json"
+        if content_type:
+            request_headers["Content-Type"] = content_type
+        if self.token:
+            request_headers["Authorization"] = f"Bearer {self.token}"
+
+        started = time.perf_counter()
+        try:
+            if self._connection is None:
+                self._connection = self._connect()
+            self._connection.request(method, path, body=body, headers=request_headers)
+            response = self._connection.getresponse()
+            payload = response.read()
+            status = response.status
+            response_headers = {k.lower(): v for k, v in response.getheaders()}
+        except (OSError, http.client.HTTPException):
+            self.close()
+            self.stats.record(endpoint, time.perf_counter() - started, 0, "error")
+            return 0, b"", {}
+        elapsed = time.perf_counter() - started
+
+        if status < 400:
+            outcome = "ok"
+        elif status in conflict_statuses:
+            outcome = "conflict"
+        elif status >= 500:
+            outcome = "error"
+        else:
+            outcome = "client_error"
+        self.stats.record(endpoint, elapsed, status, outcome)
+        return status, payload, response_headers
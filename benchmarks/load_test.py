@@ -0,0 +1,422 @@
+"""
+Teste de carga da abertura de vendas: muitos usuários chegando ao mesmo tempo.
+
+Cada usuário virtual segue o fluxo real do site: cadastro e login, algumas
+consultas ao mapa de assentos (/seats/), disputa por assentos em
+/seats/pre-reserve (tentando de novo quando perde) e envio do comprovante em
+/seats/reserve. Os emails de comprovante vão para um servidor SMTP local que
+descarta as mensagens.
+
+Ao final mostra, por endpoint, latência p50/p95/p99, taxa de erros e taxa de
+conflitos (assento tomado por outro usuário).
+
+Com --start-app a aplicação é iniciada pelo próprio script, já apontando o
+SMTP para o sink e sem rate limit. Sem ele, suba a aplicação com
+SMTP_SERVER=127.0.0.1, SMTP_PORT=<--smtp-port>, SMTP_STARTTLS=false e
+RATE_LIMIT_ENABLED=false. Use um banco local descartável: os usuários e as
+reservas ficam gravados.
+
+Com --waiting-room cada usuário passa antes pela sala de espera: entra na
+fila, consulta /waiting-room/status até ser admitido e envia o ticket nas
+rotas de assentos (com --start-app a sala de espera é ligada na aplicação e
+o comando de admissão sobe junto; sem ele, rode também
+`python -m src.commands.run_admission`).
+
+    python -m benchmarks.load_test --start-app --new-event --users 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+import subprocess
+import sys
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from benchmarks.http_client import EndpointStats, HttpClient, encode_multipart
+from benchmarks.smtp_sink import SmtpSink
+
+
+def tiny_png(seed: int) -> bytes:
+    """PNG 1x1 com a cor derivada de `seed`, para cada comprovante ser único."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    pixel = bytes([0]) + struct.pack(">I", seed & 0xFFFFFF)[1:]
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(pixel))
+        + chunk(b"IEND", b"")
+    )
+
+
+class Funnel:
+    """Contagem de usuários em cada etapa do fluxo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {
+            "started": 0,
+            "logged_in": 0,
+            "admitted": 0,
+            "pre_reserved": 0,
+            "reserved": 0,
+            "gave_up": 0,
+        }
+
+    def add(self, step: str) -> None:
+        with self._lock:
+            self.counts[step] += 1
+
+
+def available_seats(client: HttpClient, event_id: int) -> list[str]:
+    status, body, _ = client.request(
+        "GET /seats/", "GET", "/seats/", params={"event_id": event_id}
+    )
+    if status != 200:
+        return []
+    return [seat["code"] for seat in json.loads(body) if seat["status"] == "available"]
+
+
+def wait_for_admission(client: HttpClient, args) -> dict | None:
+    """
+    Entra na fila do evento e consulta o status até ser admitido.
+
+    Returns:
+        Headers com o ticket para as rotas de assentos, ou None se desistiu
+    """
+    status, body, _ = client.request(
+        "POST /waiting-room/join",
+        "POST",
+        "/waiting-room/join",
+        params={"event_id": args.event_id},
+    )
+    if status != 200:
+        return None
+    queue = json.loads(body)
+    headers = {"X-Queue-Ticket": queue["ticket"]}
+    deadline = time.monotonic() + args.queue_timeout
+    while queue["state"] != "admitted":
+        if queue["state"] == "expired" or time.monotonic() > deadline:
+            return None
+        time.sleep(queue.get("poll_after_seconds", 1))
+        status, body, _ = client.request(
+            "GET /waiting-room/status",
+            "GET",
+            "/waiting-room/status",
+            headers=headers,
+        )
+        if status != 200:
+            return None
+        queue = json.loads(body)
+    return headers
+
+
+def run_user(index: int, args, stats: EndpointStats, funnel: Funnel, start_at: float):
+    rng = random.Random(args.seed * 100003 + index)
+    # Chegada espalhada ao longo da rampa
+    delay = start_at + rng.random() * args.ramp - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    funnel.add("started")
+
+    client = HttpClient(args.base_url, stats)
+    try:
+        email = f"load-{args.run_id}-{index}@example.invalid"
+        password = "load-test-password"
+        status, _, _ = client.request(
+            "POST /register",
+            "POST",
+            "/register",
+            json_body={
+                "full_name": f"Load {index}",
+                "phone_number": "00000000000",
+                "email": email,
+                "password": password,
+            },
+        )
+        if status != 200:
+            return
+        status, body, _ = client.request(
+            "POST /login",
+            "POST",
+            "/login",
+            json_body={"email": email, "password": password},
+        )
+        if status != 200:
+            return
+        client.token = json.loads(body)["access_token"]
+        funnel.add("logged_in")
+
+        queue_headers = None
+        if args.waiting_room:
+            queue_headers = wait_for_admission(client, args)
+            if queue_headers is None:
+                funnel.add("gave_up")
+                return
+            funnel.add("admitted")
+
+        seats = []
+        for _ in range(args.polls):
+            seats = available_seats(client, args.event_id)
+            time.sleep(rng.uniform(0, args.think))
+
+        won = []
+        for _ in range(args.attempts):
+            if not seats:
+                break
+            # Todos preferem os melhores lugares: sorteia entre os primeiros
+            # livres, o que concentra a disputa como numa abertura real
+            count = min(rng.randint(1, args.max_seats), len(seats))
+            wanted = rng.sample(seats[: max(count, args.hotspot)], count)
+            status, _, _ = client.request(
+                "POST /seats/pre-reserve",
+                "POST",
+                "/seats/pre-reserve",
+                params={"event_id": args.event_id},
+                json_body=[{"seat_code": code} for code in wanted],
+                headers=queue_headers,
+                conflict_statuses=(400, 409),
+            )
+            if status == 200:
+                won = wanted
+                break
+            seats = available_seats(client, args.event_id)
+
+        if not won:
+            funnel.add("gave_up")
+            return
+        funnel.add("pre_reserved")
+
+        if rng.random() > args.checkout_rate:
+            return
+        time.sleep(rng.uniform(0, args.think))
+        body, content_type = encode_multipart(
+            {
+                "request": json.dumps(
+                    [
+                        {"seat_code": code, "is_half_price": rng.random() < 0.3}
+                        for code in won
+                    ]
+                )
+            },
+            {"file": (f"comprovante-{index}.png", tiny_png(index), "image/png")},
+        )
+        status, _, _ = client.request(
+            "POST /seats/reserve",
+            "POST",
+            "/seats/reserve",
+            params={"event_id": args.event_id},
+            body=body,
+            content_type=content_type,
+            headers=queue_headers,
+            conflict_statuses=(400, 403),
+        )
+        if status == 200:
+            funnel.add("reserved")
+    finally:
+        client.close()
+
+
+def start_app(args) -> subprocess.Popen:
+    """Sobe a aplicação com uvicorn, com o SMTP apontando para o sink."""
+    env = dict(
+        os.environ,
+        SMTP_SERVER="127.0.0.1",
+        SMTP_PORT=str(args.smtp_port),
+        SMTP_STARTTLS="false",
+        # Todos os usuários virtuais saem do mesmo IP
+        RATE_LIMIT_ENABLED="false",
+        WAITING_ROOM_ENABLED=(
+            "true" if getattr(args, "waiting_room", False) else "false"
+        ),
+    )
+    # Ferramentas com --database-url sobem a aplicação no mesmo banco
+    if getattr(args, "database_url", None):
+        env["DATABASE_URL"] = args.database_url
+    port = args.base_url.rsplit(":", 1)[-1].rstrip("/")
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.app:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            port,
+            "--workers",
+            str(args.workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urlopen(f"{args.base_url}/docs", timeout=1).close()
+            return process
+        except (URLError, OSError):
+            time.sleep(0.5)
+    process.terminate()
+    raise SystemExit("A aplicação não respondeu em 30s")
+
+
+def start_admission(args) -> subprocess.Popen:
+    """Sobe o comando que move a sala de espera, no mesmo banco da aplicação."""
+    env = dict(os.environ, WAITING_ROOM_ENABLED="true")
+    if getattr(args, "database_url", None):
+        env["DATABASE_URL"] = args.database_url
+    return subprocess.Popen(
+        [sys.executable, "-m", "src.commands.run_admission"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def create_load_event(engine=None) -> int:
+    """
+    Cria um evento novo com o layout do teatro direto no banco (o do `engine`,
+    ou o de DATABASE_URL).
+    """
+    from sqlalchemy.orm import Session
+
+    from src.database import SessionLocal
+    from src.utils.events import create_event
+    from src.utils.venue_layout import layout_path, read_layout
+
+    db = Session(bind=engine) if engine is not None else SessionLocal()
+    try:
+        name = f"Teste de carga {time.strftime('%Y-%m-%d %H:%M')}"
+        event_id = create_event(db, name, read_layout(layout_path("teatro"))).id
+        db.commit()
+        return event_id
+    finally:
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--start-app", action="store_true")
+    parser.add_argument("--workers", type=int, default=3, help="Workers do uvicorn")
+    parser.add_argument("--smtp-port", type=int, default=1025)
+    parser.add_argument("--event-id", type=int, default=1)
+    parser.add_argument(
+        "--new-event", action="store_true", help="Cria um evento só para o teste"
+    )
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Usuários simultâneos (padrão: todos)",
+    )
+    parser.add_argument("--ramp", type=float, default=5.0, help="Segundos de chegada")
+    parser.add_argument("--polls", type=int, default=3)
+    parser.add_argument("--think", type=float, default=1.0)
+    parser.add_argument("--attempts", type=int, default=5)
+    parser.add_argument("--max-seats", type=int, default=4)
+    parser.add_argument("--hotspot", type=int, default=80)
+    parser.add_argument("--checkout-rate", type=float, default=0.8)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--waiting-room", action="store_true", help="Passa pela sala de espera"
+    )
+    parser.add_argument(
+        "--queue-timeout",
+        type=float,
+        default=300.0,
+        help="Segundos na fila antes de desistir",
+    )
+    parser.add_argument("--output", help="Grava o resultado em JSON")
+    args = parser.parse_args()
+    args.run_id = uuid.uuid4().hex[:8]
+
+    if args.new_event:
+        args.event_id = create_load_event()
+        print(f"Evento de teste: {args.event_id}")
+
+    sink = SmtpSink(port=args.smtp_port).start()
+    app = start_app(args) if args.start_app else None
+    admission = (
+        start_admission(args) if args.start_app and args.waiting_room else None
+    )
+    stats = EndpointStats()
+    funnel = Funnel()
+    try:
+        started = time.monotonic()
+        start_at = started + 0.5
+        with ThreadPoolExecutor(max_workers=args.concurrency or args.users) as pool:
+            futures = [
+                pool.submit(run_user, index, args, stats, funnel, start_at)
+                for index in range(args.users)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.monotonic() - started
+        # Dá tempo para os últimos emails chegarem ao sink
+        time.sleep(1)
+    finally:
+        for process in (app, admission):
+            if process:
+                process.terminate()
+                process.wait(timeout=10)
+        sink.stop()
+
+    print(f"\n{args.users} usuários em {elapsed:.1f}s (evento {args.event_id})\n")
+    stats.print_table()
+    print(
+        "\nFunil: "
+        + ", ".join(f"{step}={count}" for step, count in funnel.counts.items())
+    )
+    print(f"Emails recebidos pelo sink: {sink.messages}")
+
+    summary = stats.summary()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(
+                {
+                    "users": args.users,
+                    "elapsed_seconds": round(elapsed, 2),
+                    "event_id": args.event_id,
+                    "endpoints": summary,
+                    "funnel": funnel.counts,
+                    "emails": sink.messages,
+                },
+                output,
+                indent=2,
+            )
+
+    failing = [
+        endpoint
+        for endpoint, row in summary.items()
+        if row["error_rate"] > args.max_error_rate
+    ]
+    if failing:
+        print(
+            f"\nFAIL  taxa de erros acima de {args.max_error_rate:.1%}: "
+            f"{', '.join(failing)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
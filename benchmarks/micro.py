@@ -0,0 +1,181 @@
+"""
+Micro-benchmarks das funções quentes: QR codes, tokens JWT, senhas e
+serialização do mapa de assentos.
+
+Cada caso roda em blocos de pelo menos --min-time segundos, repetidos
+--repeat vezes; o resultado é o tempo mediano por chamada. Os resultados são
+comparados com um baseline salvo em JSON e o script falha (código de saída
+1) se algum caso ficar mais lento que o baseline além da tolerância.
+
+    python -m benchmarks.micro                      # compara com o baseline
+    python -m benchmarks.micro --save-baseline      # grava um baseline novo
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from src.models.user import User
+from src.routers.responses.seat import SeatResponse
+from src.utils.hash import check_password_hash, hash_password
+from src.utils.jwt import create_access_token, decode_access_token
+from src.utils.qr_code import decode_qr_data, generate_seat_qr_code, seat_qr_hash
+from src.utils.venue_layout import iter_layout_seats, read_layout
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "micro.json"
+THEATRE_LAYOUT = Path(__file__).parent.parent / "venues" / "teatro.json"
+
+
+def _seat_map() -> list[SeatResponse]:
+    """Mapa completo do teatro como /seats/ devolve: todos com status e sem QR."""
+    statuses = ["available", "pre-reserved", "reserved", "occupied"]
+    return [
+        SeatResponse(code=code, status=statuses[index % 4], qr_code=None)
+        for index, (code, _, _) in enumerate(
+            iter_layout_seats(read_layout(THEATRE_LAYOUT))
+        )
+    ]
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    """Casos medidos, cada um uma função sem argumentos."""
+    user = User(
+        id=1,
+        full_name="Maria da Silva",
+        phone_number="16999999999",
+        email="maria@example.com",
+        scopes="default",
+    )
+    token = create_access_token(user)
+    password_hash = hash_password("senha-de-teste")
+    qr_url = (
+        "https://seu-dominio.com/qrcode/0123456789abcdef"
+        "?seat_code=K12&buyer_name=Maria%20da%20Silva&is_half_price=true&status=occupied"
+    )
+    seat_map = _seat_map()
+    seat_map_adapter = TypeAdapter(list[SeatResponse])
+
+    return {
+        "generate_seat_qr_code": lambda: generate_seat_qr_code(
+            seat_code="K12",
+            status="occupied",
+            is_half_price=True,
+            buyer_name="Maria da Silva",
+        ),
+        "seat_qr_hash (validate_qr_code)": lambda: seat_qr_hash(
+            "K12", "occupied", True, None, "cia-seat-system"
+        ),
+        "decode_qr_data": lambda: decode_qr_data(qr_url),
+        "create_access_token": lambda: create_access_token(user),
+        "decode_access_token": lambda: decode_access_token(token),
+        "hash_password": lambda: hash_password("senha-de-teste"),
+        "check_password_hash": lambda: check_password_hash(
+            "senha-de-teste", password_hash
+        ),
+        f"SeatResponse seat map ({len(seat_map)} seats)": lambda: (
+            seat_map_adapter.dump_json(seat_map)
+        ),
+    }
+
+
+def measure(function: Callable[[], object], min_time: float, repeat: int) -> dict:
+    """Mede o tempo por chamada em microssegundos."""
+    function()  # aquecimento
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - started) / number)
+    return {
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "iterations": number,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lista os casos que ficaram mais lentos que o baseline além da tolerância."""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        ratio = result["median_us"] / reference["median_us"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {ratio:.2f}x o baseline")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="Grava os resultados em JSON")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Fração de lentidão aceita antes de falhar (0.25 = 25%%)",
+    )
+    parser.add_argument("--filter", help="Roda só os casos que contêm este texto")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())["results"]
+
+    results = {}
+    for name, function in cases().items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(function, args.min_time, args.repeat)
+        reference = baseline.get(name)
+        change = (
+            f"{results[name]['median_us'] / reference['median_us'] - 1:+.1%}"
+            if reference
+            else "(sem baseline)"
+        )
+        print(f"{name:<40}{results[name]['median_us']:>14.2f} µs  {change}")
+
+    report = {
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline gravado em {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"FAIL  {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+"""
+Reproduz um tráfego gravado pelo TrafficCaptureMiddleware contra uma instância local.
+
+Lê o JSONL de TRAFFIC_CAPTURE_PATH e reenvia as requisições respeitando os
+intervalos originais, acelerados por --speed (1x a 10x). Cada pseudônimo de
+usuário do arquivo vira uma conta nova (cadastro e login antes do início) e
+suas requisições saem em ordem, pela mesma conexão; as requisições sem
+usuário saem no horário gravado por um grupo limitado de threads
+(--anonymous-workers). Rotas de autenticação, email e métricas não são
+reproduzidas; as de admin só com --admin-token.
+
+Os corpos JSON são remontados a partir da estrutura gravada: campos como
+seat_code e count voltam com o valor original, os demais com um valor neutro.
+Em /seats/reserve o comprovante é um PNG sintético e os assentos são as
+pré-reservas atuais do usuário na instância local.
+
+Com --compare, mostra a variação de p50/p95/p99 por rota em relação a uma
+execução anterior (arquivo gerado por --output) e falha se o p95 de alguma
+rota piorar mais que --max-regression.
+
+    python -m benchmarks.replay captura.jsonl --speed 5 --output depois.json \\
+        --compare antes.json
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.http_client import EndpointStats, HttpClient, encode_multipart
+from benchmarks.load_test import tiny_png
+
+# Rotas que dependem de credenciais reais ou de serviços externos
+SKIPPED_PREFIXES = (
+    "/login",
+    "/register",
+    "/forgot-password",
+    "/reset-password",
+    "/email",
+    "/metrics",
+    "/docs",
+    "/openapi.json",
+)
+
+# Valores neutros para os campos gravados só com o tipo
+_PLACEHOLDERS = {
+    "<str>": "x",
+    "<int>": 0,
+    "<float>": 0.0,
+    "<bool>": False,
+    "<null>": None,
+}
+
+# Respostas esperadas quando o assento já foi tomado na reprodução
+CONFLICT_STATUSES = (400, 403, 404, 409)
+
+
+def materialize(shape):
+    """Monta um valor concreto a partir da estrutura gravada."""
+    if isinstance(shape, dict):
+        return {key: materialize(item) for key, item in shape.items()}
+    if isinstance(shape, list):
+        return [materialize(item) for item in shape]
+    if isinstance(shape, str) and shape in _PLACEHOLDERS:
+        return _PLACEHOLDERS[shape]
+    return shape
+
+
+def load_trace(path: str, replay_admin: bool) -> list[dict]:
+    """Lê o arquivo de captura e mantém só as requisições reproduzíveis."""
+    entries = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            route = entry.get("route")
+            if not route or route.startswith(SKIPPED_PREFIXES):
+                continue
+            if route.startswith("/admin") and not replay_admin:
+                continue
+            if "{" in route and any(
+                isinstance(value, str) and value.startswith("<")
+                for value in entry.get("path_params", {}).values()
+            ):
+                continue
+            entries.append(entry)
+    entries.sort(key=lambda entry: entry["t"])
+    return entries
+
+
+def create_account(base_url: str, setup_stats: EndpointStats, run_id: str, index: int):
+    """Cadastra e autentica um usuário novo; devolve o token ou None."""
+    client = HttpClient(base_url, setup_stats)
+    try:
+        email = f"replay-{run_id}-{index}@example.invalid"
+        password = "replay-password"
+        status, _, _ = client.request(
+            "POST /register",
+            "POST",
+            "/register",
+            json_body={
+                "full_name": f"Replay {index}",
+                "phone_number": "00000000000",
+                "email": email,
+                "password": password,
+            },
+        )
+        if status != 200:
+            return None
+        status, body, _ = client.request(
+            "POST /login",
+            "POST",
+            "/login",
+            json_body={"email": email, "password": password},
+        )
+        return json.loads(body)["access_token"] if status == 200 else None
+    finally:
+        client.close()
+
+
+def _reserve_body(client: HttpClient, params: dict, seed: int) -> tuple[bytes, str]:
+    """Corpo de /seats/reserve com as pré-reservas atuais do usuário."""
+    status, body, _ = client.request(
+        "setup",
+        "GET",
+        "/seats/user/pre-reserved",
+        params={key: value for key, value in params.items() if key == "event_id"},
+    )
+    seats = json.loads(body) if status == 200 else []
+    return encode_multipart(
+        {
+            "request": json.dumps(
+                [{"seat_code": seat["code"], "is_half_price": False} for seat in seats]
+            )
+        },
+        {"file": (f"replay-{seed}.png", tiny_png(seed), "image/png")},
+    )
+
+
+def send_entry(
+    client: HttpClient, setup_client: HttpClient, entry: dict, args
+) -> None:
+    """Reenvia uma requisição gravada."""
+    path = entry["route"].format(**entry.get("path_params", {}))
+    params = materialize(entry.get("query") or {})
+    if args.event_id is not None and "event_id" in params:
+        params["event_id"] = args.event_id
+    endpoint = f"{entry['method']} {entry['route']}"
+
+    body = content_type = None
+    json_body = None
+    if entry["route"] == "/seats/reserve":
+        seed = int(entry["t"] * 1000)
+        body, content_type = _reserve_body(setup_client, params, seed)
+    elif entry.get("body") is not None:
+        json_body = materialize(entry["body"])
+
+    client.request(
+        endpoint,
+        entry["method"],
+        path,
+        params=params,
+        json_body=json_body,
+        body=body,
+        content_type=content_type,
+        conflict_statuses=CONFLICT_STATUSES,
+    )
+
+
+def _wait_until(entry: dict, args, start_at: float) -> None:
+    delay = start_at + (entry["t"] - args.trace_start) / args.speed - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def replay_sequence(
+    entries: list[dict], token: str | None, args, stats: EndpointStats, start_at: float
+) -> None:
+    """Reenvia, em ordem e no ritmo original, as requisições de um usuário."""
+    client = HttpClient(args.base_url, stats)
+    setup_client = HttpClient(args.base_url, EndpointStats())
+    client.token = setup_client.token = token
+    try:
+        for entry in entries:
+            _wait_until(entry, args, start_at)
+            send_entry(client, setup_client, entry, args)
+    finally:
+        client.close()
+        setup_client.close()
+
+
+def replay_anonymous(
+    entries: list[dict], args, stats: EndpointStats, start_at: float
+) -> None:
+    """
+    Reenvia as requisições sem usuário no ritmo original, com no máximo
+    --anonymous-workers em paralelo. Um único agendador dorme até o horário de
+    cada requisição; numa captura de abertura de vendas são dezenas de
+    milhares de consultas a /seats/, e uma thread por requisição não cabe.
+    """
+    local = threading.local()
+    clients = []
+    clients_lock = threading.Lock()
+
+    def send(entry: dict) -> None:
+        if not hasattr(local, "client"):
+            local.client = HttpClient(args.base_url, stats)
+            local.setup_client = HttpClient(args.base_url, EndpointStats())
+            with clients_lock:
+                clients.extend((local.client, local.setup_client))
+        send_entry(local.client, local.setup_client, entry, args)
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.anonymous_workers) as pool:
+            for entry in entries:
+                _wait_until(entry, args, start_at)
+                pool.submit(send, entry)
+    finally:
+        for client in clients:
+            client.close()
+
+
+def compare(current: dict, baseline: dict, max_regression: float, min_requests: int):
+    """
+    Mostra a variação de latência por rota e devolve as rotas cujo p95
+    piorou mais que `max_regression`.
+    """
+    header = (
+        f"{'endpoint':<40}{'p50 ms':>16}{'p95 ms':>16}{'p99 ms':>16}{'Δ p95':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    regressions = []
+    for endpoint, row in current.items():
+        before = baseline.get(endpoint)
+        if not before:
+            print(f"{endpoint:<40}{'(sem base)':>16}")
+            continue
+        cells = "".join(
+            f"{f'{before[key]}→{row[key]}':>16}"
+            for key in ("p50_ms", "p95_ms", "p99_ms")
+        )
+        change = (
+            (row["p95_ms"] - before["p95_ms"]) / before["p95_ms"]
+            if before["p95_ms"]
+            else 0.0
+        )
+        print(f"{endpoint:<40}{cells}{change:>+9.1%}")
+        enough = min(row["requests"], before["requests"]) >= min_requests
+        if enough and change > max_regression:
+            regressions.append(endpoint)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("trace", help="Arquivo JSONL gravado pela captura")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--speed", type=float, default=1.0, help="De 1 a 10")
+    parser.add_argument(
+        "--event-id", type=int, default=None, help="Troca o event_id gravado"
+    )
+    parser.add_argument(
+        "--admin-token", help="Token de admin para reproduzir as rotas /admin"
+    )
+    parser.add_argument("--output", help="Grava o resultado em JSON")
+    parser.add_argument("--compare", help="Resultado anterior (--output) para comparar")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    parser.add_argument(
+        "--max-users",
+        type=int,
+        default=500,
+        help="Sequências de usuários reproduzidas em paralelo",
+    )
+    parser.add_argument(
+        "--anonymous-workers",
+        type=int,
+        default=50,
+        help="Requisições sem usuário em paralelo",
+    )
+    parser.add_argument(
+        "--min-requests",
+        type=int,
+        default=20,
+        help="Amostras mínimas para uma rota contar na comparação",
+    )
+    args = parser.parse_args()
+    if not 1 <= args.speed <= 10:
+        parser.error("--speed deve ficar entre 1 e 10")
+
+    entries = load_trace(args.trace, replay_admin=bool(args.admin_token))
+    if not entries:
+        print("Nenhuma requisição reproduzível no arquivo")
+        return 1
+    args.trace_start = entries[0]["t"]
+
+    # Sequências: uma por usuário; as anônimas vão para um agendador único
+    sequences: dict[str, list[dict]] = {}
+    anonymous = []
+    for entry in entries:
+        user = entry.get("user")
+        if not user:
+            anonymous.append(entry)
+            continue
+        key = "admin" if user.startswith("admin-") else user
+        sequences.setdefault(key, []).append(entry)
+
+    run_id = uuid.uuid4().hex[:8]
+    setup_stats = EndpointStats()
+    users = [key for key in sequences if key.startswith("user-")]
+    print(f"Criando {len(users)} usuários...")
+    with ThreadPoolExecutor(max_workers=min(50, len(users) or 1)) as pool:
+        tokens = dict(
+            zip(
+                users,
+                pool.map(
+                    lambda item: create_account(
+                        args.base_url, setup_stats, run_id, item
+                    ),
+                    range(len(users)),
+                ),
+            )
+        )
+    tokens["admin"] = args.admin_token
+
+    stats = EndpointStats()
+    duration = (entries[-1]["t"] - entries[0]["t"]) / args.speed
+    print(
+        f"Reproduzindo {len(entries)} requisições ({len(sequences)} usuários, "
+        f"{len(anonymous)} anônimas) em ~{duration:.0f}s a {args.speed:g}x"
+    )
+    if len(sequences) > args.max_users:
+        print(
+            f"Aviso: {len(sequences)} usuários e --max-users {args.max_users}; "
+            "os excedentes começam atrasados"
+        )
+    started = time.monotonic()
+    start_at = started + 0.5
+    skipped = 0
+    # Uma thread por usuário (até --max-users) e uma para o agendador anônimo
+    workers = min(len(sequences), args.max_users) + 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        if anonymous:
+            futures.append(
+                pool.submit(replay_anonymous, anonymous, args, stats, start_at)
+            )
+        for key, sequence in sequences.items():
+            token = tokens.get(key)
+            if key.startswith("user-") and not token:
+                skipped += len(sequence)
+                continue
+            futures.append(
+                pool.submit(replay_sequence, sequence, token, args, stats, start_at)
+            )
+        for future in futures:
+            future.result()
+    elapsed = time.monotonic() - started
+
+    print(f"\n{len(entries) - skipped} requisições em {elapsed:.1f}s\n")
+    if skipped:
+        print(f"{skipped} requisições puladas: falha ao criar o usuário\n")
+    stats.print_table()
+
+    summary = stats.summary()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(
+                {
+                    "trace": args.trace,
+                    "speed": args.speed,
+                    "requests": len(entries) - skipped,
+                    "elapsed_seconds": round(elapsed, 2),
+                    "endpoints": summary,
+                },
+                output,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["endpoints"]
+        print()
+        regressions = compare(
+            summary, baseline, args.max_regression, args.min_requests
+        )
+        if regressions:
+            print(
+                f"\nFAIL  p95 piorou mais de {args.max_regression:.0%}: "
+                f"{', '.join(regressions)}"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Servidor SMTP local que aceita e descarta todas as mensagens.
+
+Usado nos testes de carga para que os emails de comprovante sejam enviados
+de verdade (conexão, comandos e corpo) sem sair da máquina. A aplicação
+precisa apontar para ele com SMTP_SERVER=127.0.0.1, SMTP_PORT=<porta> e
+SMTP_STARTTLS=false.
+
+    python -m benchmarks.smtp_sink --port 1025
+"""
+
+import argparse
+import asyncio
+import threading
+
+
+class SmtpSink:
+    """Servidor SMTP mínimo (sem TLS nem autenticação) que conta mensagens."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 1025):
+        self.host = host
+        self.port = port
+        self.messages = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.base_events.Server | None = None
+
+    async def _handle(self, reader, writer) -> None:
+        writer.write(b"220 smtp-sink ready\r\n")
+        await writer.drain()
+        try:
+            while line := await reader.readline():
+                command = line.decode("latin-1").strip().upper()
+                if command.startswith(("EHLO", "HELO")):
+                    writer.write(b"250 smtp-sink\r\n")
+                elif command == "DATA":
+                    writer.write(b"354 end with <CRLF>.<CRLF>\r\n")
+                    await writer.drain()
+                    size = 0
+                    while (data := await reader.readline()) not in (b".\r\n", b""):
+                        size += len(data)
+                    with self._lock:
+                        self.messages += 1
+                        self.bytes += size
+                    writer.write(b"250 queued\r\n")
+                elif command == "QUIT":
+                    writer.write(b"221 bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    # MAIL, RCPT, RSET, NOOP...
+                    writer.write(b"250 ok\r\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self) -> "SmtpSink":
+        """Inicia o servidor em uma thread própria."""
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.call_soon(ready.set)
+            try:
+                self._loop.run_until_complete(self.serve())
+            except asyncio.CancelledError:
+                pass
+
+        threading.Thread(target=run, name="smtp-sink", daemon=True).start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop and self._server:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+
+    sink = SmtpSink(args.host, args.port)
+    print(f"SMTP sink em {args.host}:{args.port}")
+    try:
+        asyncio.run(sink.serve())
+    except KeyboardInterrupt:
+        print(f"{sink.messages} mensagens recebidas ({sink.bytes} bytes)")
+
+
+if __name__ == "__main__":
+    main()
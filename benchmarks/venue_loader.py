@@ -0,0 +1,110 @@
+"""
+Mede a carga de um local grande com o carregador de layouts.
+
+Gera um layout sintético (60 mil assentos por padrão, em várias seções e
+zonas de preço), carrega em um evento temporário, carrega de novo para
+verificar que a segunda carga não altera nada e desfaz a transação no final.
+Falha (código de saída 1) se a segunda carga inserir ou atualizar assentos
+ou se a primeira passar do limite de tempo.
+
+    python -m benchmarks.venue_loader --rows 240 --seats-per-row 250
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from src.models.event import Event
+from src.models.seat import Seat
+from src.settings import settings
+from src.utils.events import create_event_partition
+from src.utils.venue_layout import row_label, load_layout_seats
+
+
+def synthetic_layout(rows: int, seats_per_row: int) -> dict:
+    """Layout com três seções de fileiras consecutivas e um corredor central."""
+    aisle = seats_per_row // 2
+    seats = f"1-{aisle},{aisle + 2}-{seats_per_row}"
+    sections = []
+    first = 1
+    for name, zone, share in (
+        ("plateia", "premium", 0.2),
+        ("mezanino", "padrao", 0.5),
+        ("balcao", "economica", 0.3),
+    ):
+        last = rows if name == "balcao" else first + int(rows * share) - 1
+        row_range = f"{row_label(first)}-{row_label(last)}"
+        sections.append(
+            {
+                "name": name,
+                "price_zone": zone,
+                "rows": [{"rows": row_range, "seats": seats}],
+            }
+        )
+        first = last + 1
+    return {
+        "name": "Arena sintética",
+        "price_zones": ["premium", "padrao", "economica"],
+        "sections": sections,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=240)
+    parser.add_argument("--seats-per-row", type=int, default=250)
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=10.0,
+        help="Tempo máximo aceito para a primeira carga",
+    )
+    args = parser.parse_args()
+
+    layout = synthetic_layout(args.rows, args.seats_per_row)
+    engine = create_engine(args.database_url)
+    failures = 0
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection)
+        try:
+            event_id = db.execute(
+                insert(Event).values(name="Venue loader").returning(Event.id)
+            ).scalar_one()
+            create_event_partition(db, event_id)
+
+            for attempt in ("primeira", "segunda"):
+                started = time.perf_counter()
+                result = load_layout_seats(db, event_id, layout)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"{attempt} carga: {result['seats']} assentos, "
+                    f"{result['inserted']} inseridos, "
+                    f"{result['updated']} atualizados em {elapsed:.2f}s"
+                )
+                if attempt == "primeira" and elapsed > args.max_seconds:
+                    failures += 1
+                    print(f"FAIL  carga acima de {args.max_seconds:.1f}s")
+                if attempt == "segunda" and (result["inserted"] or result["updated"]):
+                    failures += 1
+                    print("FAIL  a segunda carga alterou assentos")
+
+            stored = db.execute(
+                select(func.count()).where(Seat.event_id == event_id)
+            ).scalar_one()
+            if stored != result["seats"]:
+                failures += 1
+                print(f"FAIL  {stored} assentos gravados, esperado {result['seats']}")
+        finally:
+            db.close()
+            transaction.rollback()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
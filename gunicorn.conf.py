@@ -0,0 +1,21 @@
+# Configuração lida automaticamente pelo gunicorn (ver Procfile).
+#
+# As métricas do Prometheus de cada worker são gravadas em arquivos no
+# diretório PROMETHEUS_MULTIPROC_DIR e somadas em /metrics. O diretório é
+# limpo ao iniciar o servidor, e os arquivos de workers encerrados são
+# marcados para não inflar os gauges.
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+METRICS_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/cia-metrics")
+
+
+def on_starting(server):
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,45 @@
+"""add receipt hashes
+
+Revision ID: 0a4c6e8b2d15
+Revises: f2b8d4e6a913
+Create Date: 2026-10-19 20:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0a4c6e8b2d15"
+down_revision: Union[str, Sequence[str], None] = "f2b8d4e6a913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "receipt", sa.Column("content_sha256", sa.String(length=64), nullable=True)
+    )
+    op.add_column(
+        "receipt", sa.Column("perceptual_hash", sa.String(length=16), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_receipt_content_sha256"), "receipt", ["content_sha256"], unique=False
+    )
+    op.create_index(
+        op.f("ix_receipt_perceptual_hash"),
+        "receipt",
+        ["perceptual_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_receipt_perceptual_hash"), table_name="receipt")
+    op.drop_index(op.f("ix_receipt_content_sha256"), table_name="receipt")
+    op.drop_column("receipt", "perceptual_hash")
+    op.drop_column("receipt", "content_sha256")
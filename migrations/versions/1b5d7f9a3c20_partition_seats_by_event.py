@@ -0,0 +1,288 @@
+"""partition seats by event
+
+Cria a tabela event e reconstrói seat como tabela particionada por
+LIST (event_id), com uma partição por evento. Os assentos existentes passam a
+pertencer ao evento 1 (partição seat_event_1). O código do assento deixa de
+ser único globalmente e passa a ser único dentro do evento.
+
+seat_hold, seat_stats, transaction e transaction_seat recebem event_id; as
+linhas existentes também ficam no evento 1.
+
+Revision ID: 1b5d7f9a3c20
+Revises: 0a4c6e8b2d15
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1b5d7f9a3c20"
+down_revision: Union[str, Sequence[str], None] = "0a4c6e8b2d15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEAT_STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION seat_stats_apply() RETURNS trigger AS $$
+DECLARE
+    slot smallint := pg_backend_pid() % 16;
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND NEW.status = OLD.status
+       AND NEW.is_half_price = OLD.is_half_price THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO seat_stats (event_id, status, is_half_price, shard, total)
+        VALUES (OLD.event_id, OLD.status, OLD.is_half_price, slot, -1)
+        ON CONFLICT (event_id, status, is_half_price, shard)
+        DO UPDATE SET total = seat_stats.total - 1;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO seat_stats (event_id, status, is_half_price, shard, total)
+        VALUES (NEW.event_id, NEW.status, NEW.is_half_price, slot, 1)
+        ON CONFLICT (event_id, status, is_half_price, shard)
+        DO UPDATE SET total = seat_stats.total + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+LEGACY_SEAT_STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION seat_stats_apply() RETURNS trigger AS $$
+DECLARE
+    slot smallint := pg_backend_pid() % 16;
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND NEW.status = OLD.status
+       AND NEW.is_half_price = OLD.is_half_price THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO seat_stats (status, is_half_price, shard, total)
+        VALUES (OLD.status, OLD.is_half_price, slot, -1)
+        ON CONFLICT (status, is_half_price, shard)
+        DO UPDATE SET total = seat_stats.total - 1;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO seat_stats (status, is_half_price, shard, total)
+        VALUES (NEW.status, NEW.is_half_price, slot, 1)
+        ON CONFLICT (status, is_half_price, shard)
+        DO UPDATE SET total = seat_stats.total + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+SEAT_STATS_TRIGGER = """
+CREATE TRIGGER seat_stats_apply
+AFTER INSERT OR DELETE OR UPDATE OF status, is_half_price ON seat
+FOR EACH ROW EXECUTE FUNCTION seat_stats_apply()
+"""
+
+SEAT_COLUMNS = "id, user_id, code, status, is_half_price, created_at, updated_at"
+
+
+def _add_event_column(table: str, foreign_key: bool = True) -> None:
+    """Adiciona event_id preenchendo as linhas existentes com o evento 1."""
+    op.add_column(
+        table,
+        sa.Column("event_id", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.alter_column(table, "event_id", server_default=None)
+    if foreign_key:
+        op.create_foreign_key(
+            f"{table}_event_id_fkey", table, "event", ["event_id"], ["id"]
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "event",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("starts_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "status", sa.String(length=20), nullable=False, server_default="on_sale"
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index(op.f("ix_event_id"), "event", ["id"], unique=False)
+    op.execute("INSERT INTO event (id, name) VALUES (1, 'Evento principal')")
+    op.execute("SELECT setval('event_id_seq', 1)")
+
+    # Reconstrói seat como tabela particionada, preservando a sequência de IDs
+    op.execute("DROP TRIGGER IF EXISTS seat_stats_apply ON seat")
+    op.execute("ALTER SEQUENCE seat_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE seat RENAME TO seat_legacy")
+    op.execute("ALTER TABLE seat_legacy RENAME CONSTRAINT seat_pkey TO seat_legacy_pkey")
+    for index in (
+        "ix_seat_id",
+        "ix_seat_code",
+        "ix_seat_user_id_status",
+        "ix_seat_reserved_queue",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.execute(
+        """
+        CREATE TABLE seat (
+            id integer NOT NULL DEFAULT nextval('seat_id_seq'),
+            event_id integer NOT NULL REFERENCES event (id),
+            user_id integer REFERENCES "user" (id),
+            code varchar(3) NOT NULL,
+            status varchar(20) NOT NULL,
+            is_half_price boolean NOT NULL DEFAULT false,
+            created_at timestamp without time zone DEFAULT now(),
+            updated_at timestamp without time zone DEFAULT now(),
+            CONSTRAINT seat_pkey PRIMARY KEY (id, event_id),
+            CONSTRAINT uq_seat_event_id_code UNIQUE (event_id, code)
+        ) PARTITION BY LIST (event_id)
+        """
+    )
+    op.execute("ALTER SEQUENCE seat_id_seq OWNED BY seat.id")
+    op.create_index(op.f("ix_seat_id"), "seat", ["id"], unique=False)
+    op.create_index(
+        "ix_seat_user_id_status", "seat", ["user_id", "status"], unique=False
+    )
+    op.create_index(
+        "ix_seat_reserved_queue",
+        "seat",
+        ["user_id", "updated_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'reserved'"),
+    )
+    op.execute("CREATE TABLE seat_event_1 PARTITION OF seat FOR VALUES IN (1)")
+    op.execute(
+        f"""
+        INSERT INTO seat (event_id, {SEAT_COLUMNS})
+        SELECT 1, {SEAT_COLUMNS} FROM seat_legacy
+        """
+    )
+    op.execute("DROP TABLE seat_legacy")
+
+    # Contadores, retenções e transações passam a ser por evento
+    _add_event_column("seat_stats", foreign_key=False)
+    op.execute("ALTER TABLE seat_stats DROP CONSTRAINT seat_stats_pkey")
+    op.create_primary_key(
+        "seat_stats_pkey",
+        "seat_stats",
+        ["event_id", "status", "is_half_price", "shard"],
+    )
+    op.execute(SEAT_STATS_FUNCTION)
+    op.execute(SEAT_STATS_TRIGGER)
+
+    _add_event_column("seat_hold")
+    op.execute("ALTER TABLE seat_hold DROP CONSTRAINT seat_hold_pkey")
+    op.create_primary_key("seat_hold_pkey", "seat_hold", ["user_id", "event_id"])
+
+    _add_event_column("transaction")
+
+    _add_event_column("transaction_seat", foreign_key=False)
+    op.drop_index(
+        "ix_transaction_seat_seat_code_created_at", table_name="transaction_seat"
+    )
+    op.create_index(
+        "ix_transaction_seat_event_id_seat_code_created_at",
+        "transaction_seat",
+        ["event_id", "seat_code", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Apenas o evento 1 volta para o modelo de evento único
+    op.drop_index(
+        "ix_transaction_seat_event_id_seat_code_created_at",
+        table_name="transaction_seat",
+    )
+    op.execute("DELETE FROM transaction_seat WHERE event_id <> 1")
+    op.drop_column("transaction_seat", "event_id")
+    op.create_index(
+        "ix_transaction_seat_seat_code_created_at",
+        "transaction_seat",
+        ["seat_code", "created_at"],
+        unique=False,
+    )
+
+    op.execute('DELETE FROM "transaction" WHERE event_id <> 1')
+    op.drop_constraint("transaction_event_id_fkey", "transaction", type_="foreignkey")
+    op.drop_column("transaction", "event_id")
+
+    op.execute("DELETE FROM seat_hold WHERE event_id <> 1")
+    op.execute("ALTER TABLE seat_hold DROP CONSTRAINT seat_hold_pkey")
+    op.drop_constraint("seat_hold_event_id_fkey", "seat_hold", type_="foreignkey")
+    op.drop_column("seat_hold", "event_id")
+    op.create_primary_key("seat_hold_pkey", "seat_hold", ["user_id"])
+
+    op.execute("DROP TRIGGER IF EXISTS seat_stats_apply ON seat")
+    op.execute("DELETE FROM seat_stats WHERE event_id <> 1")
+    op.execute("ALTER TABLE seat_stats DROP CONSTRAINT seat_stats_pkey")
+    op.drop_column("seat_stats", "event_id")
+    op.create_primary_key(
+        "seat_stats_pkey", "seat_stats", ["status", "is_half_price", "shard"]
+    )
+    op.execute(LEGACY_SEAT_STATS_FUNCTION)
+
+    op.execute("ALTER SEQUENCE seat_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE seat RENAME TO seat_partitioned")
+    op.execute(
+        "ALTER TABLE seat_partitioned RENAME CONSTRAINT seat_pkey TO seat_partitioned_pkey"
+    )
+    for index in ("ix_seat_id", "ix_seat_user_id_status", "ix_seat_reserved_queue"):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+    op.execute(
+        """
+        CREATE TABLE seat (
+            id integer PRIMARY KEY DEFAULT nextval('seat_id_seq'),
+            user_id integer REFERENCES "user" (id),
+            code varchar(3) NOT NULL,
+            status varchar(20) NOT NULL,
+            is_half_price boolean NOT NULL DEFAULT false,
+            created_at timestamp without time zone DEFAULT now(),
+            updated_at timestamp without time zone DEFAULT now()
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE seat_id_seq OWNED BY seat.id")
+    op.execute(
+        f"""
+        INSERT INTO seat ({SEAT_COLUMNS})
+        SELECT {SEAT_COLUMNS} FROM seat_partitioned WHERE event_id = 1
+        """
+    )
+    op.execute("DROP TABLE seat_partitioned CASCADE")
+    op.create_index(op.f("ix_seat_id"), "seat", ["id"], unique=False)
+    op.create_index(op.f("ix_seat_code"), "seat", ["code"], unique=True)
+    op.create_index(
+        "ix_seat_user_id_status", "seat", ["user_id", "status"], unique=False
+    )
+    op.create_index(
+        "ix_seat_reserved_queue",
+        "seat",
+        ["user_id", "updated_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'reserved'"),
+    )
+    op.execute(SEAT_STATS_TRIGGER)
+
+    op.drop_index(op.f("ix_event_id"), table_name="event")
+    op.drop_table("event")
@@ -0,0 +1,81 @@
+"""add seat sections and price zones
+
+Aumenta os códigos de assento para até 8 caracteres (locais grandes usam
+fileiras como "AB" e números de três dígitos) e adiciona seção e zona de
+preço aos assentos, preenchidas a partir do layout do local. Os assentos já
+existentes recebem os valores de venues/teatro.json.
+
+Revision ID: 2e9a4c6d8f31
+Revises: 1b5d7f9a3c20
+Create Date: 2026-10-19 21:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2e9a4c6d8f31"
+down_revision: Union[str, Sequence[str], None] = "1b5d7f9a3c20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "seat",
+        "code",
+        existing_type=sa.String(length=3),
+        type_=sa.String(length=8),
+        existing_nullable=False,
+    )
+    op.alter_column(
+        "transaction_seat",
+        "seat_code",
+        existing_type=sa.String(length=3),
+        type_=sa.String(length=8),
+        existing_nullable=False,
+    )
+    for table in ("transaction", "seat_hold"):
+        op.alter_column(
+            table,
+            "seats",
+            existing_type=sa.ARRAY(sa.String(length=3)),
+            type_=sa.ARRAY(sa.String(length=8)),
+            existing_nullable=False,
+        )
+
+    op.add_column("seat", sa.Column("section", sa.String(length=50), nullable=True))
+    op.add_column("seat", sa.Column("price_zone", sa.String(length=20), nullable=True))
+    op.execute("UPDATE seat SET section = 'plateia', price_zone = 'padrao'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("seat", "price_zone")
+    op.drop_column("seat", "section")
+    for table in ("transaction", "seat_hold"):
+        op.alter_column(
+            table,
+            "seats",
+            existing_type=sa.ARRAY(sa.String(length=8)),
+            type_=sa.ARRAY(sa.String(length=3)),
+            existing_nullable=False,
+        )
+    op.alter_column(
+        "transaction_seat",
+        "seat_code",
+        existing_type=sa.String(length=8),
+        type_=sa.String(length=3),
+        existing_nullable=False,
+    )
+    op.alter_column(
+        "seat",
+        "code",
+        existing_type=sa.String(length=8),
+        type_=sa.String(length=3),
+        existing_nullable=False,
+    )
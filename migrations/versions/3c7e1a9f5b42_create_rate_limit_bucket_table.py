@@ -0,0 +1,49 @@
+"""create rate limit bucket table
+
+Baldes de tokens do rate limiter, compartilhados entre os workers. A tabela é
+UNLOGGED: perder o conteúdo em uma queda do banco só zera os limites, e as
+escritas a cada requisição limitada não passam pelo WAL.
+
+Revision ID: 3c7e1a9f5b42
+Revises: 2e9a4c6d8f31
+Create Date: 2026-10-19 23:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c7e1a9f5b42"
+down_revision: Union[str, Sequence[str], None] = "2e9a4c6d8f31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "rate_limit_bucket",
+        sa.Column("key", sa.String(length=200), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("allowed", sa.Boolean(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        op.f("ix_rate_limit_bucket_updated_at"),
+        "rate_limit_bucket",
+        ["updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_rate_limit_bucket_updated_at"), table_name="rate_limit_bucket"
+    )
+    op.drop_table("rate_limit_bucket")
@@ -0,0 +1,77 @@
+"""create waiting room tables
+
+Fila da sala de espera (uma linha por usuário e evento, na ordem de
+chegada) e o estado do controle de admissão de cada evento.
+
+Revision ID: 4d8f2b6a1c57
+Revises: 3c7e1a9f5b42
+Create Date: 2026-10-20 00:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4d8f2b6a1c57"
+down_revision: Union[str, Sequence[str], None] = "3c7e1a9f5b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "waiting_room_ticket",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("admitted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["event.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "event_id", "user_id", name="uq_waiting_room_ticket_event_id_user_id"
+        ),
+    )
+    op.create_index(
+        "ix_waiting_room_ticket_waiting",
+        "waiting_room_ticket",
+        ["event_id", "id"],
+        unique=False,
+        postgresql_where=sa.text("admitted_at IS NULL"),
+    )
+    op.create_index(
+        "ix_waiting_room_ticket_event_id_expires_at",
+        "waiting_room_ticket",
+        ["event_id", "expires_at"],
+        unique=False,
+    )
+
+    op.create_table(
+        "waiting_room_state",
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("max_active", sa.Integer(), nullable=False),
+        sa.Column("last_tick_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["event.id"]),
+        sa.PrimaryKeyConstraint("event_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("waiting_room_state")
+    op.drop_index(
+        "ix_waiting_room_ticket_event_id_expires_at", table_name="waiting_room_ticket"
+    )
+    op.drop_index("ix_waiting_room_ticket_waiting", table_name="waiting_room_ticket")
+    op.drop_table("waiting_room_ticket")
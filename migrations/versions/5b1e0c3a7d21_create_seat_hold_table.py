@@ -0,0 +1,132 @@
+"""create seat hold table
+
+Move as pré-reservas para a tabela seat_hold (uma linha por usuário, com
+prazo de expiração) e compacta as linhas de transaction geradas a cada clique
+em /seats/pre-reserve.
+
+Até aqui as duas rotas gravavam linhas idênticas em transaction. Uma reserva
+só é aceita logo depois de uma pré-reserva dos mesmos assentos, então uma
+linha é mantida como reserva real quando a linha anterior do mesmo usuário tem
+exatamente o mesmo conjunto de assentos. As demais são tratadas como cliques
+de pré-reserva, exceto quando todos os seus assentos estão hoje reservados ou
+ocupados pelo usuário e a linha seguinte não repete o conjunto (reserva de
+parte dos assentos pré-reservados). As linhas removidas são copiadas antes
+para transaction_archive, e o downgrade as devolve.
+
+Revision ID: 5b1e0c3a7d21
+Revises: 94c0b7e4794a
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e0c3a7d21"
+down_revision: Union[str, Sequence[str], None] = "94c0b7e4794a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "seat_hold",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("seats", sa.ARRAY(sa.String(length=3)), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_index(
+        op.f("ix_seat_hold_expires_at"), "seat_hold", ["expires_at"], unique=False
+    )
+
+    # Pré-reservas em andamento ganham uma retenção com o prazo padrão
+    op.execute(
+        """
+        INSERT INTO seat_hold (user_id, seats, expires_at)
+        SELECT user_id, array_agg(code ORDER BY code), now() + interval '15 minutes'
+        FROM seat
+        WHERE status = 'pre-reserved' AND user_id IS NOT NULL
+        GROUP BY user_id
+        """
+    )
+
+    # Remove as linhas de transaction que eram apenas cliques de pré-reserva,
+    # guardando uma cópia delas em transaction_archive
+    op.execute(
+        """
+        CREATE TABLE transaction_archive AS
+        SELECT id, seats, user_id, created_at, updated_at
+        FROM transaction
+        WITH NO DATA
+        """
+    )
+    op.execute(
+        """
+        WITH w AS (
+            SELECT
+                id,
+                user_id,
+                seats,
+                (SELECT array_agg(s ORDER BY s) FROM unnest(seats) s) AS seat_set,
+                lag(
+                    (SELECT array_agg(s ORDER BY s) FROM unnest(seats) s)
+                ) OVER (PARTITION BY user_id ORDER BY created_at, id) AS previous_set,
+                lead(
+                    (SELECT array_agg(s ORDER BY s) FROM unnest(seats) s)
+                ) OVER (PARTITION BY user_id ORDER BY created_at, id) AS next_set
+            FROM transaction
+        ),
+        clicks AS (
+            SELECT w.id
+            FROM w
+            WHERE w.previous_set IS DISTINCT FROM w.seat_set
+              AND (
+                  w.next_set = w.seat_set
+                  OR EXISTS (
+                      SELECT 1
+                      FROM unnest(w.seats) AS u(seat_code)
+                      WHERE NOT EXISTS (
+                          SELECT 1
+                          FROM seat s
+                          WHERE s.code = u.seat_code
+                            AND s.user_id = w.user_id
+                            AND s.status IN ('reserved', 'occupied')
+                      )
+                  )
+              )
+        ),
+        removed AS (
+            DELETE FROM transaction t
+            USING clicks c
+            WHERE t.id = c.id
+            RETURNING t.id, t.seats, t.user_id, t.created_at, t.updated_at
+        )
+        INSERT INTO transaction_archive (id, seats, user_id, created_at, updated_at)
+        SELECT id, seats, user_id, created_at, updated_at FROM removed
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        INSERT INTO transaction (id, seats, user_id, created_at, updated_at)
+        SELECT id, seats, user_id, created_at, updated_at FROM transaction_archive
+        """
+    )
+    op.drop_table("transaction_archive")
+    op.drop_index(op.f("ix_seat_hold_expires_at"), table_name="seat_hold")
+    op.drop_table("seat_hold")
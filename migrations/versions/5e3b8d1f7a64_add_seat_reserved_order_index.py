@@ -0,0 +1,37 @@
+"""add seat reserved order index
+
+Índice da ordem da fila de revisão, para a paginação por keyset começar na
+posição do cursor em vez de agregar todos os assentos reservados.
+
+Revision ID: 5e3b8d1f7a64
+Revises: 4d8f2b6a1c57
+Create Date: 2026-10-20 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e3b8d1f7a64"
+down_revision: Union[str, Sequence[str], None] = "4d8f2b6a1c57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_seat_reserved_order",
+        "seat",
+        ["updated_at", "user_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'reserved'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_seat_reserved_order", table_name="seat")
@@ -0,0 +1,39 @@
+"""add waiting room ticket last seen at
+
+Momento da última consulta de status de cada ticket, para admitir só quem
+ainda está esperando.
+
+Revision ID: 6a9c2e4f8b13
+Revises: 5e3b8d1f7a64
+Create Date: 2026-10-20 11:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6a9c2e4f8b13"
+down_revision: Union[str, Sequence[str], None] = "5e3b8d1f7a64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "waiting_room_ticket",
+        sa.Column(
+            "last_seen_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("waiting_room_ticket", "last_seen_at")
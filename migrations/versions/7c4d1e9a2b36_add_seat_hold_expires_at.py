@@ -0,0 +1,48 @@
+"""add seat hold expires at
+
+Grava o prazo da pré-reserva na própria linha do assento. Quando um UPDATE
+espera pelo lock de um assento, o Postgres reavalia o WHERE só sobre a nova
+versão da linha; com o prazo apenas em seat_hold, uma retenção renovada
+continuava parecendo vencida para quem estava esperando.
+
+Revision ID: 7c4d1e9a2b36
+Revises: 6a9c2e4f8b13
+Create Date: 2026-10-20 14:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4d1e9a2b36"
+down_revision: Union[str, Sequence[str], None] = "6a9c2e4f8b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "seat",
+        sa.Column("hold_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Pré-reservas em andamento herdam o prazo da retenção do dono
+    op.execute(
+        """
+        UPDATE seat s
+        SET hold_expires_at = h.expires_at
+        FROM seat_hold h
+        WHERE s.status = 'pre-reserved'
+          AND h.user_id = s.user_id
+          AND h.event_id = s.event_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("seat", "hold_expires_at")
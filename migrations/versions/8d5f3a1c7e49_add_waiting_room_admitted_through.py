@@ -0,0 +1,54 @@
+"""add waiting room admitted through
+
+Maior ID de ticket já admitido em cada evento. A consulta de status estima a
+posição na fila a partir dele, sem contar os tickets que esperam.
+
+Revision ID: 8d5f3a1c7e49
+Revises: 7c4d1e9a2b36
+Create Date: 2026-10-20 15:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d5f3a1c7e49"
+down_revision: Union[str, Sequence[str], None] = "7c4d1e9a2b36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "waiting_room_state",
+        sa.Column(
+            "admitted_through", sa.BigInteger(), server_default="0", nullable=False
+        ),
+    )
+    op.execute(
+        """
+        UPDATE waiting_room_state s
+        SET admitted_through = COALESCE(
+            (
+                SELECT max(t.id)
+                FROM waiting_room_ticket t
+                WHERE t.event_id = s.event_id AND t.admitted_at IS NOT NULL
+            ),
+            (
+                SELECT min(t.id) - 1
+                FROM waiting_room_ticket t
+                WHERE t.event_id = s.event_id
+            ),
+            0
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("waiting_room_state", "admitted_through")
@@ -0,0 +1,39 @@
+"""add seat reserved queue index
+
+Revision ID: 8e2f4a9c1b57
+Revises: 5b1e0c3a7d21
+Create Date: 2026-10-19 17:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2f4a9c1b57"
+down_revision: Union[str, Sequence[str], None] = "5b1e0c3a7d21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A fila de revisão ordena por updated_at, que precisa estar preenchido
+    op.execute(
+        "UPDATE seat SET updated_at = COALESCE(created_at, now()) "
+        "WHERE updated_at IS NULL"
+    )
+    op.create_index(
+        "ix_seat_reserved_queue",
+        "seat",
+        ["user_id", "updated_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'reserved'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_seat_reserved_queue", table_name="seat")
@@ -0,0 +1,37 @@
+"""add seat pre reserved hold index
+
+Índice das pré-reservas pelo prazo da retenção, para /admin/stats contar as
+retenções vencidas sem percorrer os assentos do evento.
+
+Revision ID: 9e6a4b2d8f51
+Revises: 8d5f3a1c7e49
+Create Date: 2026-10-20 16:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e6a4b2d8f51"
+down_revision: Union[str, Sequence[str], None] = "8d5f3a1c7e49"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_seat_pre_reserved_hold",
+        "seat",
+        ["event_id", "hold_expires_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pre-reserved'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_seat_pre_reserved_hold", table_name="seat")
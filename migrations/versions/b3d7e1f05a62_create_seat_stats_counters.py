@@ -0,0 +1,91 @@
+"""create seat stats counters
+
+Cria a tabela seat_stats e o trigger que a mantém atualizada a cada INSERT,
+UPDATE de status/is_half_price e DELETE na tabela seat. O shard usado em cada
+ajuste vem do PID da conexão, de modo que conexões concorrentes atualizam
+linhas diferentes e não serializam as reservas.
+
+Revision ID: b3d7e1f05a62
+Revises: 8e2f4a9c1b57
+Create Date: 2026-10-19 17:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d7e1f05a62"
+down_revision: Union[str, Sequence[str], None] = "8e2f4a9c1b57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "seat_stats",
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("is_half_price", sa.Boolean(), nullable=False),
+        sa.Column("shard", sa.SmallInteger(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("status", "is_half_price", "shard"),
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION seat_stats_apply() RETURNS trigger AS $$
+        DECLARE
+            slot smallint := pg_backend_pid() % 16;
+        BEGIN
+            IF TG_OP = 'UPDATE'
+               AND NEW.status = OLD.status
+               AND NEW.is_half_price = OLD.is_half_price THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                INSERT INTO seat_stats (status, is_half_price, shard, total)
+                VALUES (OLD.status, OLD.is_half_price, slot, -1)
+                ON CONFLICT (status, is_half_price, shard)
+                DO UPDATE SET total = seat_stats.total - 1;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO seat_stats (status, is_half_price, shard, total)
+                VALUES (NEW.status, NEW.is_half_price, slot, 1)
+                ON CONFLICT (status, is_half_price, shard)
+                DO UPDATE SET total = seat_stats.total + 1;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER seat_stats_apply
+        AFTER INSERT OR DELETE OR UPDATE OF status, is_half_price ON seat
+        FOR EACH ROW EXECUTE FUNCTION seat_stats_apply()
+        """
+    )
+
+    # Carga inicial a partir do estado atual
+    op.execute(
+        """
+        INSERT INTO seat_stats (status, is_half_price, shard, total)
+        SELECT status, is_half_price, 0, count(*)
+        FROM seat
+        GROUP BY status, is_half_price
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS seat_stats_apply ON seat")
+    op.execute("DROP FUNCTION IF EXISTS seat_stats_apply()")
+    op.drop_table("seat_stats")
@@ -0,0 +1,81 @@
+"""create transaction seat table
+
+Revision ID: c4a9f2d8e613
+Revises: b3d7e1f05a62
+Create Date: 2026-10-19 18:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9f2d8e613"
+down_revision: Union[str, Sequence[str], None] = "b3d7e1f05a62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "transaction_seat",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("transaction_id", sa.Integer(), nullable=False),
+        sa.Column("seat_code", sa.String(length=3), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["transaction_id"], ["transaction.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Backfill a partir dos arrays existentes, antes de criar os índices
+    op.execute(
+        """
+        INSERT INTO transaction_seat (transaction_id, seat_code, user_id, created_at)
+        SELECT t.id, s.seat_code, t.user_id, t.created_at
+        FROM transaction t
+        CROSS JOIN LATERAL unnest(t.seats) AS s(seat_code)
+        ORDER BY t.id
+        """
+    )
+
+    op.create_index(
+        op.f("ix_transaction_seat_transaction_id"),
+        "transaction_seat",
+        ["transaction_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transaction_seat_seat_code_created_at",
+        "transaction_seat",
+        ["seat_code", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transaction_seat_user_id_created_at",
+        "transaction_seat",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transaction_seat_user_id_created_at", table_name="transaction_seat")
+    op.drop_index(
+        "ix_transaction_seat_seat_code_created_at", table_name="transaction_seat"
+    )
+    op.drop_index(
+        op.f("ix_transaction_seat_transaction_id"), table_name="transaction_seat"
+    )
+    op.drop_table("transaction_seat")
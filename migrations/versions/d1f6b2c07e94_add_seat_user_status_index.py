@@ -0,0 +1,29 @@
+"""add seat user status index
+
+Revision ID: d1f6b2c07e94
+Revises: c4a9f2d8e613
+Create Date: 2026-10-19 18:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d1f6b2c07e94"
+down_revision: Union[str, Sequence[str], None] = "c4a9f2d8e613"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_seat_user_id_status", "seat", ["user_id", "status"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_seat_user_id_status", table_name="seat")
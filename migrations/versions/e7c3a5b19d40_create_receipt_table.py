@@ -0,0 +1,53 @@
+"""create receipt table
+
+Revision ID: e7c3a5b19d40
+Revises: d1f6b2c07e94
+Create Date: 2026-10-19 19:15:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7c3a5b19d40"
+down_revision: Union[str, Sequence[str], None] = "d1f6b2c07e94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "receipt",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("storage_key", sa.String(length=255), nullable=False),
+        sa.Column("content_type", sa.String(length=100), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("original_filename", sa.String(length=255), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("storage_key"),
+    )
+    op.create_index(op.f("ix_receipt_user_id"), "receipt", ["user_id"], unique=False)
+    op.add_column("transaction", sa.Column("receipt_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "transaction_receipt_id_fkey", "transaction", "receipt", ["receipt_id"], ["id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("transaction_receipt_id_fkey", "transaction", type_="foreignkey")
+    op.drop_column("transaction", "receipt_id")
+    op.drop_index(op.f("ix_receipt_user_id"), table_name="receipt")
+    op.drop_table("receipt")
@@ -0,0 +1,37 @@
+"""add receipt processing columns
+
+Revision ID: f2b8d4e6a913
+Revises: e7c3a5b19d40
+Create Date: 2026-10-19 19:50:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8d4e6a913"
+down_revision: Union[str, Sequence[str], None] = "e7c3a5b19d40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("receipt", sa.Column("original_size", sa.Integer(), nullable=True))
+    op.add_column(
+        "receipt", sa.Column("thumbnail_key", sa.String(length=255), nullable=True)
+    )
+    op.add_column(
+        "receipt",
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("receipt", "processed_at")
+    op.drop_column("receipt", "thumbnail_key")
+    op.drop_column("receipt", "original_size")
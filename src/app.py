@@ -4,8 +4,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from src.routers.admin import router as admin_router
 from src.routers.auth import router as auth_router
 from src.routers.email import router as email_router
+from src.routers.event import router as event_router
+from src.routers.metrics import router as metrics_router
 from src.routers.seat import router as seat_router
+from src.routers.waiting_room import router as waiting_room_router
 from src.settings import settings
+from src.utils.metrics import MetricsMiddleware
+from src.utils.profiling import ProfilingMiddleware
+from src.utils.query_stats import QueryStatsMiddleware
+from src.utils.traffic_capture import TrafficCaptureMiddleware
 
 app = FastAPI()
 
@@ -23,4 +30,13 @@ app.add_middleware(
 app.include_router(admin_router)
 app.include_router(auth_router)
 app.include_router(seat_router)
+app.include_router(event_router)
 app.include_router(email_router)
+app.include_router(metrics_router)
+app.include_router(waiting_room_router)
+
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TrafficCaptureMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+# Adicionado por último para ficar por fora do CORS e medir a requisição inteira
+app.add_middleware(MetricsMiddleware)
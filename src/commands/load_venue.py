@@ -0,0 +1,52 @@
+"""
+Carrega (ou recarrega) o estoque de assentos de um evento a partir de um
+layout de local em JSON. Pode ser executado várias vezes com o mesmo layout:
+assentos existentes mantêm status e dono.
+
+    python -m src.commands.load_venue venues/teatro.json --event-id 1
+    python -m src.commands.load_venue venues/arena.json --name "Show de estreia"
+"""
+
+import argparse
+import time
+
+from src.database import SessionLocal
+from src.utils.events import create_event, create_event_partition
+from src.utils.venue_layout import load_layout_seats, read_layout
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("layout", help="Arquivo JSON com o layout do local")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--event-id", type=int, help="Evento existente")
+    target.add_argument("--name", help="Cria um evento novo com este nome")
+    args = parser.parse_args()
+
+    layout = read_layout(args.layout)
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if args.name:
+            event_id = create_event(db, args.name, layout).id
+            db.commit()
+            print(
+                f"Evento {event_id} criado "
+                f"em {time.perf_counter() - started:.2f}s"
+            )
+            return
+
+        create_event_partition(db, args.event_id)
+        result = load_layout_seats(db, args.event_id, layout)
+        db.commit()
+        print(
+            f"Evento {args.event_id}: {result['seats']} assentos no layout, "
+            f"{result['inserted']} inseridos, {result['updated']} atualizados "
+            f"em {time.perf_counter() - started:.2f}s"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Apaga os baldes do rate limiter sem uso há mais de um dia.
+
+Baldes parados já estariam cheios, então apagá-los não muda nenhum limite;
+o comando só mantém a tabela enxuta. Pode ser agendado via cron:
+
+    python -m src.commands.prune_rate_limits
+"""
+
+import datetime
+
+from src.database import SessionLocal
+from src.utils.rate_limit import prune_rate_limit_buckets
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        removed = prune_rate_limit_buckets(db, datetime.timedelta(days=1))
+        db.commit()
+        print(f"Baldes removidos: {removed}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Recalcula os contadores do painel de vendas (tabela seat_stats) a partir da
+tabela seat. Use se houver suspeita de divergência ou após cargas manuais:
+
+    python -m src.commands.reconcile_seat_stats
+"""
+
+from src.database import SessionLocal
+from src.utils.seat_stats import reconcile_seat_stats
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        total = reconcile_seat_stats(db)
+        db.commit()
+        print(f"Contadores recalculados: {total} assentos")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Libera pré-reservas cujas retenções expiraram.
+
+As consultas já tratam retenções vencidas como disponíveis, então este comando
+serve apenas para manter as tabelas enxutas. Pode ser agendado via cron:
+
+    python -m src.commands.release_expired_holds
+"""
+
+from src.database import SessionLocal
+from src.utils.seat_reservation import release_expired_holds
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        released = release_expired_holds(db)
+        db.commit()
+        print(f"Assentos liberados: {len(released)}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
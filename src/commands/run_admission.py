@@ -0,0 +1,42 @@
+"""
+Move as salas de espera: roda uma rodada de admissão por evento a cada
+WAITING_ROOM_TICK_SECONDS.
+
+As consultas de /waiting-room/status só leem a posição; quem libera a fila é
+este processo, que deve rodar em uma única instância ao lado da aplicação
+(veja o Procfile):
+
+    python -m src.commands.run_admission
+
+Uma segunda instância por engano não admite ninguém em dobro: a rodada de cada
+evento trava o estado com SKIP LOCKED e respeita o intervalo.
+"""
+
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.database import SessionLocal
+from src.settings import settings
+from src.utils.waiting_room import queued_events, run_admission
+
+
+def main() -> None:
+    while True:
+        db = SessionLocal()
+        try:
+            for event_id in queued_events(db):
+                admitted = run_admission(db, event_id)
+                db.commit()
+                if admitted:
+                    print(f"Evento {event_id}: {admitted} admitidos")
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Erro na rodada de admissão: {e}")
+        finally:
+            db.close()
+        time.sleep(settings.WAITING_ROOM_TICK_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,15 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.settings import settings
+from src.utils.metrics import InstrumentedQueuePool, instrument_engine
+from src.utils.query_stats import instrument_engine_queries
+from src.utils.slow_queries import instrument_slow_queries
 
 # Create engine
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool)
+instrument_engine(engine)
+instrument_engine_queries(engine)
+instrument_slow_queries(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -2,9 +2,16 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.models.base import Base
+from src.models.event import Event
+from src.models.rate_limit_bucket import RateLimitBucket
+from src.models.receipt import Receipt
 from src.models.seat import Seat
+from src.models.seat_hold import SeatHold
+from src.models.seat_stats import SeatStats
 from src.models.transaction import Transaction
+from src.models.transaction_seat import TransactionSeat
 from src.models.user import User
+from src.models.waiting_room import WaitingRoomState, WaitingRoomTicket
 from src.settings import settings
 
 # Create engine using settings
@@ -13,4 +20,4 @@ engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 # Import all models to ensure they are registered with Base.metadata
-__all__ = ["Base", "User", "Seat", "Transaction"]
+__all__ = ["Base", "Event", "RateLimitBucket", "Receipt", "User", "Seat", "SeatHold", "SeatStats", "Transaction", "TransactionSeat", "WaitingRoomState", "WaitingRoomTicket"]
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from src.models.base import Base
+
+
+class Event(Base):
+    """Uma apresentação à venda, com seu próprio estoque de assentos."""
+
+    __tablename__ = "event"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+    starts_at = Column(DateTime(timezone=True), nullable=True)
+    status = Column(String(20), nullable=False, default="on_sale")
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
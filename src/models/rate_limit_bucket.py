@@ -0,0 +1,20 @@
+from sqlalchemy import Boolean, Column, DateTime, Float, String
+
+from src.models.base import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Balde de tokens do rate limiter, compartilhado entre os workers.
+
+    A chave combina a rota e o cliente ("login:ip:203.0.113.7"). Os tokens são
+    repostos a cada consulta com base no tempo desde updated_at; allowed guarda
+    se a última tentativa consumiu um token.
+    """
+
+    __tablename__ = "rate_limit_bucket"
+
+    key = Column(String(200), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    allowed = Column(Boolean, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)
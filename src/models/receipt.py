@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+
+from src.models.base import Base
+
+
+class Receipt(Base):
+    __tablename__ = "receipt"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("public.user.id"), nullable=False, index=True)
+    storage_key = Column(String(255), nullable=False, unique=True)
+    content_type = Column(String(100), nullable=False)
+    size = Column(Integer, nullable=False)
+    content_sha256 = Column(String(64), nullable=True, index=True)
+    perceptual_hash = Column(String(16), nullable=True, index=True)
+    original_size = Column(Integer, nullable=True)
+    thumbnail_key = Column(String(255), nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+    original_filename = Column(String(255), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -1,17 +1,68 @@
 import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    text,
+)
 
 from src.models.base import Base
 
 
 class Seat(Base):
+    """
+    Assento de um evento.
+
+    A tabela é particionada por LIST (event_id), com uma partição por evento
+    criada em create_event_partition. Toda consulta deve filtrar por event_id
+    para que o Postgres leia apenas a partição do evento.
+    """
+
     __tablename__ = "seat"
+    __table_args__ = (
+        UniqueConstraint("event_id", "code", name="uq_seat_event_id_code"),
+        # Assentos do usuário (/seats/user) e pré-reservas do usuário
+        Index("ix_seat_user_id_status", "user_id", "status"),
+        # Fila de revisão do admin: assentos reservados agrupados por usuário
+        Index(
+            "ix_seat_reserved_queue",
+            "user_id",
+            "updated_at",
+            postgresql_where=text("status = 'reserved'"),
+        ),
+        # Ordem da fila de revisão: posição do cursor em (updated_at, user_id)
+        Index(
+            "ix_seat_reserved_order",
+            "updated_at",
+            "user_id",
+            postgresql_where=text("status = 'reserved'"),
+        ),
+        # Pré-reservas por prazo: retenções vencidas em /admin/stats
+        Index(
+            "ix_seat_pre_reserved_hold",
+            "event_id",
+            "hold_expires_at",
+            postgresql_where=text("status = 'pre-reserved'"),
+        ),
+        {"postgresql_partition_by": "LIST (event_id)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    event_id = Column(Integer, ForeignKey("event.id"), primary_key=True)
     user_id = Column(Integer, ForeignKey("public.user.id"), nullable=True)
-    code = Column(String(3), unique=True, index=True, nullable=False)
+    code = Column(String(8), nullable=False)
+    section = Column(String(50), nullable=True)
+    price_zone = Column(String(20), nullable=True)
     status = Column(String(20), nullable=False, default="available")
     is_half_price = Column(Boolean, nullable=False, default=False)
+    # Prazo da pré-reserva, gravado na própria linha para que a nova checagem
+    # feita pelo Postgres depois de esperar pelo lock enxergue a renovação
+    hold_expires_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow)
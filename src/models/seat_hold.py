@@ -0,0 +1,19 @@
+from sqlalchemy import ARRAY, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+
+from src.models.base import Base
+
+
+class SeatHold(Base):
+    __tablename__ = "seat_hold"
+
+    user_id = Column(Integer, ForeignKey("public.user.id"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("event.id"), primary_key=True)
+    seats = Column(ARRAY(String(8)), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
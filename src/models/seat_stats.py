@@ -0,0 +1,21 @@
+from sqlalchemy import Boolean, Column, Integer, SmallInteger, String
+
+from src.models.base import Base
+
+
+class SeatStats(Base):
+    """
+    Contadores de assentos por status e tipo de ingresso.
+
+    Mantidos pelo trigger seat_stats_apply a cada mudança na tabela seat. Cada
+    contador é dividido em shards para que transações concorrentes não
+    disputem a mesma linha; a leitura soma os shards.
+    """
+
+    __tablename__ = "seat_stats"
+
+    event_id = Column(Integer, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    is_half_price = Column(Boolean, primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
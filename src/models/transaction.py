@@ -1,4 +1,4 @@
-from sqlalchemy import ARRAY, Column, DateTime, Integer, String
+from sqlalchemy import ARRAY, Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.sql import func
 
 from src.models.base import Base
@@ -8,8 +8,10 @@ class Transaction(Base):
     __tablename__ = "transaction"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    seats = Column(ARRAY(String(3)), nullable=False)
+    seats = Column(ARRAY(String(8)), nullable=False)
     user_id = Column(Integer, nullable=False)
+    event_id = Column(Integer, ForeignKey("event.id"), nullable=False)
+    receipt_id = Column(Integer, ForeignKey("receipt.id"), nullable=True)
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+
+from src.models.base import Base
+
+
+class TransactionSeat(Base):
+    """Um assento de uma transação; versão normalizada de Transaction.seats."""
+
+    __tablename__ = "transaction_seat"
+    __table_args__ = (
+        Index(
+            "ix_transaction_seat_event_id_seat_code_created_at",
+            "event_id",
+            "seat_code",
+            "created_at",
+        ),
+        Index("ix_transaction_seat_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    transaction_id = Column(
+        Integer, ForeignKey("transaction.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    event_id = Column(Integer, nullable=False)
+    seat_code = Column(String(8), nullable=False)
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
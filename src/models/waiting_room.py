@@ -0,0 +1,73 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.sql import func
+
+from src.models.base import Base
+
+
+class WaitingRoomTicket(Base):
+    """
+    Lugar de um usuário na sala de espera de um evento.
+
+    O ID crescente define a ordem da fila. admitted_at é preenchido quando o
+    usuário é liberado para as rotas de assentos, até expires_at. last_seen_at
+    é renovado a cada consulta de status: só quem ainda está consultando é
+    admitido.
+    """
+
+    __tablename__ = "waiting_room_ticket"
+    __table_args__ = (
+        UniqueConstraint(
+            "event_id", "user_id", name="uq_waiting_room_ticket_event_id_user_id"
+        ),
+        # Só os que ainda esperam: usado para a posição e para a próxima leva
+        Index(
+            "ix_waiting_room_ticket_waiting",
+            "event_id",
+            "id",
+            postgresql_where=text("admitted_at IS NULL"),
+        ),
+        Index("ix_waiting_room_ticket_event_id_expires_at", "event_id", "expires_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_id = Column(Integer, ForeignKey("event.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("public.user.id"), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    admitted_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+    last_seen_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+class WaitingRoomState(Base):
+    """
+    Controle de admissão de um evento.
+
+    max_active é o número de compradores liberados ao mesmo tempo; ele é
+    ajustado a cada rodada de admissão conforme a disputa por locks.
+    admitted_through é o maior ID de ticket já admitido, usado para estimar a
+    posição na fila sem contá-la.
+    """
+
+    __tablename__ = "waiting_room_state"
+
+    event_id = Column(Integer, ForeignKey("event.id"), primary_key=True)
+    max_active = Column(Integer, nullable=False)
+    last_tick_at = Column(DateTime(timezone=True), nullable=True)
+    admitted_through = Column(BigInteger, nullable=False, server_default="0")
@@ -1,18 +1,89 @@
-from fastapi import APIRouter, Depends, Header, HTTPException
+import datetime
+import os
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from src.database import get_db
+from src.models.receipt import Receipt
 from src.models.seat import Seat
+from src.models.transaction_seat import TransactionSeat
 from src.models.user import User
+from src.routers.requests.admin import BulkSeatReviewRequest, EventCreateRequest
+from src.settings import settings
 from src.utils.auth import get_current_user
-from src.utils.qr_code import validate_qr_code
+from src.utils.events import create_event, list_events
+from src.utils.pending_queue import get_pending_queue
+from src.utils.profiling import profile_path
+from src.utils.qr_code import LEGACY_EVENT_ID, validate_qr_code
+from src.utils.query_stats import query_budget
+from src.utils.receipt_links import verify_receipt_signature
+from src.utils.sales_export import EXPORT_COLUMNS, iter_csv, iter_export_rows
+from src.utils.seat_review import review_seats, transaction_seats
+from src.utils.seat_stats import get_seat_stats
+from src.utils.spreadsheet import iter_xlsx
+from src.utils.storage import get_receipt_storage
+from src.utils.venue_layout import layout_path, read_layout
 
 router = APIRouter(prefix="/admin")
 
 
+@router.get("/events")
+async def get_events(
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
+    try:
+        return list_events(db)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.post("/events")
+async def create_new_event(
+    request: EventCreateRequest,
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Cadastra um evento com todos os assentos do local disponíveis, a partir
+    do layout em VENUE_LAYOUTS_DIR.
+
+    Os assentos do evento ficam em uma partição própria da tabela seat.
+    """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
+    try:
+        layout = read_layout(layout_path(request.venue))
+        event = create_event(db, request.name, layout, request.starts_at)
+        event_id = event.id
+        db.commit()
+        return {"message": "Event created successfully.", "event_id": event_id}
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
 @router.get("/pending-seats")
+@query_budget(1)
 async def get_pending_seats(
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
 ):
@@ -25,7 +96,7 @@ async def get_pending_seats(
     reserved_seats = (
         db.query(User.full_name, Seat.code, Seat.is_half_price, Seat.status)
         .join(User, User.id == Seat.user_id)
-        .filter(Seat.status.in_(["reserved"]))
+        .filter(Seat.event_id == event_id, Seat.status.in_(["reserved"]))
         .all()
     )
 
@@ -44,9 +115,262 @@ async def get_pending_seats(
     return result
 
 
+@router.get("/pending-queue")
+@query_budget(5)
+async def get_pending_seats_queue(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Fila paginada de compras aguardando revisão, agrupada por usuário e
+    ordenada pelo momento da reserva.
+
+    Para buscar a próxima página, envie o "next_cursor" recebido como cursor.
+    """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
+    try:
+        return get_pending_queue(db, event_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.get("/stats")
+@query_budget(2)
+async def get_sales_stats(
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Resumo de vendas: assentos por status, ingressos vendidos por tipo e
+    receita confirmada e pendente.
+    """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
+    try:
+        return get_seat_stats(db, event_id)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.get("/export")
+async def export_sales(
+    format: Literal["csv", "xlsx"] = "csv",
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    status: str | None = None,
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
+    authorization: str = Header(...),
+):
+    """
+    Exporta todas as reservas (comprador, assento, tipo de ingresso e preço).
+
+    As linhas são lidas com cursor no servidor e enviadas em blocos, sem
+    carregar o resultado inteiro em memória.
+
+    Args:
+        format: "csv" ou "xlsx"
+        start: Data inicial da reserva (inclusiva)
+        end: Data final da reserva (inclusiva)
+        status: Filtra pelo status atual do assento (ou 'released')
+    """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
+    rows = iter_export_rows(event_id, start=start, end=end, status=status)
+    filename = (
+        f"reservas-evento-{event_id}-{datetime.date.today().isoformat()}.{format}"
+    )
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if format == "xlsx":
+        return StreamingResponse(
+            iter_xlsx(EXPORT_COLUMNS, rows, sheet_name="Reservas"),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers=headers,
+        )
+    return StreamingResponse(
+        iter_csv(rows), media_type="text/csv; charset=utf-8", headers=headers
+    )
+
+
+@router.get("/seats/{seat_code}/history")
+@query_budget(2)
+async def get_seat_history(
+    seat_code: str,
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Histórico de reservas de um assento: quem reservou e quando, da mais
+    recente para a mais antiga, junto com o estado atual do assento.
+    """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
+    try:
+        seat = (
+            db.query(Seat.code, Seat.status, Seat.user_id, Seat.is_half_price)
+            .filter(Seat.event_id == event_id, Seat.code == seat_code)
+            .first()
+        )
+        if not seat:
+            raise HTTPException(status_code=404, detail=f"Seat not found: {seat_code}")
+
+        history = (
+            db.query(
+                TransactionSeat.transaction_id,
+                TransactionSeat.created_at,
+                TransactionSeat.user_id,
+                User.full_name,
+                User.email,
+            )
+            .outerjoin(User, User.id == TransactionSeat.user_id)
+            .filter(
+                TransactionSeat.event_id == event_id,
+                TransactionSeat.seat_code == seat_code,
+            )
+            .order_by(TransactionSeat.created_at.desc(), TransactionSeat.id.desc())
+            .all()
+        )
+
+        return {
+            "seat_code": seat.code,
+            "status": seat.status,
+            "user_id": seat.user_id,
+            "is_half_price": bool(seat.is_half_price),
+            "history": [
+                {
+                    "transaction_id": entry.transaction_id,
+                    "reserved_at": entry.created_at.isoformat(),
+                    "user_id": entry.user_id,
+                    "user_name": entry.full_name,
+                    "email": entry.email,
+                    "is_current_owner": entry.user_id == seat.user_id,
+                }
+                for entry in history
+            ],
+        }
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.get("/receipts/{receipt_id}")
+async def get_receipt(
+    receipt_id: int,
+    signature: str | None = Query(None),
+    db: Session = Depends(get_db),
+    authorization: str | None = Header(None),
+):
+    """
+    Entrega o arquivo de um comprovante de pagamento.
+
+    Aceita o token de admin ou a assinatura dos links enviados por email.
+    """
+    if signature is not None:
+        try:
+            verify_receipt_signature(receipt_id, signature)
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+    else:
+        user = get_current_user(authorization)
+        if "admin" not in user.get("scopes", ""):
+            raise HTTPException(
+                status_code=403, detail="User does not have admin privileges."
+            )
+
+    receipt = db.query(Receipt).filter(Receipt.id == receipt_id).first()
+    if not receipt:
+        raise HTTPException(status_code=404, detail="Receipt not found.")
+
+    return get_receipt_storage().response(
+        receipt.storage_key, receipt.content_type, receipt.original_filename
+    )
+
+
+@router.get("/receipts/{receipt_id}/thumbnail")
+async def get_receipt_thumbnail(
+    receipt_id: int,
+    signature: str | None = Query(None),
+    db: Session = Depends(get_db),
+    authorization: str | None = Header(None),
+):
+    """
+    Entrega a miniatura de um comprovante, quando já foi gerada.
+
+    Aceita o token de admin ou a assinatura do link da fila de revisão.
+    """
+    if signature is not None:
+        try:
+            verify_receipt_signature(receipt_id, signature)
+        except ValueError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+    else:
+        user = get_current_user(authorization)
+        if "admin" not in user.get("scopes", ""):
+            raise HTTPException(
+                status_code=403, detail="User does not have admin privileges."
+            )
+
+    receipt = db.query(Receipt).filter(Receipt.id == receipt_id).first()
+    if not receipt or not receipt.thumbnail_key:
+        raise HTTPException(status_code=404, detail="Thumbnail not found.")
+
+    return get_receipt_storage().response(receipt.thumbnail_key, "image/jpeg")
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, authorization: str = Header(...)):
+    """
+    Entrega o perfil gerado por uma requisição enviada com X-Profile: 1.
+
+    O ID vem no header X-Profile-Id da resposta; o arquivo abre em
+    https://www.speedscope.app.
+    """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
+    try:
+        path = profile_path(profile_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found.")
+
+    return FileResponse(
+        path, media_type="application/json", filename=os.path.basename(path)
+    )
+
+
 @router.post("/approve-seat")
+@query_budget(2)
 async def approve_seat(
     seat_code: str,
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
 ):
@@ -59,9 +383,21 @@ async def approve_seat(
         )
 
     try:
-        seat = db.query(Seat).filter(Seat.code == seat_code).with_for_update().first()
+        seat = (
+            db.query(Seat)
+            .filter(Seat.event_id == event_id, Seat.code == seat_code)
+            .with_for_update()
+            .first()
+        )
         if not seat:
             raise HTTPException(status_code=404, detail="Seat not found.")
+        # Outro admin pode ter reprovado o assento enquanto este esperava o lock
+        if seat.status != "reserved":
+            db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail=f"Seat is not reserved (current status: {seat.status}).",
+            )
 
         seat.status = "occupied"
         db.commit()
@@ -72,8 +408,10 @@ async def approve_seat(
 
 
 @router.post("/reprove-seat")
+@query_budget(2)
 async def reprove_seat(
     seat_code: str,
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
 ):
@@ -86,7 +424,12 @@ async def reprove_seat(
         )
 
     try:
-        seat = db.query(Seat).filter(Seat.code == seat_code).with_for_update().first()
+        seat = (
+            db.query(Seat)
+            .filter(Seat.event_id == event_id, Seat.code == seat_code)
+            .with_for_update()
+            .first()
+        )
         if not seat:
             raise HTTPException(status_code=404, detail="Seat not found.")
 
@@ -99,10 +442,88 @@ async def reprove_seat(
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
+def _bulk_review(
+    request: BulkSeatReviewRequest, action: str, event_id: int, db: Session
+) -> dict:
+    selectors = [
+        request.user_id is not None,
+        request.transaction_id is not None,
+        request.seat_codes is not None,
+    ]
+    if sum(selectors) != 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide exactly one of user_id, transaction_id or seat_codes.",
+        )
+
+    try:
+        seat_codes, user_id = request.seat_codes, request.user_id
+        if request.transaction_id is not None:
+            transaction = transaction_seats(db, event_id, request.transaction_id)
+            if transaction is None:
+                raise HTTPException(status_code=404, detail="Transaction not found.")
+            # Só os assentos que ainda são do comprador: um assento reprovado
+            # e comprado por outra pessoa não pertence mais a esta transação
+            seat_codes, user_id = transaction
+
+        outcomes = review_seats(
+            db, event_id, action, user_id=user_id, seat_codes=seat_codes
+        )
+        db.commit()
+        return {"seats": outcomes}
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.post("/approve-seats")
+@query_budget(3)
+async def approve_seats(
+    request: BulkSeatReviewRequest,
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Aprova em lote os assentos reservados de um usuário, de uma transação ou de
+    uma lista de códigos, retornando o resultado de cada assento.
+    """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
+    return _bulk_review(request, "approve", event_id, db)
+
+
+@router.post("/reprove-seats")
+@query_budget(3)
+async def reprove_seats(
+    request: BulkSeatReviewRequest,
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Reprova em lote os assentos reservados de um usuário, de uma transação ou
+    de uma lista de códigos, devolvendo-os ao estoque.
+    """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
+    return _bulk_review(request, "reprove", event_id, db)
+
+
 @router.post("/validate-qr-code")
+@query_budget(2)
 async def validate_qr_code_entry(
     hash_value: str,
     seat_code: str,
+    event_id: int = Query(LEGACY_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
 ):
@@ -115,6 +536,8 @@ async def validate_qr_code_entry(
     Args:
         hash_value: Hash contido no QR code
         seat_code: Código do assento
+        event_id: ID do evento (parâmetro event_id da URL do QR code; URLs
+            sem ele são do evento 1)
         db: Sessão do banco de dados
         authorization: Header de autorização
 
@@ -131,10 +554,17 @@ async def validate_qr_code_entry(
         )
 
     try:
-        # Verifica se o assento existe
-        seat = db.query(Seat).filter(Seat.code == seat_code).with_for_update().first()
-        if not seat:
+        # Carrega o assento e o comprador em uma única consulta
+        row = (
+            db.query(Seat, User.full_name, User.email)
+            .outerjoin(User, User.id == Seat.user_id)
+            .filter(Seat.event_id == event_id, Seat.code == seat_code)
+            .with_for_update(of=Seat)
+            .first()
+        )
+        if not row:
             raise HTTPException(status_code=404, detail=f"Seat not found: {seat_code}")
+        seat, user_name, user_email = row
 
         if not seat.user_id:
             raise HTTPException(
@@ -158,15 +588,15 @@ async def validate_qr_code_entry(
                 status="occupied",
                 user_id=seat.user_id,
                 db=db,
+                event_id=event_id,
+                seat=seat,
             )
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-        # Busca informações do usuário
         user_info = None
-        db_user = db.query(User).filter(User.id == seat.user_id).first()
-        if db_user:
-            user_info = {"name": db_user.full_name, "email": db_user.email}
+        if user_name is not None:
+            user_info = {"name": user_name, "email": user_email}
 
         return {
             "message": "QR code validated successfully.",
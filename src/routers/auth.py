@@ -13,11 +13,17 @@ from src.utils.email import EmailSender
 from src.utils.hash import check_password_hash, hash_password
 from src.utils.jwt import create_access_token, decode_access_token
 from src.utils.password_reset import PasswordResetService
+from src.utils.rate_limit import rate_limit
 
 router = APIRouter()
 
+# Rajada e tokens por minuto por IP; bcrypt e SMTP são os recursos caros
+login_limit = rate_limit("login", per_ip=(10, 10))
+register_limit = rate_limit("register", per_ip=(5, 5))
+password_reset_limit = rate_limit("password-reset", per_ip=(3, 3))
 
-@router.post("/login")
+
+@router.post("/login", dependencies=[Depends(login_limit)])
 async def login(
     request: LoginRequest,
     db: Session = Depends(get_db),
@@ -31,7 +37,7 @@ async def login(
     return AuthResponse(access_token=access_token)
 
 
-@router.post("/register")
+@router.post("/register", dependencies=[Depends(register_limit)])
 async def register(
     request: RegisterRequest, db: Session = Depends(get_db)
 ) -> AuthResponse:
@@ -72,7 +78,7 @@ async def get_me(authorization: str = Header(...)):
         raise HTTPException(status_code=401, detail="Token inválido")
 
 
-@router.post("/forgot-password")
+@router.post("/forgot-password", dependencies=[Depends(password_reset_limit)])
 async def forgot_password(
     request: ForgotPasswordRequest,
     db: Session = Depends(get_db),
@@ -178,7 +184,7 @@ Equipe CIA UFSCar
     }
 
 
-@router.post("/reset-password")
+@router.post("/reset-password", dependencies=[Depends(password_reset_limit)])
 async def reset_password(
     request: ResetPasswordRequest,
     db: Session = Depends(get_db),
@@ -1,20 +1,31 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 
 from src.settings import settings
+from src.utils.auth import get_current_user
 from src.utils.email import send_email
 from src.utils.email_debug import send_test_email_with_config, test_smtp_connection
+from src.utils.rate_limit import rate_limit
 
 router = APIRouter(prefix="/email", tags=["email"])
 
+# Rotas de diagnóstico abrem conexões SMTP: poucas por minuto bastam
+email_debug_limit = rate_limit("email-debug", per_ip=(5, 5), per_user=(5, 5))
 
-@router.post("/send-hello")
-async def send_hello_world():
+
+@router.post("/send-hello", dependencies=[Depends(email_debug_limit)])
+async def send_hello_world(authorization: str = Header(...)):
     """
     Envia um email com 'Hello World' para o destinatário padrão.
 
     Returns:
         dict: Mensagem de sucesso ou erro
     """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
     try:
         subject = "Hello World"
         body = "Hello World"
@@ -32,14 +43,20 @@ async def send_hello_world():
         )
 
 
-@router.get("/test-connection")
-async def test_email_connection():
+@router.get("/test-connection", dependencies=[Depends(email_debug_limit)])
+async def test_email_connection(authorization: str = Header(...)):
     """
     Testa a conexão SMTP para diagnosticar problemas de autenticação.
 
     Returns:
         dict: Resultado dos testes de conexão
     """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
     try:
         working_config = test_smtp_connection()
 
@@ -65,14 +82,20 @@ async def test_email_connection():
         raise HTTPException(status_code=500, detail=f"Erro ao testar conexão: {str(e)}")
 
 
-@router.post("/send-test")
-async def send_test_email():
+@router.post("/send-test", dependencies=[Depends(email_debug_limit)])
+async def send_test_email(authorization: str = Header(...)):
     """
     Envia um email de teste para verificar se tudo está funcionando.
 
     Returns:
         dict: Resultado do envio do email de teste
     """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
     try:
         # Primeiro testa a conexão
         working_config = test_smtp_connection()
@@ -103,14 +126,20 @@ async def send_test_email():
         )
 
 
-@router.post("/test-credentials")
-async def test_credentials():
+@router.post("/test-credentials", dependencies=[Depends(email_debug_limit)])
+async def test_credentials(authorization: str = Header(...)):
     """
     Testa as credenciais atuais sem enviar email.
 
     Returns:
         dict: Resultado do teste de credenciais
     """
+    user = get_current_user(authorization)
+    if "admin" not in user.get("scopes", ""):
+        raise HTTPException(
+            status_code=403, detail="User does not have admin privileges."
+        )
+
     import smtplib
 
     try:
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.database import get_db
+from src.utils.auth import get_current_user
+from src.utils.events import list_events
+
+router = APIRouter(prefix="/events")
+
+
+@router.get("/")
+async def get_events(
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Lista os eventos. O ID retornado é o event_id usado nas rotas de assentos.
+    """
+    _ = get_current_user(authorization)
+
+    try:
+        return list_events(db)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
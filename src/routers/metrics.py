@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Header, HTTPException, Response
+
+from src.settings import settings
+from src.utils.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(authorization: str | None = Header(None)):
+    """
+    Métricas no formato do Prometheus, somadas entre os workers do gunicorn.
+
+    Se METRICS_TOKEN estiver definido, exige "Authorization: Bearer <token>".
+    """
+    if settings.METRICS_TOKEN and authorization != f"Bearer {settings.METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token.")
+
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -0,0 +1,15 @@
+import datetime
+
+from pydantic import BaseModel
+
+
+class BulkSeatReviewRequest(BaseModel):
+    user_id: int | None = None
+    transaction_id: int | None = None
+    seat_codes: list[str] | None = None
+
+
+class EventCreateRequest(BaseModel):
+    name: str
+    starts_at: datetime.datetime | None = None
+    venue: str = "teatro"
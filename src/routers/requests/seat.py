@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SeatPreReserveRequest(BaseModel):
@@ -8,3 +8,8 @@ class SeatPreReserveRequest(BaseModel):
 class SeatReserveRequest(BaseModel):
     seat_code: str
     is_half_price: bool
+
+
+class SeatBestAvailableRequest(BaseModel):
+    count: int = Field(ge=1, le=10)
+    row: str | None = None
@@ -1,14 +1,31 @@
+import datetime
 import json
-
-from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, UploadFile
+import logging
+import time
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, case
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from src.database import get_db
+from src.models.receipt import Receipt
 from src.models.seat import Seat
 from src.models.transaction import Transaction
+from src.models.transaction_seat import TransactionSeat
 from src.models.user import User
 from src.routers.requests.seat import (
+    SeatBestAvailableRequest,
     SeatPreReserveRequest,
     SeatReserveRequest,
 )
@@ -16,18 +33,80 @@ from src.routers.responses.seat import SeatResponse
 from src.settings import settings
 from src.utils.auth import get_current_user
 from src.utils.email import EmailSender
+from src.utils.metrics import SEAT_LOCK_HOLD
 from src.utils.qr_code import generate_seat_qr_code
+from src.utils.query_stats import query_budget
+from src.utils.rate_limit import rate_limit
+from src.utils.receipt_images import submit_receipt_processing
+from src.utils.receipt_links import receipt_url
+from src.utils.seat_reservation import (
+    find_missing_seats,
+    hold_expired,
+    pre_reserve,
+    pre_reserve_best_available,
+    upsert_hold,
+)
+from src.utils.storage import ReceiptRejected, ReceiptTooLarge, get_receipt_storage
+from src.utils.waiting_room import check_admission, finish_admission
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/seats")
 
+# Pré-reservas travam linhas de assento; o limite por IP é mais folgado para
+# não barrar várias pessoas atrás da mesma rede
+hold_limit = rate_limit("seat-hold", per_ip=(100, 300), per_user=(20, 60))
+
+
+def require_admission(
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
+    authorization: str = Header(...),
+    x_queue_ticket: str | None = Header(None),
+    db: Session = Depends(get_db),
+) -> dict | None:
+    """
+    Com WAITING_ROOM_ENABLED, só deixa passar quem foi admitido pela sala de
+    espera do evento (cabeçalho X-Queue-Ticket).
+
+    Returns:
+        Conteúdo do ticket, ou None com a sala de espera desligada
+    """
+    if not settings.WAITING_ROOM_ENABLED:
+        return None
+    user = get_current_user(authorization)
+    try:
+        payload = check_admission(db, x_queue_ticket, user["id"], event_id)
+        # Confirma já a renovação do prazo: a rota pode desfazer a própria
+        # transação ao perder um assento
+        db.commit()
+        return payload
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=403, detail=str(e))
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
 
 @router.get("/", response_model=list[SeatResponse])
+@query_budget(1)
 async def get_seats(
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
 ):
     _ = get_current_user(authorization)
-    seats = db.query(Seat).all()
+
+    # Pré-reservas com retenção vencida aparecem como disponíveis
+    status = case(
+        (and_(Seat.status == "pre-reserved", hold_expired()), "available"),
+        else_=Seat.status,
+    )
+    seats = (
+        db.query(Seat.code, status.label("status"))
+        .filter(Seat.event_id == event_id)
+        .all()
+    )
     return [
         SeatResponse(
             code=seat.code,
@@ -39,12 +118,18 @@ async def get_seats(
 
 
 @router.get("/user", response_model=list[SeatResponse])
+@query_budget(1)
 async def get_user_seats(
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
 ):
     user = get_current_user(authorization)
-    seats = db.query(Seat).filter(Seat.user_id == user["id"]).all()
+    seats = (
+        db.query(Seat)
+        .filter(Seat.event_id == event_id, Seat.user_id == user["id"])
+        .all()
+    )
 
     # Busca o nome do comprador para usar nos QR codes
     buyer_name = user.get("full_name", "")
@@ -58,6 +143,7 @@ async def get_user_seats(
                 status=seat.status,
                 is_half_price=seat.is_half_price,
                 buyer_name=buyer_name,
+                event_id=seat.event_id,
             )
             if seat.status == "occupied"
             else None,
@@ -67,7 +153,9 @@ async def get_user_seats(
 
 
 @router.get("/user/pre-reserved", response_model=list[SeatResponse])
+@query_budget(1)
 async def get_user_pre_reserved_seats(
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
 ):
@@ -77,7 +165,11 @@ async def get_user_pre_reserved_seats(
     user = get_current_user(authorization)
     pre_reserved_seats = (
         db.query(Seat)
-        .filter(Seat.user_id == user["id"], Seat.status == "pre-reserved")
+        .filter(
+            Seat.event_id == event_id,
+            Seat.user_id == user["id"],
+            Seat.status == "pre-reserved",
+        )
         .all()
     )
     return [
@@ -91,11 +183,14 @@ async def get_user_pre_reserved_seats(
 
 
 @router.post("/reserve")
+@query_budget(10)
 async def reserve_seats(
     request: str = Form(...),
     file: UploadFile = File(...),
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
+    admission: dict | None = Depends(require_admission),
 ):
     user = get_current_user(authorization)
 
@@ -133,8 +228,28 @@ async def reserve_seats(
     }
     seat_codes = list(seat_map.keys())
 
+    # 1. Valida e grava o comprovante antes de qualquer lock de assento
+    storage = get_receipt_storage()
     try:
-        seats = db.query(Seat).filter(Seat.code.in_(seat_codes)).with_for_update().all()
+        stored = await run_in_threadpool(
+            storage.save, file.file, settings.RECEIPT_MAX_BYTES
+        )
+    except ReceiptTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ReceiptRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 2. Transição curta: trava os assentos, valida, grava e confirma
+    lock_started = None
+    try:
+        seats = (
+            db.query(Seat)
+            .filter(Seat.event_id == event_id, Seat.code.in_(seat_codes))
+            .with_for_update()
+            .all()
+        )
+        # Mede só o tempo com os locks obtidos, sem a espera por eles
+        lock_started = time.perf_counter()
 
         if len(seats) != len(seat_codes):
             found_codes = {seat.code for seat in seats}
@@ -159,70 +274,104 @@ async def reserve_seats(
                 detail=f"User does not own these pre-reserved seats: {', '.join(not_owned)}",
             )
 
+        reserved_at = datetime.datetime.utcnow()
         for seat in seats:
             seat.status = "reserved"
             seat.user_id = user["id"]
             seat.is_half_price = seat_map[seat.code]
+            seat.hold_expires_at = None
+            seat.updated_at = reserved_at
 
+        receipt = Receipt(
+            user_id=user["id"],
+            storage_key=stored["key"],
+            content_type=stored["content_type"],
+            size=stored["size"],
+            content_sha256=stored["sha256"],
+            original_filename=file.filename,
+        )
+        db.add(receipt)
+        db.flush()
         transaction = Transaction(
             seats=seat_codes,
             user_id=user["id"],
+            event_id=event_id,
+            receipt_id=receipt.id,
         )
         db.add(transaction)
-        db.commit()
-
-        # Calcula o valor total (assumindo preços fixos)
-        full_price = 50.0  # Preço cheio
-        half_price = 25.0  # Meia entrada
-
-        total_value = 0.0
-        for seat in seats:
-            if seat.is_half_price:
-                total_value += half_price
-            else:
-                total_value += full_price
-
-        # Valida o arquivo
-        if not file.filename:
-            raise HTTPException(status_code=400, detail="Arquivo é obrigatório")
-
-        # Valida o tipo de arquivo
-        allowed_extensions = {".pdf", ".jpg", ".jpeg", ".png", ".gif"}
-        file_extension = "." + file.filename.split(".")[-1].lower()
-        if file_extension not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail="Tipo de arquivo não suportado. Use PDF ou imagens (JPG, PNG, GIF)",
+        db.flush()
+        db.add_all(
+            TransactionSeat(
+                transaction_id=transaction.id,
+                event_id=event_id,
+                seat_code=code,
+                user_id=user["id"],
             )
+            for code in seat_codes
+        )
+        receipt_id = receipt.id
+        db.commit()
+    except HTTPException:
+        db.rollback()
+        storage.delete(stored["key"])
+        raise
+    except SQLAlchemyError as e:
+        db.rollback()
+        storage.delete(stored["key"])
+        raise HTTPException(
+            status_code=500, detail=f"Database error during reservation: {str(e)}"
+        )
+    finally:
+        if lock_started is not None:
+            SEAT_LOCK_HOLD.observe(time.perf_counter() - lock_started)
+
+    # Compra feita: a vaga na sala de espera volta para a fila
+    if admission is not None:
+        try:
+            finish_admission(db, admission["tid"])
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            logger.exception("Falha ao encerrar a admissão %s", admission["tid"])
+
+    # Recompressão e miniatura em segundo plano
+    submit_receipt_processing(receipt_id)
+
+    # 3. Notificação por email, fora da transação (usa seat_map para não
+    # recarregar os assentos expirados pelo commit)
+    full_price = settings.TICKET_FULL_PRICE  # Preço cheio
+    half_price = settings.TICKET_HALF_PRICE  # Meia entrada
+    total_value = sum(
+        half_price if is_half_price else full_price
+        for is_half_price in seat_map.values()
+    )
+    receipt_link = receipt_url(receipt_id)
 
-        # Lê o conteúdo do arquivo
-        file_content = await file.read()
-
-        # Envia email com comprovante
-        email_sender = EmailSender()
-        subject = f"Comprovantes {user['full_name']} - R$ {total_value:.2f}"
+    email_sender = EmailSender()
+    subject = f"Comprovantes {user['full_name']} - R$ {total_value:.2f}"
 
-        # Conta ingressos por tipo
-        full_price_count = sum(1 for seat in seats if not seat.is_half_price)
-        half_price_count = sum(1 for seat in seats if seat.is_half_price)
+    # Conta ingressos por tipo
+    half_price_count = sum(1 for is_half_price in seat_map.values() if is_half_price)
+    full_price_count = len(seat_map) - half_price_count
 
-        # Lista detalhada dos ingressos
-        seat_details = []
-        for seat in seats:
-            seat_type = "Meia entrada" if seat.is_half_price else "Inteira"
-            seat_price = half_price if seat.is_half_price else full_price
-            seat_details.append(f"  - {seat.code}: {seat_type} (R$ {seat_price:.2f})")
+    # Lista detalhada dos ingressos
+    seat_details = []
+    for code, is_half_price in seat_map.items():
+        seat_type = "Meia entrada" if is_half_price else "Inteira"
+        seat_price = half_price if is_half_price else full_price
+        seat_details.append(f"  - {code}: {seat_type} (R$ {seat_price:.2f})")
 
-        # Corpo do email melhorado
-        body = f"""
+    # Corpo do email melhorado
+    body = f"""
 Nova reserva de ingressos recebida!
 
 DADOS DO COMPRADOR:
 - Nome: {user["full_name"]}
 - Email: {user["email"]}
-- Data da reserva: {transaction.created_at.strftime("%d/%m/%Y às %H:%M")}
+- Data da reserva: {reserved_at.strftime("%d/%m/%Y às %H:%M")}
 
 DETALHES DA RESERVA:
+- Evento: #{event_id}
 - Total de ingressos: {len(seat_codes)}
   * Inteira: {full_price_count} ingressos
   * Meia entrada: {half_price_count} ingressos
@@ -232,46 +381,35 @@ LISTA DE INGRESSOS:
 
 VALOR TOTAL: R$ {total_value:.2f}
 
-COMPROVANTE: Em anexo ({file.filename})
+COMPROVANTE: {receipt_link}
 
 ---
 Este email foi enviado automaticamente pelo sistema de reservas.
-        """.strip()
-
-        # Log para debug
-        print(f"📧 Enviando email para: {settings.SMTP_SENDER_EMAIL}")
-        print(f"📧 Assunto: {subject}")
-        print(f"📧 Arquivo: {file.filename}")
-
-        # Envia o email com anexo
-        email_sent = email_sender.send_email_with_attachment(
-            subject=subject,
-            body=body,
-            recipient=settings.SMTP_SENDER_EMAIL,  # Email para si mesmo
-            attachment_content=file_content,
-            attachment_filename=file.filename,
-            attachment_type=file.content_type or "application/octet-stream",
-        )
-
-        if email_sent:
-            print("✅ Email enviado com sucesso!")
-        else:
-            print("❌ Falha ao enviar email!")
-            raise HTTPException(
-                status_code=500, detail="Erro ao enviar email com comprovante"
-            )
+    """.strip()
+
+    # Os assentos e o comprovante já estão gravados; uma falha no email só é
+    # registrada, pois o pedido aparece na fila de revisão do admin
+    email_sent = email_sender.send_email(
+        subject=subject,
+        body=body,
+        recipient=settings.SMTP_SENDER_EMAIL,  # Email para si mesmo
+    )
+    if not email_sent:
+        logger.error("Falha ao enviar email do comprovante %s", receipt_id)
+        return {
+            "message": "Seats reserved successfully. The receipt is awaiting review."
+        }
 
-        return {"message": "Seats reserved successfully and receipt sent via email."}
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=500, detail=f"Database error during reservation: {str(e)}"
-        )
+    return {"message": "Seats reserved successfully and receipt sent via email."}
 
 
-@router.post("/pre-reserve")
+@router.post(
+    "/pre-reserve", dependencies=[Depends(hold_limit), Depends(require_admission)]
+)
+@query_budget(5)
 async def pre_reserve_seats(
     request: list[SeatPreReserveRequest],
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
 ):
@@ -279,68 +417,69 @@ async def pre_reserve_seats(
     seat_codes = [seat_req.seat_code for seat_req in request]
 
     try:
-        seats = db.query(Seat).filter(Seat.code.in_(seat_codes)).with_for_update().all()
+        # Libera as pré-reservas antigas e reivindica as novas em lote
+        result = pre_reserve(db, event_id, user["id"], seat_codes)
 
-        if len(seats) != len(seat_codes):
-            found_codes = {seat.code for seat in seats}
-            not_found = [code for code in seat_codes if code not in found_codes]
-            raise HTTPException(
-                status_code=404, detail=f"Seat(s) not found: {', '.join(not_found)}"
-            )
-
-        # Verifica assentos indisponíveis, mas permite que o usuário interaja com seus próprios assentos pre-reserved
-        unavailable = []
-        for seat in seats:
-            if seat.status == "available":
-                continue  # Assento disponível, pode ser pré-reservado
-            elif seat.status == "pre-reserved" and seat.user_id == user["id"]:
-                continue  # Assento pré-reservado pelo próprio usuário, pode interagir novamente
-            elif seat.status == "reserved":
-                unavailable.append(
-                    seat.code
-                )  # Assento já reservado, não pode ser alterado
-            elif seat.status == "occupied":
-                unavailable.append(seat.code)  # Assento ocupado, não pode ser alterado
-            elif seat.status == "pre-reserved" and seat.user_id != user["id"]:
-                unavailable.append(seat.code)  # Assento pré-reservado por outro usuário
-
-        if unavailable:
+        if result["lost"]:
+            not_found = find_missing_seats(db, event_id, result["lost"])
+            db.rollback()
+            if not_found:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Seat(s) not found: {', '.join(not_found)}",
+                )
             raise HTTPException(
                 status_code=400,
-                detail=f"Seats not available or reserved by other users: {', '.join(unavailable)}",
+                detail=f"Seats not available or reserved by other users: {', '.join(result['lost'])}",
             )
 
-        # Limpa todas as pré-reservas antigas do usuário que não estão na nova lista
-        old_pre_reserved_seats = (
-            db.query(Seat)
-            .filter(
-                Seat.status == "pre-reserved",
-                Seat.user_id == user["id"],
-                ~Seat.code.in_(seat_codes),
-            )
-            .with_for_update()
-            .all()
+        upsert_hold(db, event_id, user["id"], result["won"])
+        db.commit()
+        return {
+            "message": "Seats pre-reserved successfully.",
+            "won": result["won"],
+            "released": result["released"],
+        }
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500, detail=f"Database error during pre-reservation: {str(e)}"
         )
 
-        for old_seat in old_pre_reserved_seats:
-            old_seat.status = "available"
-            old_seat.user_id = None
-            old_seat.is_half_price = (
-                False  # Limpa também a configuração de meia-entrada
-            )
 
-        # Aplica as novas pré-reservas
-        for seat in seats:
-            seat.status = "pre-reserved"
-            seat.user_id = user["id"]
+@router.post(
+    "/best-available", dependencies=[Depends(hold_limit), Depends(require_admission)]
+)
+@query_budget(25)
+async def pre_reserve_best_available_seats(
+    request: SeatBestAvailableRequest,
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Pré-reserva automaticamente o melhor bloco de assentos lado a lado.
 
-        transaction = Transaction(
-            seats=seat_codes,
-            user_id=user["id"],
+    A seleção substitui as pré-reservas atuais do usuário, assim como em
+    /seats/pre-reserve.
+    """
+    user = get_current_user(authorization)
+    preferred_row = request.row.upper() if request.row else None
+
+    try:
+        seat_codes = pre_reserve_best_available(
+            db, event_id, user["id"], request.count, preferred_row
         )
-        db.add(transaction)
+        if not seat_codes:
+            db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail=f"No block of {request.count} adjacent seats available.",
+            )
+
+        upsert_hold(db, event_id, user["id"], seat_codes)
         db.commit()
-        return {"message": "Seats pre-reserved successfully."}
+        return {"message": "Seats pre-reserved successfully.", "seats": seat_codes}
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(
@@ -349,23 +488,25 @@ async def pre_reserve_seats(
 
 
 @router.get("/info/{seat_code}")
+@query_budget(1)
 async def get_seat_info(
     seat_code: str,
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
     db: Session = Depends(get_db),
     authorization: str = Header(...),
 ):
     _ = get_current_user(authorization)
 
     try:
-        seat = db.query(Seat).filter(Seat.code == seat_code).first()
-        if not seat:
+        row = (
+            db.query(Seat, User.full_name)
+            .outerjoin(User, User.id == Seat.user_id)
+            .filter(Seat.event_id == event_id, Seat.code == seat_code)
+            .first()
+        )
+        if not row:
             raise HTTPException(status_code=404, detail=f"Seat not found: {seat_code}")
-
-        user_name = None
-        if seat.user_id:
-            db_user = db.query(User).filter(User.id == seat.user_id).first()
-            if db_user:
-                user_name = db_user.full_name
+        seat, user_name = row
 
         return {
             "is_half_price": bool(seat.is_half_price),
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.database import get_db
+from src.models.event import Event
+from src.settings import settings
+from src.utils.auth import get_current_user
+from src.utils.waiting_room import join_queue, queue_status, read_ticket
+
+router = APIRouter(prefix="/waiting-room")
+
+
+@router.post("/join")
+async def join_waiting_room(
+    event_id: int = Query(settings.DEFAULT_EVENT_ID),
+    db: Session = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Entra na fila do evento. O ticket devolvido vai no cabeçalho
+    X-Queue-Ticket de /waiting-room/status e das rotas de assentos.
+    """
+    user = get_current_user(authorization)
+
+    try:
+        if db.get(Event, event_id) is None:
+            raise HTTPException(status_code=404, detail="Event not found.")
+        ticket = join_queue(db, event_id, user["id"])
+        status = queue_status(db, read_ticket(ticket))
+        db.commit()
+        return {"ticket": ticket, **status}
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+
+@router.get("/status")
+async def get_waiting_room_status(
+    db: Session = Depends(get_db),
+    x_queue_ticket: str | None = Header(None),
+):
+    """
+    Situação do ticket na fila. Não exige token de acesso: só o ticket
+    assinado, para que as consultas frequentes fiquem baratas. A fila anda
+    pelo comando src.commands.run_admission, não por estas consultas.
+    """
+    try:
+        payload = read_ticket(x_queue_ticket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        status = queue_status(db, payload)
+        db.commit()
+        return status
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
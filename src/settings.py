@@ -32,6 +32,7 @@ class Settings:
     SMTP_RECIPIENT_EMAIL: Optional[str] = os.getenv("SMTP_RECIPIENT_EMAIL")
     SMTP_SERVER: str = os.getenv("SMTP_SERVER", "smtp.gmail.com")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
 
     # =============================================================================
     # CONFIGURAÇÕES DE OAUTH2 GOOGLE
@@ -61,11 +62,124 @@ class Settings:
     # =============================================================================
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
+    # URL pública desta API, usada em links enviados por email
+    BACKEND_URL: str = os.getenv("BACKEND_URL", "http://localhost:8000")
+
     # =============================================================================
     # CONFIGURAÇÕES DE QR CODE
     # =============================================================================
     QR_CODE_DOMAIN: str = os.getenv("QR_CODE_DOMAIN", "https://seu-dominio.com")
 
+    # =============================================================================
+    # CONFIGURAÇÕES DE MÉTRICAS
+    # =============================================================================
+    # Token exigido em /metrics (vazio = sem autenticação)
+    METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN")
+    # Avisa quando o mesmo comando SQL roda esta quantidade de vezes em uma
+    # requisição (possível N+1)
+    QUERY_REPEAT_WARNING: int = int(os.getenv("QUERY_REPEAT_WARNING", "5"))
+    # Responde 500 quando uma rota passa do seu orçamento de consultas (testes)
+    QUERY_BUDGET_ENFORCE: bool = (
+        os.getenv("QUERY_BUDGET_ENFORCE", "false").lower() == "true"
+    )
+    # Registra consultas mais lentas que isso, em ms (vazio = desligado)
+    SLOW_QUERY_MS: Optional[int] = (
+        int(os.getenv("SLOW_QUERY_MS")) if os.getenv("SLOW_QUERY_MS") else None
+    )
+    # Captura o plano (EXPLAIN) das consultas lentas em segundo plano
+    SLOW_QUERY_EXPLAIN: bool = (
+        os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    )
+    # Intervalo mínimo, em segundos, entre dois EXPLAIN do mesmo comando
+    SLOW_QUERY_EXPLAIN_INTERVAL: int = int(
+        os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "300")
+    )
+    # Permite que admins perfilem uma requisição com o header X-Profile: 1
+    PROFILING_ENABLED: bool = (
+        os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    )
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "storage/profiles")
+    # Intervalo entre amostras do profiler, em ms
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+    # Grava o tráfego anonimizado neste arquivo JSONL (vazio = desligado)
+    TRAFFIC_CAPTURE_PATH: Optional[str] = os.getenv("TRAFFIC_CAPTURE_PATH")
+
+    # =============================================================================
+    # CONFIGURAÇÕES DE RATE LIMIT
+    # =============================================================================
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    # "postgres" (compartilhado entre workers) ou "memory" (só o processo atual)
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "postgres")
+    # Proxies cujo X-Forwarded-For é aceito como IP do cliente: IPs ou redes
+    # separados por vírgula, ou "*" quando todo acesso passa por um roteador
+    # de IP desconhecido (vale a entrada que ele acrescentou, a mais à direita)
+    TRUSTED_PROXIES: str = os.getenv("TRUSTED_PROXIES", "")
+
+    # =============================================================================
+    # CONFIGURAÇÕES DE SALA DE ESPERA
+    # =============================================================================
+    # Só usuários admitidos pela fila podem pré-reservar e reservar assentos
+    WAITING_ROOM_ENABLED: bool = (
+        os.getenv("WAITING_ROOM_ENABLED", "false").lower() == "true"
+    )
+    # Limites de compradores ativos ao mesmo tempo, por evento
+    WAITING_ROOM_MIN_ACTIVE: int = int(os.getenv("WAITING_ROOM_MIN_ACTIVE", "20"))
+    WAITING_ROOM_MAX_ACTIVE: int = int(os.getenv("WAITING_ROOM_MAX_ACTIVE", "200"))
+    # Tempo que um usuário admitido tem para comprar
+    WAITING_ROOM_SESSION_MINUTES: int = int(
+        os.getenv("WAITING_ROOM_SESSION_MINUTES", "10")
+    )
+    # Intervalo mínimo entre rodadas de admissão
+    WAITING_ROOM_TICK_SECONDS: float = float(
+        os.getenv("WAITING_ROOM_TICK_SECONDS", "1")
+    )
+    # Sessões esperando por lock acima das quais a admissão desacelera
+    WAITING_ROOM_MAX_LOCK_WAITERS: int = int(
+        os.getenv("WAITING_ROOM_MAX_LOCK_WAITERS", "5")
+    )
+    # Intervalo sugerido ao cliente entre consultas de /waiting-room/status
+    WAITING_ROOM_POLL_SECONDS: int = int(os.getenv("WAITING_ROOM_POLL_SECONDS", "3"))
+    # Tickets sem consulta de status há mais que isso não são admitidos
+    WAITING_ROOM_IDLE_SECONDS: int = int(os.getenv("WAITING_ROOM_IDLE_SECONDS", "15"))
+    # Prazo para o admitido usar uma rota de assentos antes de perder a vaga
+    WAITING_ROOM_GRACE_SECONDS: int = int(os.getenv("WAITING_ROOM_GRACE_SECONDS", "60"))
+
+    # =============================================================================
+    # CONFIGURAÇÕES DE EVENTOS
+    # =============================================================================
+    # Evento usado quando a requisição não informa event_id
+    DEFAULT_EVENT_ID: int = int(os.getenv("DEFAULT_EVENT_ID", "1"))
+    # Diretório com os layouts de locais (um arquivo JSON por local)
+    VENUE_LAYOUTS_DIR: str = os.getenv("VENUE_LAYOUTS_DIR", "venues")
+
+    # =============================================================================
+    # CONFIGURAÇÕES DE PRÉ-RESERVA
+    # =============================================================================
+    SEAT_HOLD_TTL_MINUTES: int = int(os.getenv("SEAT_HOLD_TTL_MINUTES", "15"))
+
+    # =============================================================================
+    # CONFIGURAÇÕES DE PREÇOS
+    # =============================================================================
+    TICKET_FULL_PRICE: float = float(os.getenv("TICKET_FULL_PRICE", "50.0"))
+    TICKET_HALF_PRICE: float = float(os.getenv("TICKET_HALF_PRICE", "25.0"))
+
+    # =============================================================================
+    # CONFIGURAÇÕES DE COMPROVANTES
+    # =============================================================================
+    RECEIPT_STORAGE_BACKEND: str = os.getenv("RECEIPT_STORAGE_BACKEND", "local")
+    RECEIPT_STORAGE_DIR: str = os.getenv("RECEIPT_STORAGE_DIR", "storage/receipts")
+    RECEIPT_MAX_BYTES: int = int(os.getenv("RECEIPT_MAX_BYTES", str(10 * 1024 * 1024)))
+    RECEIPT_IMAGE_MAX_DIMENSION: int = int(
+        os.getenv("RECEIPT_IMAGE_MAX_DIMENSION", "1600")
+    )
+    RECEIPT_IMAGE_QUALITY: int = int(os.getenv("RECEIPT_IMAGE_QUALITY", "80"))
+    RECEIPT_THUMBNAIL_SIZE: int = int(os.getenv("RECEIPT_THUMBNAIL_SIZE", "320"))
+    RECEIPT_PROCESSING_WORKERS: int = int(
+        os.getenv("RECEIPT_PROCESSING_WORKERS", "2")
+    )
+    # Validade dos links assinados de comprovante enviados por email
+    RECEIPT_LINK_TTL_HOURS: int = int(os.getenv("RECEIPT_LINK_TTL_HOURS", "48"))
+
     # =============================================================================
     # MÉTODOS DE VALIDAÇÃO
     # =============================================================================
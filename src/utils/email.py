@@ -1,3 +1,4 @@
+import functools
 import logging
 import smtplib
 from email.mime.multipart import MIMEMultipart
@@ -5,12 +6,27 @@ from email.mime.text import MIMEText
 from typing import Optional
 
 from src.settings import settings
+from src.utils.metrics import SMTP_SEND_FAILURES, SMTP_SEND_LATENCY, observe
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _measured(send):
+    """Registra a duração de cada envio e conta as falhas."""
+
+    @functools.wraps(send)
+    def wrapper(*args, **kwargs) -> bool:
+        with observe(SMTP_SEND_LATENCY):
+            sent = send(*args, **kwargs)
+        if not sent:
+            SMTP_SEND_FAILURES.inc()
+        return sent
+
+    return wrapper
+
+
 class EmailSender:
     def __init__(self):
         # Configurações carregadas das variáveis de ambiente
@@ -19,7 +35,20 @@ class EmailSender:
         self.sender_email = settings.SMTP_SENDER_EMAIL
         self.sender_password = settings.SMTP_SENDER_PASSWORD
         self.recipient_email = settings.SMTP_RECIPIENT_EMAIL
+        self.use_starttls = settings.SMTP_STARTTLS
 
+    def _connect(self) -> smtplib.SMTP:
+        """
+        Abre a conexão SMTP. Com SMTP_STARTTLS=false (servidores locais de
+        teste, como o de benchmarks/smtp_sink.py) não há TLS nem login.
+        """
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        if self.use_starttls:
+            server.starttls()  # Habilita criptografia TLS
+            server.login(self.sender_email, self.sender_password)
+        return server
+
+    @_measured
     def send_email(
         self,
         subject: str,
@@ -59,11 +88,7 @@ class EmailSender:
                 msg.attach(html_part)
 
             # Conecta ao servidor SMTP do Gmail
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()  # Habilita criptografia TLS
-
-            # Faz login
-            server.login(self.sender_email, self.sender_password)
+            server = self._connect()
 
             # Envia o email
             server.send_message(msg)
@@ -158,6 +183,7 @@ class EmailSender:
 
         return self.send_email(subject, body, html_body)
 
+    @_measured
     def send_email_with_attachment(
         self,
         subject: str,
@@ -209,11 +235,7 @@ class EmailSender:
                 msg.attach(attachment)
 
             # Conecta ao servidor SMTP
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()  # Habilita criptografia TLS
-
-            # Faz login
-            server.login(self.sender_email, self.sender_password)
+            server = self._connect()
 
             # Envia o email
             server.send_message(msg)
@@ -0,0 +1,66 @@
+import datetime
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from src.models.event import Event
+from src.utils.venue_layout import load_layout_seats
+
+
+def create_event_partition(db: Session, event_id: int) -> None:
+    """
+    Cria a partição da tabela seat que guarda os assentos do evento.
+
+    Consultas filtradas por event_id leem apenas esta partição, então o custo
+    de um evento não cresce com o número de eventos anteriores.
+    """
+    event_id = int(event_id)
+    db.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS seat_event_{event_id} "
+            f"PARTITION OF seat FOR VALUES IN ({event_id})"
+        )
+    )
+
+
+def create_event(
+    db: Session,
+    name: str,
+    layout: dict,
+    starts_at: datetime.datetime | None = None,
+) -> Event:
+    """
+    Cadastra um evento, cria sua partição e gera os assentos a partir do
+    layout do local, todos disponíveis. A transação não é confirmada aqui.
+
+    Returns:
+        O evento criado
+
+    Raises:
+        ValueError: Se o layout for inválido
+    """
+    event = Event(name=name, starts_at=starts_at, status="on_sale")
+    db.add(event)
+    db.flush()
+
+    create_event_partition(db, event.id)
+    load_layout_seats(db, event.id, layout)
+    return event
+
+
+def list_events(db: Session) -> list[dict]:
+    """Lista os eventos do mais recente para o mais antigo."""
+    events = db.execute(
+        select(Event.id, Event.name, Event.starts_at, Event.status).order_by(
+            Event.starts_at.desc().nulls_last(), Event.id.desc()
+        )
+    ).all()
+    return [
+        {
+            "id": event.id,
+            "name": event.name,
+            "starts_at": event.starts_at.isoformat() if event.starts_at else None,
+            "status": event.status,
+        }
+        for event in events
+    ]
@@ -1,10 +1,16 @@
 import bcrypt
 
+from src.utils.metrics import BCRYPT_LATENCY, observe
+
 
 def hash_password(password: str) -> str:
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    with observe(BCRYPT_LATENCY, operation="hash"):
+        hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
     return hashed.decode("utf-8")
 
 
 def check_password_hash(password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    with observe(BCRYPT_LATENCY, operation="check"):
+        return bcrypt.checkpw(
+            password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
@@ -0,0 +1,166 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# Faixas pensadas para requisições web: de 5 ms a 10 s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Consultas e espera por conexão costumam ficar abaixo de 1 ms
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP, pela rota (template) e status",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Tempo esperando uma conexão livre no pool do banco",
+    buckets=FAST_BUCKETS,
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Duração das consultas ao banco, pelo tipo de comando",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+SEAT_LOCK_HOLD = Histogram(
+    "seat_lock_hold_seconds",
+    "Tempo com os assentos travados em /seats/reserve",
+    buckets=LATENCY_BUCKETS,
+)
+SMTP_SEND_LATENCY = Histogram(
+    "smtp_send_duration_seconds",
+    "Duração do envio de emails",
+    buckets=LATENCY_BUCKETS,
+)
+SMTP_SEND_FAILURES = Counter(
+    "smtp_send_failures_total",
+    "Emails que falharam ao ser enviados",
+)
+QR_RENDER_LATENCY = Histogram(
+    "qr_render_duration_seconds",
+    "Tempo para gerar a imagem PNG de um QR code",
+    buckets=FAST_BUCKETS,
+)
+BCRYPT_LATENCY = Histogram(
+    "bcrypt_duration_seconds",
+    "Tempo de hash e verificação de senhas com bcrypt",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def observe(histogram, **labels):
+    """Mede o bloco e registra a duração no histograma."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        target = histogram.labels(**labels) if labels else histogram
+        target.observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mede quanto tempo cada checkout esperou por uma conexão."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra a duração de cada comando executado pelo engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _observe(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        DB_QUERY_LATENCY.labels(operation=operation or "OTHER").observe(
+            time.perf_counter() - started
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(context):
+        if context.connection is None:
+            return
+        timers = context.connection.info.get("query_started")
+        if timers:
+            timers.pop()
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição até o fim do corpo da resposta.
+
+    O rótulo da rota é o template (/seats/info/{seat_code}), não o caminho
+    real, para manter a cardinalidade baixa. Caminhos sem rota viram
+    "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            ).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Gera a saída no formato de texto do Prometheus.
+
+    Com PROMETHEUS_MULTIPROC_DIR definido (gunicorn com vários workers), soma
+    os valores gravados por todos os processos; sem ele, usa só o processo
+    atual.
+
+    Returns:
+        Tupla (conteúdo, content type)
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,25 @@
+import base64
+import json
+
+
+def encode_cursor(values: dict) -> str:
+    """Codifica a posição da última linha retornada em um token opaco."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict:
+    """
+    Decodifica um token gerado por encode_cursor.
+
+    Raises:
+        ValueError: Se o token estiver malformado
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Cursor inválido")
+    if not isinstance(values, dict):
+        raise ValueError("Cursor inválido")
+    return values
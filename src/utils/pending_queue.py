@@ -0,0 +1,220 @@
+import datetime
+
+from sqlalchemy import exists, select, tuple_
+from sqlalchemy.orm import Session, aliased
+
+from src.models.receipt import Receipt
+from src.models.seat import Seat
+from src.models.transaction import Transaction
+from src.models.transaction_seat import TransactionSeat
+from src.models.user import User
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.receipt_links import receipt_url
+
+
+def _flag_duplicate_receipts(db: Session, receipts: list[dict]) -> None:
+    """
+    Marca os comprovantes cujo conteúdo (SHA-256) também aparece em outro
+    comprovante, de qualquer usuário.
+
+    Preenche "duplicate_of" com os IDs dos outros comprovantes de mesmo
+    conteúdo, que definem "is_duplicate", e "similar_to" com os de mesmo hash
+    perceptual. Capturas de tela do mesmo app de banco ficam quase iguais na
+    resolução do hash (valor, nome e data somem), então a semelhança é só um
+    indício para o admin conferir, nunca uma duplicata. Remove os hashes do
+    dicionário, que não precisam ir para a resposta.
+    """
+    content_hashes = {r["content_sha256"] for r in receipts if r["content_sha256"]}
+    image_hashes = {r["perceptual_hash"] for r in receipts if r["perceptual_hash"]}
+
+    matches = []
+    if content_hashes or image_hashes:
+        matches = db.execute(
+            select(Receipt.id, Receipt.content_sha256, Receipt.perceptual_hash).where(
+                Receipt.content_sha256.in_(content_hashes)
+                | Receipt.perceptual_hash.in_(image_hashes)
+            )
+        ).all()
+
+    for receipt in receipts:
+        content_hash = receipt.pop("content_sha256")
+        image_hash = receipt.pop("perceptual_hash")
+        others = [match for match in matches if match.id != receipt["receipt_id"]]
+        receipt["duplicate_of"] = sorted(
+            match.id
+            for match in others
+            if content_hash and match.content_sha256 == content_hash
+        )
+        receipt["similar_to"] = sorted(
+            match.id
+            for match in others
+            if image_hash
+            and match.perceptual_hash == image_hash
+            and match.id not in receipt["duplicate_of"]
+        )
+        receipt["is_duplicate"] = bool(receipt["duplicate_of"])
+
+
+def queue_page_query(
+    event_id: int, limit: int, after: tuple[datetime.datetime, int] | None = None
+):
+    """
+    Consulta de uma página da fila: (reserved_at, user_id) de cada usuário com
+    assentos reservados, a partir da posição `after`.
+
+    Em vez de agrupar todos os assentos reservados e filtrar o resultado, lê
+    o índice ix_seat_reserved_order já na posição do cursor e fica só com o
+    assento mais antigo de cada usuário (conferido em ix_seat_reserved_queue).
+    O custo da página não depende do tamanho da fila.
+    """
+    earlier = aliased(Seat)
+    query = (
+        select(Seat.updated_at.label("reserved_at"), Seat.user_id)
+        .distinct()
+        .where(
+            Seat.event_id == event_id,
+            Seat.status == "reserved",
+            Seat.user_id.is_not(None),
+            ~exists().where(
+                earlier.event_id == Seat.event_id,
+                earlier.user_id == Seat.user_id,
+                earlier.status == "reserved",
+                earlier.updated_at < Seat.updated_at,
+            ),
+        )
+    )
+    if after is not None:
+        query = query.where(tuple_(Seat.updated_at, Seat.user_id) > after)
+    return query.order_by(Seat.updated_at, Seat.user_id).limit(limit)
+
+
+def get_pending_queue(
+    db: Session, event_id: int, limit: int, cursor: str | None = None
+) -> dict:
+    """
+    Retorna uma página da fila de revisão de comprovantes de um evento.
+
+    Os assentos reservados são agrupados por usuário e ordenados pelo momento
+    da reserva (o assento mais antigo do grupo). A paginação é por keyset em
+    (reserved_at, user_id); veja queue_page_query.
+
+    Args:
+        db: Sessão do banco de dados
+        event_id: ID do evento
+        limit: Quantidade máxima de usuários na página
+        cursor: Token retornado em "next_cursor" pela página anterior
+
+    Returns:
+        Dicionário com os grupos da página ("items") e o próximo cursor
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    after = None
+    if cursor:
+        position = decode_cursor(cursor)
+        try:
+            after = (
+                datetime.datetime.fromisoformat(position["reserved_at"]),
+                int(position["user_id"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Cursor inválido")
+    page = db.execute(queue_page_query(event_id, limit + 1, after)).all()
+
+    has_more = len(page) > limit
+    page = page[:limit]
+    user_ids = [row.user_id for row in page]
+    if not user_ids:
+        return {"items": [], "next_cursor": None}
+
+    users = {
+        row.id: row
+        for row in db.execute(
+            select(User.id, User.full_name, User.email).where(User.id.in_(user_ids))
+        )
+    }
+    seats: dict[int, list[dict]] = {user_id: [] for user_id in user_ids}
+    for row in db.execute(
+        select(Seat.user_id, Seat.code, Seat.is_half_price, Seat.status)
+        .where(
+            Seat.event_id == event_id,
+            Seat.status == "reserved",
+            Seat.user_id.in_(user_ids),
+        )
+        .order_by(Seat.code)
+    ):
+        seats[row.user_id].append(
+            {
+                "code": row.code,
+                "is_half_price": row.is_half_price,
+                "status": row.status,
+            }
+        )
+
+    # Comprovantes das transações cujos assentos seguem reservados
+    receipts: dict[int, list[dict]] = {user_id: [] for user_id in user_ids}
+    for row in db.execute(
+        select(
+            Transaction.user_id,
+            Transaction.id.label("transaction_id"),
+            Receipt.id.label("receipt_id"),
+            Receipt.thumbnail_key,
+            Receipt.content_sha256,
+            Receipt.perceptual_hash,
+        )
+        .join(Receipt, Receipt.id == Transaction.receipt_id)
+        .where(
+            Transaction.event_id == event_id,
+            Transaction.user_id.in_(user_ids),
+            Transaction.id.in_(
+                select(TransactionSeat.transaction_id)
+                .join(
+                    Seat,
+                    (Seat.event_id == TransactionSeat.event_id)
+                    & (Seat.code == TransactionSeat.seat_code)
+                    & (Seat.user_id == TransactionSeat.user_id),
+                )
+                .where(
+                    TransactionSeat.event_id == event_id,
+                    Seat.event_id == event_id,
+                    TransactionSeat.user_id.in_(user_ids),
+                    Seat.status == "reserved",
+                )
+            ),
+        )
+        .order_by(Transaction.id)
+    ):
+        receipts[row.user_id].append(
+            {
+                "transaction_id": row.transaction_id,
+                "receipt_id": row.receipt_id,
+                "url": receipt_url(row.receipt_id),
+                "thumbnail_url": receipt_url(row.receipt_id, thumbnail=True)
+                if row.thumbnail_key
+                else None,
+                "content_sha256": row.content_sha256,
+                "perceptual_hash": row.perceptual_hash,
+            }
+        )
+    _flag_duplicate_receipts(db, [r for group in receipts.values() for r in group])
+
+    items = [
+        {
+            "user_id": row.user_id,
+            "user_name": users[row.user_id].full_name if row.user_id in users else None,
+            "email": users[row.user_id].email if row.user_id in users else None,
+            "reserved_at": row.reserved_at.isoformat() if row.reserved_at else None,
+            "seats": seats[row.user_id],
+            "receipts": receipts[row.user_id],
+        }
+        for row in page
+    ]
+
+    next_cursor = None
+    if has_more:
+        last = page[-1]
+        next_cursor = encode_cursor(
+            {"reserved_at": last.reserved_at.isoformat(), "user_id": last.user_id}
+        )
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,112 @@
+import logging
+import os
+import re
+import uuid
+
+from fastapi import HTTPException
+from pyinstrument import Profiler
+from pyinstrument.renderers import SpeedscopeRenderer
+from starlette.concurrency import run_in_threadpool
+
+from src.settings import settings
+from src.utils.auth import get_current_user
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# Só um perfil por processo de cada vez, para limitar o custo da amostragem
+_profiling = False
+
+
+def profile_path(profile_id: str) -> str:
+    """
+    Caminho do arquivo speedscope de um perfil.
+
+    Raises:
+        ValueError: Se o ID não tiver o formato gerado pelo middleware
+    """
+    if not _PROFILE_ID.match(profile_id):
+        raise ValueError(f"Invalid profile id: {profile_id}")
+    return os.path.join(settings.PROFILE_DIR, f"{profile_id}.speedscope.json")
+
+
+def _is_admin(headers: dict) -> bool:
+    authorization = headers.get(b"authorization")
+    if not authorization:
+        return False
+    try:
+        user = get_current_user(authorization.decode("latin-1"))
+    except HTTPException:
+        return False
+    return "admin" in user.get("scopes", "")
+
+
+def _save(profile_id: str, content: str) -> None:
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    with open(profile_path(profile_id), "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que gera um perfil por amostragem de uma única requisição.
+
+    Só atua quando a requisição traz o header X-Profile: 1 e um token de
+    admin. A resposta ganha o header X-Profile-Id; o arquivo no formato do
+    speedscope (https://www.speedscope.app) fica disponível em
+    /admin/profiles/{id}. O trabalho feito em threads (run_in_threadpool)
+    aparece como espera no perfil.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _profiling
+
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER) != b"1" or not _is_admin(headers):
+            await self.app(scope, receive, send)
+            return
+        if _profiling:
+            logger.warning(
+                "Perfil ignorado em %s: outro já em andamento", scope["path"]
+            )
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER, profile_id.encode())
+                ]
+            await send(message)
+
+        _profiling = True
+        profiler = Profiler(
+            interval=settings.PROFILE_INTERVAL_MS / 1000, async_mode="enabled"
+        )
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.stop()
+            _profiling = False
+            content = profiler.output(renderer=SpeedscopeRenderer())
+            await run_in_threadpool(_save, profile_id, content)
+            logger.info(
+                "Perfil %s gravado para %s %s",
+                profile_id,
+                scope["method"],
+                scope["path"],
+            )
@@ -7,6 +7,34 @@ from urllib.parse import urlencode
 import qrcode
 
 from src.settings import settings
+from src.utils.metrics import QR_RENDER_LATENCY, observe
+
+
+# Evento dos ingressos emitidos antes do suporte a vários eventos. É fixo, e não
+# DEFAULT_EVENT_ID: trocar o evento padrão não pode invalidar QR codes já emitidos
+LEGACY_EVENT_ID = 1
+
+
+def _is_legacy_event(event_id: int | None) -> bool:
+    return event_id is None or event_id == LEGACY_EVENT_ID
+
+
+def seat_qr_hash(
+    seat_code: str,
+    status: str,
+    is_half_price: bool,
+    event_id: int | None,
+    secret_key: str,
+) -> str:
+    """
+    Calcula o hash do QR code. Ingressos do evento 1 mantêm o formato
+    anterior ao suporte a vários eventos, para que QR codes já emitidos
+    continuem válidos; nos demais eventos o ID do evento entra no hash.
+    """
+    payload = f"{seat_code}{status}{is_half_price}{secret_key}"
+    if not _is_legacy_event(event_id):
+        payload = f"{event_id}:{payload}"
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
 
 
 def generate_seat_qr_code(
@@ -14,6 +42,7 @@ def generate_seat_qr_code(
     status: str,
     is_half_price: bool = False,
     buyer_name: str = "",
+    event_id: int | None = None,
     secret_key: str = "cia-seat-system",
 ) -> str:
     """
@@ -22,44 +51,49 @@ def generate_seat_qr_code(
     Novo formato da URL:
     https://seu-dominio.com/qrcode/{HASH}?seat_code={CODIGO}
 
+    Fora do evento 1 (LEGACY_EVENT_ID) a URL também leva o parâmetro event_id.
+
     Args:
         seat_code: Código do assento (ex: "A1", "B5")
         status: Status do assento (ex: "available", "reserved", "occupied")
         is_half_price: Se o assento é meia entrada
         buyer_name: Nome do comprador do assento
+        event_id: ID do evento do assento
         secret_key: Chave secreta para gerar o hash único
 
     Returns:
         Base64 string do QR code PNG
     """
     # Gera um hash único usando o código do assento, status, tipo de ingresso e a chave secreta
-    unique_hash = hashlib.sha256(
-        f"{seat_code}{status}{is_half_price}{secret_key}".encode()
-    ).hexdigest()[:16]
+    unique_hash = seat_qr_hash(seat_code, status, is_half_price, event_id, secret_key)
 
     # Monta os parâmetros mínimos da URL
-    query_string = urlencode({"seat_code": seat_code})
+    params = {"seat_code": seat_code}
+    if not _is_legacy_event(event_id):
+        params["event_id"] = event_id
+    query_string = urlencode(params)
 
     # Constrói a URL completa (hash no path e seat_code como query param)
     qr_url = f"{settings.QR_CODE_DOMAIN}/qrcode/{unique_hash}?{query_string}"
 
-    # Gera o QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(qr_url)
-    qr.make(fit=True)
-
-    # Cria a imagem do QR code
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    # Converte para bytes
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format="PNG")
-    img_buffer.seek(0)
+    with observe(QR_RENDER_LATENCY):
+        # Gera o QR code
+        qr = qrcode.QRCode(
+            version=1,
+            error_correction=qrcode.constants.ERROR_CORRECT_L,
+            box_size=10,
+            border=4,
+        )
+        qr.add_data(qr_url)
+        qr.make(fit=True)
+
+        # Cria a imagem do QR code
+        img = qr.make_image(fill_color="black", back_color="white")
+
+        # Converte para bytes
+        img_buffer = io.BytesIO()
+        img.save(img_buffer, format="PNG")
+        img_buffer.seek(0)
 
     # Retorna como base64
     return base64.b64encode(img_buffer.read()).decode("utf-8")
@@ -72,7 +106,9 @@ def validate_qr_code(
     status: str,
     user_id: int,
     db,
+    event_id: int | None = None,
     secret_key: str = "cia-seat-system",
+    seat=None,
 ) -> dict:
     """
     Valida um QR code verificando o hash e atualiza o status do assento para "used" se válido.
@@ -84,7 +120,11 @@ def validate_qr_code(
         status: Status do ingresso (deve ser "occupied")
         user_id: ID do usuário que comprou o ingresso
         db: Sessão do banco de dados (SQLAlchemy Session)
+        event_id: ID do evento do assento (padrão: LEGACY_EVENT_ID, o das
+            URLs sem event_id)
         secret_key: Chave secreta usada para gerar o hash
+        seat: Assento já carregado com FOR UPDATE pelo chamador, para evitar
+            uma segunda consulta
 
     Returns:
         Dicionário com informações do assento validado
@@ -102,16 +142,24 @@ def validate_qr_code(
             )
 
         # Recalcula o hash esperado incluindo is_half_price
-        expected_hash = hashlib.sha256(
-            f"{seat_code}{status}{is_half_price}{secret_key}".encode()
-        ).hexdigest()[:16]
+        expected_hash = seat_qr_hash(
+            seat_code, status, is_half_price, event_id, secret_key
+        )
 
         # Verifica se o hash corresponde
         if hash != expected_hash:
             raise ValueError("Invalid QR code - hash verification failed.")
 
         # Busca o assento no banco de dados
-        seat = db.query(Seat).filter(Seat.code == seat_code).with_for_update().first()
+        if event_id is None:
+            event_id = LEGACY_EVENT_ID
+        if seat is None:
+            seat = (
+                db.query(Seat)
+                .filter(Seat.event_id == event_id, Seat.code == seat_code)
+                .with_for_update()
+                .first()
+            )
         if not seat:
             raise ValueError(f"Seat not found: {seat_code}")
 
@@ -186,6 +234,7 @@ def decode_qr_data(qr_string: str) -> dict | None:
             # Extrai os parâmetros da query
             buyer_name = unquote(query_params.get("buyer_name", [""])[0])
             seat_code = query_params.get("seat_code", [""])[0]
+            event_id = query_params.get("event_id", [None])[0]
             is_half_price_str = query_params.get("is_half_price", ["false"])[0].lower()
             status = query_params.get("status", [""])[0]
 
@@ -196,6 +245,7 @@ def decode_qr_data(qr_string: str) -> dict | None:
                 "hash": hash_value,
                 "buyer_name": buyer_name,
                 "seat_code": seat_code,
+                "event_id": int(event_id) if event_id else None,
                 "is_half_price": is_half_price,
                 "status": status,
             }
@@ -0,0 +1,172 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Listas de parâmetros expandidas (IN) viram um único marcador
+_PARAMETER_LIST = re.compile(r"%\(\w+\)s(\s*,\s*%\(\w+\)s)*")
+
+
+class RequestQueryStats:
+    """Consultas executadas durante uma requisição."""
+
+    def __init__(self, scope: dict | None = None):
+        self.scope = scope or {}
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    @property
+    def route(self) -> str:
+        """Método e template da rota (ou o caminho, se ainda não houver rota)."""
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "")
+        return f"{self.scope.get('method', '')} {path}".strip()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[_PARAMETER_LIST.sub("?", statement.strip())] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Formatos de comando executados pelo menos `threshold` vezes."""
+        return [
+            (shape, times)
+            for shape, times in self.shapes.most_common()
+            if times >= threshold
+        ]
+
+
+_current: ContextVar[RequestQueryStats | None] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def current_query_stats() -> RequestQueryStats | None:
+    """Estatísticas da requisição em andamento, se houver uma."""
+    return _current.get()
+
+
+def query_budget(limit: int):
+    """
+    Declara o número máximo de consultas de uma rota.
+
+    Com QUERY_BUDGET_ENFORCE=true, uma requisição que passar do limite
+    responde 500, o que faz o teste de carga falhar.
+    """
+
+    def decorator(endpoint):
+        endpoint.query_budget = limit
+        return endpoint
+
+    return decorator
+
+
+def instrument_engine_queries(engine: Engine) -> None:
+    """Soma cada comando executado pelo engine na requisição em andamento."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("request_query_started", []).append(
+                time.perf_counter()
+            )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        timers = conn.info.get("request_query_started")
+        if stats is not None and timers:
+            stats.record(statement, time.perf_counter() - timers.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(context):
+        if context.connection is None or _current.get() is None:
+            return
+        timers = context.connection.info.get("request_query_started")
+        if timers:
+            timers.pop()
+
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI que conta as consultas de cada requisição.
+
+    Em modo DEBUG adiciona os headers X-DB-Query-Count e X-DB-Query-Time-Ms.
+    Registra um aviso quando o mesmo formato de comando se repete
+    QUERY_REPEAT_WARNING vezes ou mais (sinal de N+1).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope)
+        token = _current.set(stats)
+        replaced = False
+
+        async def send_with_stats(message):
+            nonlocal replaced
+            if replaced:
+                return
+            if message["type"] == "http.response.start":
+                route = scope.get("route")
+                endpoint = getattr(route, "endpoint", None)
+                budget = getattr(endpoint, "query_budget", None)
+                if (
+                    settings.QUERY_BUDGET_ENFORCE
+                    and budget is not None
+                    and stats.count > budget
+                ):
+                    replaced = True
+                    body = json.dumps(
+                        {
+                            "detail": f"Query budget exceeded for {route.path}: "
+                            f"{stats.count} > {budget}"
+                        }
+                    ).encode()
+                    await send(
+                        {
+                            "type": "http.response.start",
+                            "status": 500,
+                            "headers": [
+                                (b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode()),
+                            ],
+                        }
+                    )
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                if settings.DEBUG:
+                    elapsed_ms = f"{stats.seconds * 1000:.1f}"
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-query-time-ms", elapsed_ms.encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            for shape, times in stats.repeated(settings.QUERY_REPEAT_WARNING):
+                logger.warning(
+                    "Possível N+1 em %s %s: comando executado %d vezes: %s",
+                    scope["method"],
+                    scope["path"],
+                    times,
+                    shape[:200],
+                )
@@ -0,0 +1,226 @@
+import datetime
+import ipaddress
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from fastapi import Header, HTTPException, Request
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.database import engine
+from src.models.rate_limit_bucket import RateLimitBucket
+from src.settings import settings
+from src.utils.auth import get_current_user
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(ABC):
+    """Interface comum dos armazenamentos de baldes de tokens."""
+
+    @abstractmethod
+    def take(self, key: str, capacity: float, per_second: float) -> float:
+        """
+        Tenta consumir um token do balde `key`.
+
+        Args:
+            key: Chave do balde (rota e cliente)
+            capacity: Máximo de tokens acumulados (tamanho da rajada)
+            per_second: Tokens repostos por segundo
+
+        Returns:
+            0 se o token foi consumido; senão, segundos até haver um token
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Baldes em memória, válidos só para o processo atual.
+
+    Serve para desenvolvimento e testes; com vários workers cada um teria o
+    seu próprio limite.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def take(self, key: str, capacity: float, per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+        return 0.0 if allowed else (1 - tokens) / per_second
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """
+    Baldes na tabela rate_limit_bucket, compartilhados entre os workers.
+
+    Cada tentativa é um único INSERT ... ON CONFLICT DO UPDATE que repõe os
+    tokens pelo tempo decorrido e consome um se houver, de forma atômica.
+    """
+
+    def take(self, key: str, capacity: float, per_second: float) -> float:
+        elapsed = func.extract("epoch", func.now() - RateLimitBucket.updated_at)
+        refilled = func.least(
+            float(capacity), RateLimitBucket.tokens + elapsed * per_second
+        )
+        statement = insert(RateLimitBucket).values(
+            key=key, tokens=capacity - 1, allowed=True, updated_at=func.now()
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[RateLimitBucket.key],
+            set_={
+                "tokens": case((refilled >= 1, refilled - 1), else_=refilled),
+                "allowed": refilled >= 1,
+                "updated_at": func.now(),
+            },
+        ).returning(RateLimitBucket.tokens, RateLimitBucket.allowed)
+
+        with engine.begin() as connection:
+            tokens, allowed = connection.execute(statement).one()
+        return 0.0 if allowed else (1 - tokens) / per_second
+
+
+RATE_LIMIT_BACKENDS = {
+    "memory": MemoryRateLimitBackend,
+    "postgres": PostgresRateLimitBackend,
+}
+
+_backend: RateLimitBackend | None = None
+
+
+def get_rate_limiter() -> RateLimitBackend:
+    """Retorna o backend configurado em RATE_LIMIT_BACKEND."""
+    global _backend
+    if _backend is None:
+        backend = settings.RATE_LIMIT_BACKEND
+        if backend not in RATE_LIMIT_BACKENDS:
+            raise ValueError(f"Backend de rate limit desconhecido: {backend}")
+        _backend = RATE_LIMIT_BACKENDS[backend]()
+    return _backend
+
+
+@lru_cache(maxsize=1)
+def _trusted_networks(setting: str) -> tuple:
+    return tuple(
+        ipaddress.ip_network(item.strip(), strict=False)
+        for item in setting.split(",")
+        if item.strip() and item.strip() != "*"
+    )
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    if settings.TRUSTED_PROXIES.strip() == "*":
+        return True
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    networks = _trusted_networks(settings.TRUSTED_PROXIES)
+    return any(address in network for network in networks)
+
+
+def client_ip(request: Request) -> str:
+    """
+    IP do cliente. Quando a conexão vem de um proxy de TRUSTED_PROXIES, usa o
+    X-Forwarded-For da direita para a esquerda, pulando os proxies confiáveis:
+    as entradas mais à esquerda vêm do próprio cliente e podem ser forjadas.
+    Com "*", só o proxy que conectou é confiável e vale a entrada que ele
+    acrescentou (a última).
+    """
+    peer = request.client.host if request.client else "unknown"
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or not _is_trusted_proxy(peer):
+        return peer
+
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    if settings.TRUSTED_PROXIES.strip() == "*":
+        return hops[-1] if hops else peer
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def rate_limit(
+    name: str,
+    per_ip: tuple[int, float] | None = None,
+    per_user: tuple[int, float] | None = None,
+):
+    """
+    Dependência que limita a rota com baldes de tokens.
+
+    Args:
+        name: Nome do limite; rotas com o mesmo nome dividem os baldes
+        per_ip: (rajada, tokens por minuto) por IP
+        per_user: (rajada, tokens por minuto) por usuário autenticado
+
+    Raises:
+        HTTPException: 429 com Retry-After quando algum balde está vazio
+
+    Uso:
+        limit = rate_limit("login", per_ip=(10, 10))
+        @router.post("/login", dependencies=[Depends(limit)])
+    """
+
+    def dependency(
+        request: Request, authorization: str | None = Header(None)
+    ) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        buckets = []
+        if per_ip:
+            buckets.append((f"{name}:ip:{client_ip(request)}", *per_ip))
+        if per_user and authorization:
+            try:
+                user = get_current_user(authorization)
+                buckets.append((f"{name}:user:{user['id']}", *per_user))
+            except HTTPException:
+                pass
+
+        limiter = get_rate_limiter()
+        wait = 0.0
+        for key, capacity, per_minute in buckets:
+            try:
+                wait = max(wait, limiter.take(key, capacity, per_minute / 60))
+            except SQLAlchemyError:
+                # Uma falha no limitador não pode derrubar a rota
+                logger.exception("Falha ao consultar o rate limit de %s", key)
+
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests. Try again later.",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    return dependency
+
+
+def prune_rate_limit_buckets(db: Session, older_than: datetime.timedelta) -> int:
+    """
+    Apaga baldes sem uso há mais de `older_than`. Um balde parado por mais
+    tempo que o necessário para encher equivale a um balde novo.
+
+    Returns:
+        Quantidade de baldes apagados
+    """
+    result = db.execute(
+        delete(RateLimitBucket).where(
+            RateLimitBucket.updated_at < func.now() - older_than
+        )
+    )
+    return result.rowcount
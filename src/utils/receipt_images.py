@@ -0,0 +1,142 @@
+import datetime
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+from src.database import SessionLocal
+from src.models.receipt import Receipt
+from src.settings import settings
+from src.utils.storage import get_receipt_storage
+
+logger = logging.getLogger(__name__)
+
+# Tipos de comprovante que são imagens recomprimíveis
+PROCESSABLE_TYPES = {"image/jpeg", "image/png"}
+
+# Pillow libera o GIL durante decodificação, redimensionamento e codificação,
+# então threads bastam para não bloquear as requisições
+_executor = ThreadPoolExecutor(
+    max_workers=settings.RECEIPT_PROCESSING_WORKERS,
+    thread_name_prefix="receipt-images",
+)
+
+
+def _encode_jpeg(image: Image.Image, max_dimension: int, quality: int) -> io.BytesIO:
+    resized = image.copy()
+    resized.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    resized.save(buffer, format="JPEG", quality=quality, optimize=True)
+    buffer.seek(0)
+    return buffer
+
+
+def perceptual_hash(image: Image.Image, hash_size: int = 8) -> str:
+    """
+    Calcula o dHash da imagem: compara o brilho de pixels vizinhos em uma
+    versão reduzida em tons de cinza. Cópias da mesma captura de tela,
+    mesmo recomprimidas ou redimensionadas, produzem o mesmo valor, mas
+    comprovantes diferentes do mesmo app também podem coincidir: use só como
+    indício de semelhança.
+
+    Returns:
+        Hash de 64 bits em hexadecimal
+    """
+    small = image.convert("L").resize(
+        (hash_size + 1, hash_size), Image.Resampling.LANCZOS
+    )
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(hash_size):
+        for column in range(hash_size):
+            left = pixels[row * (hash_size + 1) + column]
+            right = pixels[row * (hash_size + 1) + column + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:0{hash_size * hash_size // 4}x}"
+
+
+def process_receipt_image(receipt_id: int) -> None:
+    """
+    Recomprime a imagem de um comprovante e gera sua miniatura.
+
+    A imagem é reduzida para no máximo RECEIPT_IMAGE_MAX_DIMENSION pixels no
+    maior lado e salva como JPEG, com a extensão do nome original trocada
+    para .jpg. Se o resultado não ficar menor que o original, o arquivo
+    original é mantido. A miniatura e o hash perceptual são gerados sempre.
+    PDFs e GIFs não são processados. Se algo falhar antes do commit, os
+    arquivos já gravados (miniatura e versão recomprimida) são apagados.
+
+    Args:
+        receipt_id: ID do comprovante a processar
+    """
+    storage = get_receipt_storage()
+    db = SessionLocal()
+    # Arquivos gravados nesta execução que ainda não estão no banco
+    pending_keys = []
+    try:
+        receipt = db.query(Receipt).filter(Receipt.id == receipt_id).first()
+        if not receipt or receipt.content_type not in PROCESSABLE_TYPES:
+            return
+
+        max_dimension = settings.RECEIPT_IMAGE_MAX_DIMENSION
+        with storage.open(receipt.storage_key) as original:
+            image = Image.open(original)
+            # Decodifica JPEGs já em escala reduzida quando possível
+            image.draft("RGB", (max_dimension, max_dimension))
+            image = ImageOps.exif_transpose(image).convert("RGB")
+
+        compressed = _encode_jpeg(
+            image, max_dimension, settings.RECEIPT_IMAGE_QUALITY
+        )
+        thumbnail = _encode_jpeg(image, settings.RECEIPT_THUMBNAIL_SIZE, 70)
+
+        original_key = receipt.storage_key
+        original_size = receipt.size
+        thumbnail_stored = storage.save(thumbnail, settings.RECEIPT_MAX_BYTES)
+        pending_keys.append(thumbnail_stored["key"])
+        receipt.thumbnail_key = thumbnail_stored["key"]
+        receipt.perceptual_hash = perceptual_hash(image)
+        receipt.original_size = original_size
+
+        if compressed.getbuffer().nbytes < original_size:
+            stored = storage.save(compressed, settings.RECEIPT_MAX_BYTES)
+            pending_keys.append(stored["key"])
+            receipt.storage_key = stored["key"]
+            receipt.content_type = stored["content_type"]
+            receipt.size = stored["size"]
+            if receipt.original_filename:
+                stem, _ = os.path.splitext(receipt.original_filename)
+                receipt.original_filename = f"{stem}.jpg"
+
+        receipt.processed_at = datetime.datetime.now(datetime.timezone.utc)
+        new_key, new_size = receipt.storage_key, receipt.size
+        db.commit()
+        pending_keys.clear()
+
+        if new_key != original_key:
+            storage.delete(original_key)
+
+        logger.info(
+            "Comprovante %s recomprimido: %d -> %d bytes (%.0f%% menor)",
+            receipt_id,
+            original_size,
+            new_size,
+            100 * (1 - new_size / original_size) if original_size else 0,
+        )
+    except Exception:
+        db.rollback()
+        logger.exception("Falha ao processar imagem do comprovante %s", receipt_id)
+        for key in pending_keys:
+            try:
+                storage.delete(key)
+            except Exception:
+                logger.exception("Falha ao apagar o arquivo órfão %s", key)
+    finally:
+        db.close()
+
+
+def submit_receipt_processing(receipt_id: int) -> None:
+    """Agenda o processamento do comprovante no pool de workers."""
+    _executor.submit(process_receipt_image, receipt_id)
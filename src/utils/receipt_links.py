@@ -0,0 +1,48 @@
+import datetime
+
+import jwt
+
+from src.settings import settings
+
+# Audiência própria para que a assinatura de um link não valha como token de acesso
+RECEIPT_AUDIENCE = "receipt"
+
+
+def receipt_url(receipt_id: int, thumbnail: bool = False) -> str:
+    """
+    Link assinado para o comprovante (ou sua miniatura), que abre direto de um
+    cliente de email por RECEIPT_LINK_TTL_HOURS, sem header de autorização.
+    """
+    payload = {
+        "rid": receipt_id,
+        "aud": RECEIPT_AUDIENCE,
+        "exp": datetime.datetime.now(datetime.timezone.utc)
+        + datetime.timedelta(hours=settings.RECEIPT_LINK_TTL_HOURS),
+    }
+    signature = jwt.encode(
+        payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+    )
+    path = f"/admin/receipts/{receipt_id}" + ("/thumbnail" if thumbnail else "")
+    return f"{settings.BACKEND_URL}{path}?signature={signature}"
+
+
+def verify_receipt_signature(receipt_id: int, signature: str) -> None:
+    """
+    Confere a assinatura de um link gerado por receipt_url.
+
+    Raises:
+        ValueError: Se a assinatura for inválida, expirada ou de outro comprovante
+    """
+    try:
+        payload = jwt.decode(
+            signature,
+            settings.JWT_SECRET_KEY,
+            algorithms=[settings.JWT_ALGORITHM],
+            audience=RECEIPT_AUDIENCE,
+        )
+    except jwt.ExpiredSignatureError:
+        raise ValueError("Receipt link expired.")
+    except jwt.InvalidTokenError:
+        raise ValueError("Invalid receipt link.")
+    if payload.get("rid") != receipt_id:
+        raise ValueError("Invalid receipt link.")
@@ -0,0 +1,133 @@
+import csv
+import datetime
+import io
+from typing import Iterator
+
+from sqlalchemy import case, select
+
+from src.database import SessionLocal
+from src.models.seat import Seat
+from src.models.transaction_seat import TransactionSeat
+from src.models.user import User
+from src.settings import settings
+
+EXPORT_COLUMNS = [
+    "transaction_id",
+    "reserved_at",
+    "buyer_name",
+    "buyer_email",
+    "buyer_phone",
+    "seat_code",
+    "status",
+    "ticket_type",
+    "price",
+]
+
+
+def _export_query(
+    event_id: int,
+    start: datetime.date | None,
+    end: datetime.date | None,
+    status: str | None,
+):
+    """
+    Monta a consulta de exportação: uma linha por assento de cada reserva do
+    evento.
+
+    O status e o tipo de ingresso vêm do estado atual do assento. Se o assento
+    não pertence mais ao comprador da transação (foi reprovado ou revendido),
+    a linha aparece com status 'released' e sem preço.
+    """
+    items = select(
+        TransactionSeat.transaction_id.label("transaction_id"),
+        TransactionSeat.user_id.label("user_id"),
+        TransactionSeat.created_at.label("created_at"),
+        TransactionSeat.seat_code.label("seat_code"),
+    ).where(TransactionSeat.event_id == event_id)
+    if start:
+        items = items.where(TransactionSeat.created_at >= start)
+    if end:
+        items = items.where(
+            TransactionSeat.created_at < end + datetime.timedelta(days=1)
+        )
+    items = items.subquery()
+
+    owned = Seat.user_id == items.c.user_id
+    seat_status = case((owned, Seat.status), else_="released")
+    query = (
+        select(
+            items.c.transaction_id,
+            items.c.created_at,
+            User.full_name,
+            User.email,
+            User.phone_number,
+            items.c.seat_code,
+            seat_status.label("status"),
+            case((owned, Seat.is_half_price), else_=None).label("is_half_price"),
+        )
+        .outerjoin(
+            Seat, (Seat.event_id == event_id) & (Seat.code == items.c.seat_code)
+        )
+        .outerjoin(User, User.id == items.c.user_id)
+        .order_by(items.c.created_at, items.c.transaction_id, items.c.seat_code)
+    )
+    if status:
+        query = query.where(seat_status == status)
+    return query
+
+
+def iter_export_rows(
+    event_id: int,
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    status: str | None = None,
+    batch_size: int = 1000,
+) -> Iterator[list]:
+    """
+    Percorre as reservas com um cursor no servidor, `batch_size` linhas por vez.
+
+    Abre a própria sessão, pois a resposta é transmitida depois que as
+    dependências da rota já foram encerradas.
+
+    Yields:
+        Linhas na ordem de EXPORT_COLUMNS
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            _export_query(event_id, start, end, status).execution_options(yield_per=batch_size)
+        )
+        for row in result:
+            if row.is_half_price is None:
+                ticket_type, price = None, None
+            elif row.is_half_price:
+                ticket_type, price = "half", settings.TICKET_HALF_PRICE
+            else:
+                ticket_type, price = "full", settings.TICKET_FULL_PRICE
+            yield [
+                row.transaction_id,
+                row.created_at.isoformat() if row.created_at else None,
+                row.full_name,
+                row.email,
+                row.phone_number,
+                row.seat_code,
+                row.status,
+                ticket_type,
+                price,
+            ]
+    finally:
+        db.close()
+
+
+def iter_csv(rows: Iterator[list], rows_per_chunk: int = 500) -> Iterator[str]:
+    """Converte linhas em CSV, devolvendo blocos de `rows_per_chunk` linhas."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if index % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,97 @@
+import re
+
+# Código de assento dos layouts: fileira em letras seguida do número (A1, AB120)
+_SEAT_CODE = re.compile(r"([A-Z]+)(\d+)")
+
+
+def parse_seat_code(code: str) -> tuple[str, int] | None:
+    """
+    Separa um código de assento em fileira e número (ex: "K12" -> ("K", 12)).
+
+    Returns:
+        Tupla (fileira, número) ou None se o código não segue o formato
+    """
+    match = _SEAT_CODE.fullmatch(code)
+    if not match:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def row_bounds(seat_codes: list[str]) -> dict[str, tuple[int, int]]:
+    """
+    Primeiro e último número existentes em cada fileira do layout.
+
+    Returns:
+        Dicionário fileira -> (primeiro, último)
+    """
+    bounds: dict[str, tuple[int, int]] = {}
+    for code in seat_codes:
+        parsed = parse_seat_code(code)
+        if parsed:
+            row, number = parsed
+            first, last = bounds.get(row, (number, number))
+            bounds[row] = (min(first, number), max(last, number))
+    return bounds
+
+
+def within_bounds(bounds: dict[str, tuple[int, int]], code: str) -> bool:
+    """Indica se o assento cabe nos limites (códigos fora do formato cabem)."""
+    parsed = parse_seat_code(code)
+    if not parsed:
+        return True
+    row, number = parsed
+    if row not in bounds:
+        return False
+    first, last = bounds[row]
+    return first <= number <= last
+
+
+class RowIndex:
+    """
+    Índice em memória dos assentos livres agrupados por fileira.
+
+    Os limites de cada fileira vêm dos assentos do próprio evento (row_bounds),
+    de modo que vale para qualquer layout de local. Números que não existem na
+    fileira (corredores) interrompem os blocos. Usado para encontrar blocos de
+    assentos contíguos sem consultar o banco para cada combinação possível.
+    """
+
+    def __init__(self, bounds: dict[str, tuple[int, int]], free_codes: list[str]):
+        # Fileira -> (primeiro, último) número existente no layout
+        self.bounds = bounds
+        self.rows: dict[str, set[int]] = {row: set() for row in self.bounds}
+        for code in free_codes:
+            parsed = parse_seat_code(code)
+            if parsed and parsed[0] in self.rows:
+                self.rows[parsed[0]].add(parsed[1])
+
+    def _row_order(self, preferred_row: str | None) -> list[str]:
+        # Da frente para o fundo, com "Z" antes de "AA" como nas planilhas
+        rows = sorted(self.bounds, key=lambda row: (len(row), row))
+        if preferred_row not in self.bounds:
+            return rows
+        preferred = rows.index(preferred_row)
+        return sorted(rows, key=lambda row: abs(rows.index(row) - preferred))
+
+    def blocks(self, count: int, preferred_row: str | None = None) -> list[list[str]]:
+        """
+        Lista os blocos de `count` assentos contíguos livres em ordem de
+        preferência: fileira preferida (ou da frente para o fundo) e, dentro da
+        fileira, os blocos mais próximos do centro.
+        """
+        result = []
+        for row in self._row_order(preferred_row):
+            free = self.rows[row]
+            first, last = self.bounds[row]
+            center = (first + last) / 2
+            windows = [
+                start
+                for start in range(first, last - count + 2)
+                if all(start + offset in free for offset in range(count))
+            ]
+            windows.sort(key=lambda start: abs(start + (count - 1) / 2 - center))
+            result.extend(
+                [f"{row}{start + offset}" for offset in range(count)]
+                for start in windows
+            )
+        return result
@@ -0,0 +1,275 @@
+import datetime
+
+from sqlalchemy import and_, delete, exists, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.models.seat import Seat
+from src.models.seat_hold import SeatHold
+from src.settings import settings
+from src.utils.seat_layout import RowIndex, row_bounds, within_bounds
+
+
+# Limites das fileiras de cada evento. O layout de um evento só ganha assentos
+# (load_venue), então fica em memória e é relido quando aparece um assento
+# livre fora dele
+_event_row_bounds: dict[int, dict[str, tuple[int, int]]] = {}
+
+
+def _unique(seat_codes: list[str]) -> list[str]:
+    """Remove códigos repetidos preservando a ordem do pedido."""
+    return list(dict.fromkeys(seat_codes))
+
+
+def _hold_deadline():
+    """Prazo de uma retenção criada ou renovada agora."""
+    return func.now() + datetime.timedelta(minutes=settings.SEAT_HOLD_TTL_MINUTES)
+
+
+def hold_expired():
+    """
+    Expressão verdadeira quando a pré-reserva do assento já venceu.
+
+    O prazo fica na própria linha do assento (seat.hold_expires_at), e não só
+    em seat_hold: quando um UPDATE espera pelo lock de um assento, o Postgres
+    reavalia o WHERE apenas sobre a nova versão da linha travada. Uma consulta
+    a outra tabela continuaria vendo a retenção antiga como vencida, e dois
+    usuários poderiam conquistar o mesmo assento.
+    """
+    return or_(Seat.hold_expires_at.is_(None), Seat.hold_expires_at <= func.now())
+
+
+def claimable(user_id: int):
+    """
+    Expressão verdadeira para assentos que o usuário pode pré-reservar: livres,
+    já pré-reservados por ele ou com a retenção de outro usuário vencida.
+    """
+    return or_(
+        Seat.status == "available",
+        and_(
+            Seat.status == "pre-reserved",
+            or_(Seat.user_id == user_id, hold_expired()),
+        ),
+    )
+
+
+def pre_reserve(
+    db: Session, event_id: int, user_id: int, seat_codes: list[str]
+) -> dict:
+    """
+    Pré-reserva um conjunto de assentos para o usuário com operações em lote.
+
+    Em vez de carregar e alterar cada assento pela ORM, executa no máximo dois
+    UPDATEs com RETURNING:
+
+    1. Libera as pré-reservas do usuário que não estão mais na lista.
+    2. Reivindica os assentos pedidos que estão disponíveis, que já são
+       pré-reservas do próprio usuário ou cuja retenção expirou, renovando o
+       prazo de todos eles.
+
+    A decisão de sucesso fica com o chamador: a transação não é confirmada aqui.
+
+    Args:
+        db: Sessão do banco de dados
+        event_id: ID do evento dos assentos
+        user_id: ID do usuário que está pré-reservando
+        seat_codes: Lista completa de assentos selecionados pelo usuário
+
+    Returns:
+        Dicionário com os assentos conquistados ("won"), perdidos ("lost")
+        e liberados ("released")
+    """
+    seat_codes = _unique(seat_codes)
+    now = datetime.datetime.utcnow()
+
+    released = db.execute(
+        update(Seat)
+        .where(
+            Seat.event_id == event_id,
+            Seat.user_id == user_id,
+            Seat.status == "pre-reserved",
+            Seat.code.not_in(seat_codes),
+        )
+        .values(
+            status="available",
+            user_id=None,
+            is_half_price=False,
+            hold_expires_at=None,
+            updated_at=now,
+        )
+        .returning(Seat.code)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    won = []
+    if seat_codes:
+        won = db.execute(
+            update(Seat)
+            .where(
+                Seat.event_id == event_id,
+                Seat.code.in_(seat_codes),
+                claimable(user_id),
+            )
+            .values(
+                status="pre-reserved",
+                user_id=user_id,
+                hold_expires_at=_hold_deadline(),
+                updated_at=now,
+            )
+            .returning(Seat.code)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+
+    won_codes = set(won)
+    return {
+        "won": [code for code in seat_codes if code in won_codes],
+        "lost": [code for code in seat_codes if code not in won_codes],
+        "released": list(released),
+    }
+
+
+def pre_reserve_best_available(
+    db: Session,
+    event_id: int,
+    user_id: int,
+    count: int,
+    preferred_row: str | None = None,
+    max_attempts: int = 6,
+) -> list[str] | None:
+    """
+    Pré-reserva o melhor bloco de `count` assentos contíguos disponível.
+
+    Os candidatos vêm de um índice em memória com os limites das fileiras do
+    evento, guardados entre requisições, e os assentos livres para o usuário,
+    que são os únicos lidos a cada chamada. Cada bloco é travado com FOR UPDATE
+    SKIP LOCKED dentro de um savepoint: se outra requisição já travou algum
+    assento do bloco, o savepoint é desfeito e o próximo candidato é tentado,
+    sem esperar pelo lock. max_attempts limita as tentativas (e as consultas
+    da rota, veja o query_budget de /seats/best-available).
+
+    Returns:
+        Lista com os códigos pré-reservados ou None se nenhum bloco foi obtido
+    """
+    free_codes = (
+        db.execute(
+            select(Seat.code).where(Seat.event_id == event_id, claimable(user_id))
+        )
+        .scalars()
+        .all()
+    )
+    bounds = _event_row_bounds.get(event_id)
+    if bounds is None or not all(within_bounds(bounds, code) for code in free_codes):
+        bounds = row_bounds(
+            db.execute(select(Seat.code).where(Seat.event_id == event_id))
+            .scalars()
+            .all()
+        )
+        _event_row_bounds[event_id] = bounds
+    candidates = RowIndex(bounds, free_codes).blocks(count, preferred_row)
+
+    for block in candidates[:max_attempts]:
+        savepoint = db.begin_nested()
+        locked = (
+            db.execute(
+                select(Seat.code)
+                .where(
+                    Seat.event_id == event_id,
+                    Seat.code.in_(block),
+                    claimable(user_id),
+                )
+                .with_for_update(skip_locked=True)
+            )
+            .scalars()
+            .all()
+        )
+        if len(locked) == count:
+            result = pre_reserve(db, event_id, user_id, block)
+            if not result["lost"]:
+                savepoint.commit()
+                return result["won"]
+        savepoint.rollback()
+
+    return None
+
+
+def upsert_hold(
+    db: Session, event_id: int, user_id: int, seat_codes: list[str]
+) -> None:
+    """
+    Grava (ou renova) a retenção do usuário com o prazo configurado, o mesmo
+    que pre_reserve grava em cada assento.
+
+    Cada usuário tem no máximo uma linha em seat_hold por evento; uma lista
+    vazia remove a retenção.
+    """
+    if not seat_codes:
+        db.execute(
+            delete(SeatHold).where(
+                SeatHold.user_id == user_id, SeatHold.event_id == event_id
+            )
+        )
+        return
+
+    statement = insert(SeatHold).values(
+        user_id=user_id,
+        event_id=event_id,
+        seats=seat_codes,
+        expires_at=_hold_deadline(),
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[SeatHold.user_id, SeatHold.event_id],
+            set_={
+                "seats": statement.excluded.seats,
+                "expires_at": statement.excluded.expires_at,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def release_expired_holds(db: Session) -> list[str]:
+    """
+    Devolve ao estoque os assentos pré-reservados sem retenção ativa e apaga
+    as retenções vencidas, em todos os eventos.
+
+    Returns:
+        Lista com os códigos dos assentos liberados
+    """
+    now = datetime.datetime.utcnow()
+    released = db.execute(
+        update(Seat)
+        .where(Seat.status == "pre-reserved", hold_expired())
+        .values(
+            status="available",
+            user_id=None,
+            is_half_price=False,
+            hold_expires_at=None,
+            updated_at=now,
+        )
+        .returning(Seat.code)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.execute(delete(SeatHold).where(SeatHold.expires_at <= func.now()))
+    return list(released)
+
+
+def find_missing_seats(
+    db: Session, event_id: int, seat_codes: list[str]
+) -> list[str]:
+    """
+    Retorna os códigos da lista que não existem entre os assentos do evento.
+
+    Usado apenas no caminho de erro, para diferenciar assentos inexistentes de
+    assentos já tomados por outros usuários.
+    """
+    if not seat_codes:
+        return []
+    existing = set(
+        db.execute(
+            select(Seat.code).where(
+                Seat.event_id == event_id, Seat.code.in_(seat_codes)
+            )
+        ).scalars()
+    )
+    return [code for code in seat_codes if code not in existing]
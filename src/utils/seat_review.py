@@ -0,0 +1,107 @@
+import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from src.models.seat import Seat
+from src.models.transaction import Transaction
+
+# Valores aplicados em cada transição de revisão de comprovante
+REVIEW_TRANSITIONS = {
+    "approve": {"outcome": "approved", "values": {"status": "occupied"}},
+    "reprove": {
+        "outcome": "reproved",
+        "values": {"status": "available", "user_id": None, "is_half_price": False},
+    },
+}
+
+
+def transaction_seats(
+    db: Session, event_id: int, transaction_id: int
+) -> tuple[list[str], int] | None:
+    """
+    Retorna os assentos e o comprador de uma transação, ou None se ela não
+    existir no evento.
+    """
+    row = db.execute(
+        select(Transaction.seats, Transaction.user_id).where(
+            Transaction.id == transaction_id, Transaction.event_id == event_id
+        )
+    ).one_or_none()
+    return (row.seats, row.user_id) if row else None
+
+
+def review_seats(
+    db: Session,
+    event_id: int,
+    action: str,
+    user_id: int | None = None,
+    seat_codes: list[str] | None = None,
+) -> list[dict]:
+    """
+    Aprova ou reprova vários assentos reservados com um único UPDATE.
+
+    Apenas assentos com status 'reserved' mudam de estado; os demais são
+    reportados com o status atual. A transação não é confirmada aqui.
+
+    Args:
+        db: Sessão do banco de dados
+        event_id: ID do evento dos assentos
+        action: "approve" ou "reprove"
+        user_id: Revisa todos os assentos reservados deste usuário; junto com
+            seat_codes, revisa só os listados que ainda forem dele
+        seat_codes: Revisa apenas os assentos listados
+
+    Returns:
+        Lista com o resultado de cada assento
+    """
+    transition = REVIEW_TRANSITIONS[action]
+    target = [Seat.event_id == event_id, Seat.status == "reserved"]
+    if seat_codes is not None:
+        seat_codes = list(dict.fromkeys(seat_codes))
+        target.append(Seat.code.in_(seat_codes))
+    if user_id is not None:
+        target.append(Seat.user_id == user_id)
+
+    reviewed = db.execute(
+        update(Seat)
+        .where(*target)
+        .values(**transition["values"], updated_at=datetime.datetime.utcnow())
+        .returning(Seat.code)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    outcomes = [
+        {
+            "seat_code": code,
+            "outcome": transition["outcome"],
+            "status": transition["values"]["status"],
+        }
+        for code in reviewed
+    ]
+
+    if seat_codes is None:
+        return outcomes
+
+    reviewed_codes = set(reviewed)
+    skipped = [code for code in seat_codes if code not in reviewed_codes]
+    current = (
+        dict(
+            db.execute(
+                select(Seat.code, Seat.status).where(
+                    Seat.event_id == event_id, Seat.code.in_(skipped)
+                )
+            )
+        )
+        if skipped
+        else {}
+    )
+    outcomes.extend(
+        {
+            "seat_code": code,
+            "outcome": "skipped" if code in current else "not_found",
+            "status": current.get(code),
+        }
+        for code in skipped
+    )
+    return outcomes
@@ -0,0 +1,105 @@
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+
+from src.models.seat import Seat
+from src.models.seat_stats import SeatStats
+from src.settings import settings
+from src.utils.seat_reservation import hold_expired
+
+SEAT_STATUSES = ["available", "pre-reserved", "reserved", "occupied", "used"]
+
+
+def get_seat_stats(db: Session, event_id: int) -> dict:
+    """
+    Lê os contadores mantidos pelo trigger e monta o resumo de vendas do
+    evento.
+
+    A consulta percorre apenas a tabela seat_stats (no máximo status x tipo x
+    shards linhas), então o custo não depende do número de assentos. Uma
+    segunda consulta, no índice parcial das pré-reservas, conta as de retenção
+    vencida: elas aparecem como disponíveis, como em /seats/, mesmo antes de
+    release_expired_holds devolvê-las ao estoque.
+
+    Returns:
+        Dicionário com contagens por status, por tipo de ingresso e receita
+    """
+    rows = db.execute(
+        select(
+            SeatStats.status,
+            SeatStats.is_half_price,
+            func.sum(SeatStats.total).label("total"),
+        )
+        .where(SeatStats.event_id == event_id)
+        .group_by(SeatStats.status, SeatStats.is_half_price)
+    ).all()
+
+    by_status = {status: 0 for status in SEAT_STATUSES}
+    half_price = {status: 0 for status in SEAT_STATUSES}
+    full_price = {status: 0 for status in SEAT_STATUSES}
+    for status, is_half_price, total in rows:
+        total = int(total or 0)
+        by_status[status] = by_status.get(status, 0) + total
+        bucket = half_price if is_half_price else full_price
+        bucket[status] = bucket.get(status, 0) + total
+
+    lapsed = db.execute(
+        select(func.count()).where(
+            Seat.event_id == event_id,
+            Seat.status == "pre-reserved",
+            hold_expired(),
+        )
+    ).scalar_one()
+    by_status["pre-reserved"] -= lapsed
+    by_status["available"] += lapsed
+
+    def revenue(statuses: list[str]) -> float:
+        return sum(
+            full_price.get(status, 0) * settings.TICKET_FULL_PRICE
+            + half_price.get(status, 0) * settings.TICKET_HALF_PRICE
+            for status in statuses
+        )
+
+    sold = ["occupied", "used"]
+    return {
+        "seats": by_status,
+        "tickets": {
+            "full_price": sum(full_price.get(status, 0) for status in sold),
+            "half_price": sum(half_price.get(status, 0) for status in sold),
+        },
+        "revenue": {
+            "confirmed": revenue(sold),
+            "pending": revenue(["reserved"]),
+        },
+    }
+
+
+def reconcile_seat_stats(db: Session) -> int:
+    """
+    Recalcula os contadores do zero a partir da tabela seat.
+
+    Trava a tabela seat em modo SHARE durante a contagem para que nenhuma
+    transição aconteça entre a leitura e a gravação. A transação não é
+    confirmada aqui.
+
+    Returns:
+        Total de assentos contados
+    """
+    db.execute(text("LOCK TABLE seat IN SHARE MODE"))
+    db.execute(delete(SeatStats))
+    counts = db.execute(
+        select(Seat.event_id, Seat.status, Seat.is_half_price, func.count()).group_by(
+            Seat.event_id, Seat.status, Seat.is_half_price
+        )
+    ).all()
+    for event_id, status, is_half_price, total in counts:
+        db.add(
+            SeatStats(
+                event_id=event_id,
+                status=status,
+                is_half_price=is_half_price,
+                shard=0,
+                total=total,
+            )
+        )
+    db.flush()
+    return sum(total for *_, total in counts)
@@ -0,0 +1,122 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.settings import settings
+from src.utils.query_stats import current_query_stats
+
+logger = logging.getLogger(__name__)
+
+# Comandos que o EXPLAIN aceita
+_EXPLAINABLE = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+# Um único worker: a captura de planos nunca deve competir com as requisições
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-queries")
+
+# Último momento em que cada comando teve o plano capturado
+_explained_at: dict[str, float] = {}
+_EXPLAINED_MAX = 1000
+_explained_lock = threading.Lock()
+
+
+def parameters_shape(parameters) -> dict | list | None:
+    """
+    Descreve os parâmetros sem os valores: nome (ou posição) e tipo.
+
+    Os valores podem conter dados pessoais (emails, nomes) e não vão para o log.
+    """
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def _should_explain(statement: str) -> bool:
+    """
+    Verdadeiro se o comando pode ter o plano capturado agora: precisa ser
+    aceito pelo EXPLAIN e não ter sido explicado nos últimos
+    SLOW_QUERY_EXPLAIN_INTERVAL segundos.
+    """
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    if not settings.SLOW_QUERY_EXPLAIN or operation not in _EXPLAINABLE:
+        return False
+    now = time.monotonic()
+    with _explained_lock:
+        last = _explained_at.get(statement)
+        if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL:
+            return False
+        if len(_explained_at) >= _EXPLAINED_MAX:
+            _explained_at.clear()
+        _explained_at[statement] = now
+    return True
+
+
+def _explain(engine: Engine, record: dict, statement: str, parameters) -> None:
+    """Captura o plano estimado em uma conexão própria e grava o registro."""
+    try:
+        with engine.connect() as connection:
+            connection = connection.execution_options(slow_query_log=False)
+            plan = connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}", parameters
+            ).scalar()
+            connection.rollback()
+        record["plan"] = plan[0]["Plan"] if plan else None
+    except Exception as e:
+        record["plan_error"] = str(e)
+    logger.warning("Consulta lenta: %s", json.dumps(record, default=str))
+
+
+def instrument_slow_queries(engine: Engine) -> None:
+    """
+    Registra os comandos que passarem de SLOW_QUERY_MS milissegundos.
+
+    Cada registro é uma linha JSON no log com o comando, o formato dos
+    parâmetros, a duração e a rota da requisição. O plano estimado (EXPLAIN
+    sem ANALYZE, que não executa o comando) é capturado em segundo plano,
+    fora da requisição, e anexado ao mesmo registro. Sem SLOW_QUERY_MS nada
+    é instalado.
+    """
+    if settings.SLOW_QUERY_MS is None:
+        return
+    threshold = settings.SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _check(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_started"].pop()
+        if elapsed < threshold:
+            return
+        if context is not None and not context.execution_options.get(
+            "slow_query_log", True
+        ):
+            return
+
+        stats = current_query_stats()
+        record = {
+            "duration_ms": round(elapsed * 1000, 1),
+            "route": stats.route if stats is not None else None,
+            "statement": statement,
+            "parameters": parameters_shape(parameters),
+            "executemany": executemany,
+        }
+        if not executemany and _should_explain(statement):
+            _executor.submit(_explain, engine, record, statement, parameters)
+        else:
+            logger.warning("Consulta lenta: %s", json.dumps(record, default=str))
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(context):
+        if context.connection is None:
+            return
+        timers = context.connection.info.get("slow_query_started")
+        if timers:
+            timers.pop()
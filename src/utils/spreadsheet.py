@@ -0,0 +1,90 @@
+import re
+import tempfile
+import zipfile
+from typing import Iterable, Iterator
+from xml.sax.saxutils import escape
+
+# Caracteres de controle que não são aceitos em XML 1.0
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>"""
+
+
+def _cell(value) -> str:
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f"<c><v>{value}</v></c>"
+    text = escape(_INVALID_XML_CHARS.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row(values: Iterable) -> bytes:
+    return ("<row>" + "".join(map(_cell, values)) + "</row>").encode("utf-8")
+
+
+def iter_xlsx(
+    header: list[str],
+    rows: Iterable[Iterable],
+    sheet_name: str = "Planilha1",
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """
+    Gera uma planilha XLSX de uma aba a partir de um iterador de linhas.
+
+    As linhas são escritas direto no XML compactado de um arquivo temporário,
+    sem montar a planilha em memória. Depois o arquivo é devolvido em blocos
+    de `chunk_size` bytes.
+
+    Args:
+        header: Nomes das colunas
+        rows: Iterador de linhas (sequências de valores)
+        sheet_name: Nome da aba
+        chunk_size: Tamanho dos blocos devolvidos
+
+    Yields:
+        Blocos de bytes do arquivo XLSX
+    """
+    with tempfile.TemporaryFile() as output:
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as book:
+            book.writestr("[Content_Types].xml", _CONTENT_TYPES)
+            book.writestr("_rels/.rels", _ROOT_RELS)
+            book.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name)))
+            book.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+            with book.open("xl/worksheets/sheet1.xml", "w") as sheet:
+                sheet.write(
+                    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    b'<worksheet xmlns="http://schemas.openxmlformats.org/'
+                    b'spreadsheetml/2006/main"><sheetData>'
+                )
+                sheet.write(_row(header))
+                for row in rows:
+                    sheet.write(_row(row))
+                sheet.write(b"</sheetData></worksheet>")
+
+        output.seek(0)
+        while chunk := output.read(chunk_size):
+            yield chunk
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+from fastapi.responses import FileResponse
+
+from src.settings import settings
+
+# Assinaturas (magic bytes) dos tipos de comprovante aceitos
+FILE_SIGNATURES = [
+    (b"%PDF-", "application/pdf", ".pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", ".png"),
+    (b"\xff\xd8\xff", "image/jpeg", ".jpg"),
+    (b"GIF87a", "image/gif", ".gif"),
+    (b"GIF89a", "image/gif", ".gif"),
+]
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ReceiptRejected(ValueError):
+    """Comprovante recusado: tipo não suportado ou arquivo vazio."""
+
+
+class ReceiptTooLarge(ReceiptRejected):
+    """Comprovante maior que o limite configurado."""
+
+
+def sniff_content_type(head: bytes) -> tuple[str, str] | None:
+    """
+    Identifica o tipo do arquivo pelos primeiros bytes, sem confiar na
+    extensão enviada pelo cliente.
+
+    Returns:
+        Tupla (tipo MIME, extensão) ou None se o tipo não for aceito
+    """
+    for signature, content_type, extension in FILE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type, extension
+    return None
+
+
+class ReceiptStorage(ABC):
+    """Interface dos backends de armazenamento de comprovantes."""
+
+    @abstractmethod
+    def save(self, stream: BinaryIO, max_bytes: int) -> dict:
+        """
+        Copia o conteúdo de `stream` para o armazenamento em blocos.
+
+        O SHA-256 do conteúdo é calculado durante a cópia, bloco a bloco.
+
+        Returns:
+            Dicionário com "key", "content_type", "size" e "sha256" do arquivo
+
+        Raises:
+            ReceiptRejected: Se o tipo não for aceito ou o arquivo estiver vazio
+            ReceiptTooLarge: Se o arquivo passar de `max_bytes`
+        """
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """Abre o arquivo armazenado para leitura binária."""
+
+    @abstractmethod
+    def response(self, key: str, content_type: str, filename: str | None = None):
+        """Monta a resposta HTTP que entrega o arquivo armazenado."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove o arquivo armazenado, se existir."""
+
+
+class LocalReceiptStorage(ReceiptStorage):
+    """Armazena comprovantes em um diretório do sistema de arquivos local."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.directory, key))
+        if os.path.dirname(path) != os.path.abspath(self.directory):
+            raise ValueError(f"Chave de arquivo inválida: {key}")
+        return path
+
+    def save(self, stream: BinaryIO, max_bytes: int) -> dict:
+        head = stream.read(CHUNK_SIZE)
+        if not head:
+            raise ReceiptRejected("Arquivo é obrigatório")
+
+        sniffed = sniff_content_type(head)
+        if not sniffed:
+            raise ReceiptRejected(
+                "Tipo de arquivo não suportado. Use PDF ou imagens (JPG, PNG, GIF)"
+            )
+        content_type, extension = sniffed
+
+        key = f"{uuid.uuid4().hex}{extension}"
+        partial_path = self._path(f"{key}.part")
+        size = 0
+        digest = hashlib.sha256()
+        try:
+            with open(partial_path, "wb") as output:
+                chunk = head
+                while chunk:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ReceiptTooLarge(
+                            f"Arquivo maior que o limite de {max_bytes // (1024 * 1024)} MB"
+                        )
+                    digest.update(chunk)
+                    output.write(chunk)
+                    chunk = stream.read(CHUNK_SIZE)
+            os.replace(partial_path, self._path(key))
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        return {
+            "key": key,
+            "content_type": content_type,
+            "size": size,
+            "sha256": digest.hexdigest(),
+        }
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), "rb")
+
+    def response(self, key: str, content_type: str, filename: str | None = None):
+        return FileResponse(self._path(key), media_type=content_type, filename=filename)
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+STORAGE_BACKENDS = {
+    "local": lambda: LocalReceiptStorage(settings.RECEIPT_STORAGE_DIR),
+}
+
+_storage: ReceiptStorage | None = None
+
+
+def get_receipt_storage() -> ReceiptStorage:
+    """Retorna o backend configurado em RECEIPT_STORAGE_BACKEND."""
+    global _storage
+    if _storage is None:
+        backend = settings.RECEIPT_STORAGE_BACKEND
+        if backend not in STORAGE_BACKENDS:
+            raise ValueError(f"Backend de armazenamento desconhecido: {backend}")
+        _storage = STORAGE_BACKENDS[backend]()
+    return _storage
@@ -0,0 +1,156 @@
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from src.settings import settings
+from src.utils.auth import get_current_user
+
+# Campos cujo valor é gravado como está: não identificam o comprador e são
+# necessários para reproduzir a disputa por assentos
+SAFE_FIELDS = {
+    "seat_code",
+    "is_half_price",
+    "count",
+    "row",
+    "event_id",
+    "limit",
+    "status",
+    "format",
+}
+
+# Corpos JSON maiores que isso ficam só com o tamanho
+_MAX_JSON_BODY = 64 * 1024
+
+_write_lock = threading.Lock()
+
+
+def value_shape(value, field: str | None = None):
+    """
+    Estrutura do valor com os dados trocados pelo tipo ("<str>", "<int>").
+
+    Valores de campos em SAFE_FIELDS são mantidos; listas mantêm o tamanho.
+    """
+    if field in SAFE_FIELDS and not isinstance(value, (dict, list)):
+        return value
+    if isinstance(value, dict):
+        return {key: value_shape(item, key) for key, item in value.items()}
+    if isinstance(value, list):
+        return [value_shape(item, field) for item in value]
+    if value is None:
+        return "<null>"
+    return f"<{type(value).__name__}>"
+
+
+def user_pseudonym(authorization: str | None) -> str | None:
+    """
+    Identificador estável e não reversível do usuário do token.
+
+    Usa HMAC com a chave do JWT, então o mesmo usuário recebe o mesmo
+    pseudônimo em todos os workers sem que o ID real vá para o arquivo.
+    """
+    if not authorization:
+        return None
+    try:
+        user = get_current_user(authorization)
+    except HTTPException:
+        return None
+    digest = hmac.new(
+        (settings.JWT_SECRET_KEY or "").encode(),
+        str(user.get("id")).encode(),
+        hashlib.sha256,
+    )
+    prefix = "admin" if "admin" in user.get("scopes", "") else "user"
+    return f"{prefix}-{digest.hexdigest()[:16]}"
+
+
+def _append(path: str, line: str) -> None:
+    with _write_lock:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+class TrafficCaptureMiddleware:
+    """
+    Middleware ASGI que grava um registro anonimizado por requisição em JSONL.
+
+    Cada linha traz o momento da chegada, método, template da rota,
+    parâmetros de caminho e de query, pseudônimo do usuário, estrutura do
+    corpo (JSON sem os valores, exceto SAFE_FIELDS), tamanho do corpo,
+    status e duração. Tokens, senhas, nomes, emails e arquivos nunca são
+    gravados. Ligado com TRAFFIC_CAPTURE_PATH; reproduzido por
+    benchmarks/replay.py.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.TRAFFIC_CAPTURE_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        arrived_at = time.time()
+        started = time.perf_counter()
+        headers = dict(scope["headers"])
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        is_json = content_type.startswith("application/json")
+        chunks = []
+        body_bytes = 0
+        status = 500
+
+        async def receive_with_capture():
+            nonlocal body_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                body_bytes += len(body)
+                if is_json and body_bytes <= _MAX_JSON_BODY:
+                    chunks.append(body)
+            return message
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_with_capture, send_with_status)
+        finally:
+            route = scope.get("route")
+            body_shape = None
+            if chunks and body_bytes <= _MAX_JSON_BODY:
+                try:
+                    body_shape = value_shape(json.loads(b"".join(chunks)))
+                except ValueError:
+                    body_shape = "<invalid json>"
+            authorization = headers.get(b"authorization")
+            query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+            record = {
+                "t": round(arrived_at, 3),
+                "method": scope["method"],
+                "route": getattr(route, "path", None),
+                "path_params": value_shape(scope.get("path_params", {})),
+                "query": value_shape(query),
+                "user": user_pseudonym(
+                    authorization.decode("latin-1") if authorization else None
+                ),
+                "content_type": content_type.split(";", 1)[0] or None,
+                "body": body_shape,
+                "body_bytes": body_bytes,
+                "status": status,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+            await run_in_threadpool(
+                _append, settings.TRAFFIC_CAPTURE_PATH, json.dumps(record)
+            )
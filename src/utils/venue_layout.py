@@ -0,0 +1,203 @@
+import io
+import json
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.settings import settings
+
+# Tamanho máximo do código do assento (coluna seat.code)
+MAX_CODE_LENGTH = 8
+
+
+def _row_label_to_number(label: str) -> int:
+    """Converte rótulos de fileira no estilo de planilha: A=1, Z=26, AA=27."""
+    if not label.isalpha() or not label.isupper():
+        raise ValueError(f"Fileira inválida: {label!r}")
+    number = 0
+    for char in label:
+        number = number * 26 + ord(char) - ord("A") + 1
+    return number
+
+
+def row_label(number: int) -> str:
+    """Inverso de _row_label_to_number: 1=A, 26=Z, 27=AA."""
+    label = ""
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        label = chr(ord("A") + remainder) + label
+    return label
+
+
+def _expand_rows(spec: str) -> list[str]:
+    """Expande "A-P", "AA-AZ" ou "A,C,E" em uma lista de fileiras."""
+    rows = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            first, last = (_row_label_to_number(p.strip()) for p in part.split("-", 1))
+            if first > last:
+                raise ValueError(f"Intervalo de fileiras inválido: {part!r}")
+            rows.extend(row_label(n) for n in range(first, last + 1))
+        else:
+            _row_label_to_number(part)
+            rows.append(part)
+    return rows
+
+
+def _expand_seats(spec: str) -> list[int]:
+    """Expande "1-36" ou "1-10,13-36" (corredores) em números de assento."""
+    numbers = []
+    for part in spec.split(","):
+        part = part.strip()
+        try:
+            if "-" in part:
+                first, last = (int(p) for p in part.split("-", 1))
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise ValueError(f"Intervalo de assentos inválido: {part!r}")
+        if first < 1 or first > last:
+            raise ValueError(f"Intervalo de assentos inválido: {part!r}")
+        numbers.extend(range(first, last + 1))
+    return numbers
+
+
+def _copy_value(value: str | None) -> str:
+    """Formata um valor para o formato texto do COPY."""
+    if value is None:
+        return "\\N"
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def read_layout(path: str | Path) -> dict:
+    """Lê um arquivo de layout em JSON."""
+    with open(path, encoding="utf-8") as layout_file:
+        return json.load(layout_file)
+
+
+def layout_path(venue: str) -> Path:
+    """
+    Caminho do layout de um local cadastrado em VENUE_LAYOUTS_DIR.
+
+    Raises:
+        ValueError: Se o local não existir
+    """
+    path = Path(settings.VENUE_LAYOUTS_DIR) / f"{venue}.json"
+    if not venue.replace("_", "").replace("-", "").isalnum() or not path.is_file():
+        raise ValueError(f"Local não encontrado: {venue}")
+    return path
+
+
+def iter_layout_seats(layout: dict) -> Iterator[tuple[str, str, str | None]]:
+    """
+    Percorre os assentos de um layout declarativo.
+
+    O layout tem seções; cada seção tem uma zona de preço (que deve estar em
+    "price_zones", quando a lista existe) e blocos de fileiras com o intervalo
+    de assentos de cada uma:
+
+        {"name": "plateia", "price_zone": "padrao",
+         "rows": [{"rows": "A-P", "seats": "1-36"}]}
+
+    Yields:
+        Tuplas (código, seção, zona de preço)
+
+    Raises:
+        ValueError: Se o layout for inválido ou repetir um código de assento
+    """
+    zones = layout.get("price_zones")
+    seen = set()
+    for section in layout.get("sections") or []:
+        name = section.get("name")
+        zone = section.get("price_zone")
+        if not name:
+            raise ValueError("Toda seção precisa de um nome")
+        if zones is not None and zone not in zones:
+            raise ValueError(f"Zona de preço desconhecida na seção {name}: {zone}")
+        for block in section.get("rows") or []:
+            try:
+                rows, seats = block["rows"], block["seats"]
+            except (KeyError, TypeError):
+                raise ValueError(f"Bloco inválido na seção {name}: {block!r}")
+            numbers = _expand_seats(seats)
+            for row in _expand_rows(rows):
+                for number in numbers:
+                    code = f"{row}{number}"
+                    if len(code) > MAX_CODE_LENGTH:
+                        raise ValueError(f"Código de assento muito longo: {code}")
+                    if code in seen:
+                        raise ValueError(f"Assento repetido no layout: {code}")
+                    seen.add(code)
+                    yield code, name, zone
+    if not seen:
+        raise ValueError("O layout não tem assentos")
+
+
+def load_layout_seats(db: Session, event_id: int, layout: dict) -> dict:
+    """
+    Cria o estoque de assentos de um evento a partir de um layout. A partição
+    do evento já deve existir (ver create_event_partition).
+
+    Os assentos são enviados com COPY para uma tabela temporária e copiados
+    para a partição do evento com um único INSERT ... SELECT, o que carrega
+    dezenas de milhares de assentos em poucos segundos. Rodar de novo com o
+    mesmo layout não duplica nada: assentos existentes mantêm status e dono e
+    só têm seção e zona de preço atualizadas. Assentos que saíram do layout
+    não são apagados, pois podem já ter sido vendidos.
+
+    A transação não é confirmada aqui.
+
+    Returns:
+        Dicionário com as contagens de assentos do layout, inseridos e
+        atualizados
+
+    Raises:
+        ValueError: Se o layout for inválido
+    """
+    buffer = io.StringIO()
+    total = 0
+    for code, section, zone in iter_layout_seats(layout):
+        buffer.write(
+            "\t".join(_copy_value(value) for value in (code, section, zone)) + "\n"
+        )
+        total += 1
+    buffer.seek(0)
+
+    db.execute(
+        text(
+            "CREATE TEMPORARY TABLE seat_load "
+            "(code varchar(8), section varchar(50), price_zone varchar(20))"
+        )
+    )
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            "COPY seat_load (code, section, price_zone) FROM STDIN", buffer
+        )
+    finally:
+        cursor.close()
+
+    changes = db.execute(
+        text(
+            """
+            INSERT INTO seat (event_id, code, section, price_zone, status,
+                              is_half_price, created_at, updated_at)
+            SELECT :event_id, code, section, price_zone, 'available', false,
+                   now(), now()
+            FROM seat_load
+            ON CONFLICT (event_id, code) DO UPDATE
+            SET section = EXCLUDED.section, price_zone = EXCLUDED.price_zone
+            WHERE (seat.section, seat.price_zone)
+                  IS DISTINCT FROM (EXCLUDED.section, EXCLUDED.price_zone)
+            RETURNING (xmax = 0) AS inserted
+            """
+        ),
+        {"event_id": event_id},
+    ).scalars().all()
+    db.execute(text("DROP TABLE seat_load"))
+
+    inserted = sum(1 for was_inserted in changes if was_inserted)
+    return {"seats": total, "inserted": inserted, "updated": len(changes) - inserted}
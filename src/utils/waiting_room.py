@@ -0,0 +1,316 @@
+import datetime
+
+import jwt
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.models.waiting_room import WaitingRoomState, WaitingRoomTicket
+from src.settings import settings
+
+# Audiência própria para que um ticket da fila nunca valha como token de acesso
+TICKET_AUDIENCE = "waiting-room"
+
+
+def issue_ticket(ticket_id: int, event_id: int, user_id: int) -> str:
+    """Assina o ticket da fila entregue ao usuário."""
+    payload = {
+        "tid": ticket_id,
+        "eid": event_id,
+        "uid": user_id,
+        "aud": TICKET_AUDIENCE,
+        "iat": datetime.datetime.now(datetime.timezone.utc),
+    }
+    return jwt.encode(
+        payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+    )
+
+
+def read_ticket(ticket: str) -> dict:
+    """
+    Valida a assinatura do ticket da fila.
+
+    Raises:
+        ValueError: Se o ticket estiver ausente, adulterado ou não for da fila
+    """
+    if not ticket:
+        raise ValueError("Missing waiting room ticket.")
+    try:
+        return jwt.decode(
+            ticket,
+            settings.JWT_SECRET_KEY,
+            algorithms=[settings.JWT_ALGORITHM],
+            audience=TICKET_AUDIENCE,
+        )
+    except jwt.InvalidTokenError:
+        raise ValueError("Invalid waiting room ticket.")
+
+
+def _is_active(ticket: WaitingRoomTicket, now: datetime.datetime) -> bool:
+    return ticket.admitted_at is not None and ticket.expires_at > now
+
+
+def _recently_seen():
+    """Tickets cujo dono consultou o status há pouco (ainda está na página)."""
+    return WaitingRoomTicket.last_seen_at > func.now() - datetime.timedelta(
+        seconds=settings.WAITING_ROOM_IDLE_SECONDS
+    )
+
+
+def _seen_long_ago():
+    """
+    Tickets cujo last_seen_at já passou da metade de WAITING_ROOM_IDLE_SECONDS:
+    só estes são regravados na consulta de status.
+    """
+    return WaitingRoomTicket.last_seen_at <= func.now() - datetime.timedelta(
+        seconds=settings.WAITING_ROOM_IDLE_SECONDS / 2
+    )
+
+
+def join_queue(db: Session, event_id: int, user_id: int) -> str:
+    """
+    Coloca o usuário na fila do evento e devolve o ticket assinado.
+
+    Entrar de novo mantém o lugar; quem teve a admissão vencida volta para o
+    fim da fila.
+    """
+    now = db.execute(select(func.now())).scalar_one()
+    ticket = db.execute(
+        select(WaitingRoomTicket).where(
+            WaitingRoomTicket.event_id == event_id,
+            WaitingRoomTicket.user_id == user_id,
+        )
+    ).scalar_one_or_none()
+
+    if ticket is not None and ticket.admitted_at is not None and not _is_active(
+        ticket, now
+    ):
+        db.execute(delete(WaitingRoomTicket).where(WaitingRoomTicket.id == ticket.id))
+        ticket = None
+
+    if ticket is None:
+        # A fila do evento começa depois do último ticket já emitido
+        last_ticket = select(
+            func.coalesce(func.max(WaitingRoomTicket.id), 0)
+        ).scalar_subquery()
+        db.execute(
+            insert(WaitingRoomState)
+            .values(
+                event_id=event_id,
+                max_active=settings.WAITING_ROOM_MIN_ACTIVE,
+                admitted_through=last_ticket,
+            )
+            .on_conflict_do_nothing(index_elements=[WaitingRoomState.event_id])
+        )
+        db.execute(
+            insert(WaitingRoomTicket)
+            .values(event_id=event_id, user_id=user_id)
+            .on_conflict_do_nothing(
+                index_elements=[WaitingRoomTicket.event_id, WaitingRoomTicket.user_id]
+            )
+        )
+        ticket_id = db.execute(
+            select(WaitingRoomTicket.id).where(
+                WaitingRoomTicket.event_id == event_id,
+                WaitingRoomTicket.user_id == user_id,
+            )
+        ).scalar_one()
+    else:
+        ticket_id = ticket.id
+
+    return issue_ticket(ticket_id, event_id, user_id)
+
+
+def queue_status(db: Session, payload: dict) -> dict:
+    """
+    Situação do ticket: "waiting" (com quantos estão à frente), "admitted"
+    (com o prazo) ou "expired".
+
+    Feita para ser consultada a cada poucos segundos por toda a fila: lê só o
+    próprio ticket e o estado do evento, e regrava last_seen_at apenas quando
+    ele passou da metade de WAITING_ROOM_IDLE_SECONDS. A posição é estimada
+    pela distância até o último ticket admitido (admitted_through), sem contar
+    a fila; inclui quem desistiu e, com vendas simultâneas, tickets de outros
+    eventos. A transação não é confirmada aqui.
+    """
+    row = db.execute(
+        select(
+            WaitingRoomTicket.admitted_at,
+            WaitingRoomTicket.expires_at,
+            _seen_long_ago().label("stale"),
+            WaitingRoomState.admitted_through,
+            func.now().label("now"),
+        )
+        .join(
+            WaitingRoomState,
+            WaitingRoomState.event_id == WaitingRoomTicket.event_id,
+        )
+        .where(WaitingRoomTicket.id == payload["tid"])
+    ).one_or_none()
+    if row is None:
+        return {"state": "expired"}
+
+    if row.admitted_at is None:
+        if row.stale:
+            db.execute(
+                update(WaitingRoomTicket)
+                .where(WaitingRoomTicket.id == payload["tid"])
+                .values(last_seen_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        return {
+            "state": "waiting",
+            "ahead": max(0, payload["tid"] - row.admitted_through - 1),
+            "poll_after_seconds": settings.WAITING_ROOM_POLL_SECONDS,
+        }
+    if row.expires_at > row.now:
+        return {"state": "admitted", "expires_at": row.expires_at.isoformat()}
+    return {"state": "expired"}
+
+
+def lock_waiters(db: Session) -> int:
+    """Sessões do banco esperando por um lock neste momento."""
+    return db.execute(
+        text(
+            "SELECT count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+        )
+    ).scalar_one()
+
+
+def run_admission(db: Session, event_id: int) -> int:
+    """
+    Rodada de admissão: libera os primeiros da fila até completar max_active
+    compradores ativos. Só entram tickets consultados nos últimos
+    WAITING_ROOM_IDLE_SECONDS, e a admissão vale WAITING_ROOM_GRACE_SECONDS
+    até o primeiro uso das rotas de assentos (veja check_admission): quem
+    fechou a página não prende uma vaga.
+
+    max_active se ajusta pela pressão sobre os locks de assento: cai 30%
+    quando há mais de WAITING_ROOM_MAX_LOCK_WAITERS sessões esperando por
+    locks e sobe 10% quando todas as vagas estão ocupadas sem disputa,
+    sempre entre WAITING_ROOM_MIN_ACTIVE e WAITING_ROOM_MAX_ACTIVE. Roda no
+    máximo uma vez a cada WAITING_ROOM_TICK_SECONDS por evento, chamada pelo
+    comando src.commands.run_admission; se houver mais de um processo, só um
+    faz a rodada (os demais saem sem esperar).
+
+    A transação não é confirmada aqui.
+
+    Returns:
+        Quantidade de usuários admitidos nesta rodada
+    """
+    state = db.execute(
+        select(WaitingRoomState)
+        .where(
+            WaitingRoomState.event_id == event_id,
+            (WaitingRoomState.last_tick_at.is_(None))
+            | (
+                WaitingRoomState.last_tick_at
+                <= func.now()
+                - datetime.timedelta(seconds=settings.WAITING_ROOM_TICK_SECONDS)
+            ),
+        )
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    if state is None:
+        return 0
+
+    active = db.execute(
+        select(func.count()).where(
+            WaitingRoomTicket.event_id == event_id,
+            WaitingRoomTicket.expires_at > func.now(),
+        )
+    ).scalar_one()
+
+    if lock_waiters(db) > settings.WAITING_ROOM_MAX_LOCK_WAITERS:
+        max_active = int(state.max_active * 0.7)
+    elif active >= state.max_active:
+        max_active = state.max_active + max(1, state.max_active // 10)
+    else:
+        max_active = state.max_active
+    state.max_active = min(
+        settings.WAITING_ROOM_MAX_ACTIVE,
+        max(settings.WAITING_ROOM_MIN_ACTIVE, max_active),
+    )
+    state.last_tick_at = func.now()
+
+    free = state.max_active - active
+    if free <= 0:
+        return 0
+
+    next_batch = (
+        select(WaitingRoomTicket.id)
+        .where(
+            WaitingRoomTicket.event_id == event_id,
+            WaitingRoomTicket.admitted_at.is_(None),
+            _recently_seen(),
+        )
+        .order_by(WaitingRoomTicket.id)
+        .limit(free)
+        .scalar_subquery()
+    )
+    admitted = db.execute(
+        update(WaitingRoomTicket)
+        .where(WaitingRoomTicket.id.in_(next_batch))
+        .values(
+            admitted_at=func.now(),
+            expires_at=func.now()
+            + datetime.timedelta(seconds=settings.WAITING_ROOM_GRACE_SECONDS),
+        )
+        .returning(WaitingRoomTicket.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if admitted:
+        state.admitted_through = max(state.admitted_through, max(admitted))
+    return len(admitted)
+
+
+def queued_events(db: Session) -> list[int]:
+    """Eventos com sala de espera aberta (com estado de admissão)."""
+    return list(db.execute(select(WaitingRoomState.event_id)).scalars())
+
+
+def check_admission(db: Session, ticket: str, user_id: int, event_id: int) -> dict:
+    """
+    Confere se o ticket dá acesso às rotas de assentos agora.
+
+    No primeiro uso a admissão passa do prazo curto de WAITING_ROOM_GRACE_SECONDS
+    para WAITING_ROOM_SESSION_MINUTES a partir da admissão. A transação não é
+    confirmada aqui.
+
+    Returns:
+        Conteúdo do ticket
+
+    Raises:
+        ValueError: Se o ticket for inválido, de outro usuário ou evento, ou
+            se o usuário ainda não foi admitido (ou a admissão venceu)
+    """
+    payload = read_ticket(ticket)
+    if payload["uid"] != user_id or payload["eid"] != event_id:
+        raise ValueError("Waiting room ticket belongs to another user or event.")
+    session_ends_at = WaitingRoomTicket.admitted_at + datetime.timedelta(
+        minutes=settings.WAITING_ROOM_SESSION_MINUTES
+    )
+    admitted = db.execute(
+        update(WaitingRoomTicket)
+        .where(
+            WaitingRoomTicket.id == payload["tid"],
+            WaitingRoomTicket.expires_at > func.now(),
+        )
+        .values(expires_at=func.greatest(WaitingRoomTicket.expires_at, session_ends_at))
+        .returning(WaitingRoomTicket.id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if admitted is None:
+        raise ValueError("Not admitted from the waiting room yet.")
+    return payload
+
+
+def finish_admission(db: Session, ticket_id: int) -> None:
+    """Encerra a admissão depois da compra, liberando a vaga para a fila."""
+    db.execute(
+        update(WaitingRoomTicket)
+        .where(WaitingRoomTicket.id == ticket_id)
+        .values(expires_at=func.now())
+        .execution_options(synchronize_session=False)
+    )